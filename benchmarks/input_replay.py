@@ -0,0 +1,93 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.render_benchmark import write_json
+from game.game import Game
+from game.profiling import percentile
+from game.replay import Recording
+
+
+def summarize(timings):
+    return {
+        'count': len(timings),
+        'median_ms': round(percentile(timings, 50), 4),
+        'p95_ms': round(percentile(timings, 95), 4),
+        'max_ms': round(max(timings), 4) if timings else 0.0,
+    }
+
+
+def play(game, recording):
+    handler_times = defaultdict(list)
+    frame_times = []
+    running = True
+    for _, _, events in recording.frames:
+        for event in events:
+            key = f'{pygame.event.event_name(event.type)} {game.current_state.name}'
+            start = time.perf_counter()
+            running = game.handle_events([event])
+            handler_times[key].append((time.perf_counter() - start) * 1000)
+            if not running:
+                break
+        if not running:
+            break
+        # one frame per recorded frame, so render cost follows the states the session went through
+        start = time.perf_counter()
+        game.display.poll_assets()
+        game.render()
+        game.screen.present()
+        frame_times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'events': recording.event_count,
+        'frames': len(recording.frames),
+        'handlers': {key: summarize(timings) for key, timings in sorted(handler_times.items())},
+        'frame': summarize(frame_times),
+    }
+
+
+def run(path, renderer='surface'):
+    recording = Recording.load(path)
+    game = Game(vsync=False, renderer=renderer, screen_size=recording.screen_size, seed=recording.seed)
+    try:
+        game.display.wait_for_assets()
+        game.wait_for_custom_games()
+        return play(game, recording)
+    finally:
+        pygame.quit()
+
+
+def print_results(results):
+    print(f'{results["events"]} events over {results["frames"]} frames')
+    for key, timing in results['handlers'].items():
+        print(f'  {key:<40} x{timing["count"]:<5} median {timing["median_ms"]:8.3f} ms'
+              f'   p95 {timing["p95_ms"]:8.3f} ms   max {timing["max_ms"]:8.3f} ms')
+    frame = results['frame']
+    print(f'  {"frame":<40} x{frame["count"]:<5} median {frame["median_ms"]:8.3f} ms'
+          f'   p95 {frame["p95_ms"]:8.3f} ms   max {frame["max_ms"]:8.3f} ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play a recorded input session headlessly and time every event')
+    parser.add_argument('recording', help='file written by main.py --record')
+    parser.add_argument('--renderer', choices=('surface', 'texture'), default='surface')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = run(args.recording, args.renderer)
+    print_results(results)
+    if args.output:
+        write_json(args.output, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
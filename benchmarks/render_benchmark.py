@@ -0,0 +1,209 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from game.assets import AssetManager
+from game.custom import CustomGame
+from game.display import Display
+from game.list_view import ListView
+from game.game_modes import Gameplay, GameMode, Difficulty
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160),
+}
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baseline.json')
+
+
+def screen_cases(display):
+    game_stats = {'Turn': 12, 'Moves': 11, 'Captured Zombies': 4}
+    small_game = Gameplay.init_game_mode(8, Difficulty.EASY, GameMode.BLOCK_THE_BORDER)
+    large_game = Gameplay.init_game_mode(18, Difficulty.EXTREME, GameMode.BLOCK_THE_BORDER)
+    for row, col, zombie in ((2, 1, 'zw'), (5, 3, 'zs'), (9, 6, 'zi'), (12, 2, 'ze')):
+        large_game.board[row][col] = zombie
+    custom_board = [[None for _ in range(8)] for _ in range(10)]
+    custom_board[9][4] = 'pK12'
+    custom_board[3][3] = 'zw'
+    few_game_modes = {f'gm{i}': CustomGame(f'Game {i}') for i in range(10)}
+    many_game_modes = {f'gm{i}': CustomGame(f'Game {i}') for i in range(1000)}
+    few_list = ListView(few_game_modes)
+    many_list = ListView(many_game_modes)
+    many_list.scroll_to(500, animate=False)
+
+    return {
+        'main_menu': display.main_menu,
+        'custom_menu': display.custom_menu,
+        'game_settings_menu': lambda: display.game_settings_menu(GameMode.BLOCK_THE_BORDER, Difficulty.EASY, 8),
+        'information_menu': lambda: display.information_menu('Game Over', 'Show Board', 'Main Menu',
+                                                             additional_info='Survived turns: 12'),
+        'playing_screen_8': lambda: display.playing_screen(8, small_game.board, (6, 1), game_stats, 0),
+        'playing_screen_18': lambda: display.playing_screen(18, large_game.board, (16, 2), game_stats, -1),
+        'playing_screen_18_whole': lambda: display.playing_screen(18, large_game.board, None, game_stats, 0),
+        'load_custom_menu_10': lambda: display.load_custom_menu(few_game_modes, ('gm3', few_game_modes['gm3']),
+                                                                few_list),
+        'load_custom_menu_1000': lambda: display.load_custom_menu(many_game_modes, None, many_list),
+        'create_custom_menu': lambda: display.create_custom_menu(10, custom_board, 'zw', True),
+        'save_custom_menu': lambda: display.save_custom_menu(GameMode.BLOCK_THE_BORDER, Difficulty.EASY, False, True,
+                                                             'My Game', True, True),
+        'preview_board': lambda: display.preview_board(10, custom_board),
+        'pawn_promotion_menu': display.pawn_promotion_menu,
+        'help_menu': display.help_menu,
+        'help_rules_1_menu': display.help_rules_1_menu,
+        'help_rules_2_menu': display.help_rules_2_menu,
+        'help_zombies_menu': display.help_zombies_menu,
+        'zombie_info_popup': lambda: display.zombie_info_popup('zw', 'Moves down', 'Moves first', 'Captures pieces'),
+        'help_game_modes_1_menu': display.help_game_modes_1_menu,
+        'help_game_modes_2_menu': display.help_game_modes_2_menu,
+        'help_difficulties_menu': display.help_difficulties_menu,
+    }
+
+
+def time_call(call, warmup, repeat):
+    for _ in range(warmup):
+        call()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        'min_ms': round(timings[0], 4),
+    }
+
+
+def run_resolution(size, warmup, repeat, screens=None):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        screen = pygame.display.set_mode(size)
+        display = Display(screen, size[0], size[1], 50, AssetManager(cache_dir=cache_dir))
+        display.wait_for_assets()
+        display.set_popup_background()
+
+        results = {}
+        for name, call in screen_cases(display).items():
+            if screens and name not in screens:
+                continue
+            results[name] = time_call(call, warmup, repeat)
+        return results
+
+
+def run(resolutions, warmup=3, repeat=30, screens=None):
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        results = {name: run_resolution(RESOLUTIONS[name], warmup, repeat, screens) for name in resolutions}
+    finally:
+        pygame.display.quit()
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'platform': platform.platform(),
+            'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+            'warmup': warmup,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=0.05):
+    regressions = []
+    for resolution, screens in results['results'].items():
+        baseline_screens = baseline.get('results', {}).get(resolution, {})
+        for name, timing in screens.items():
+            expected = baseline_screens.get(name)
+            if expected is None:
+                continue
+            median, baseline_median = timing['median_ms'], expected['median_ms']
+            # tiny screens are noisy, so a regression also has to cost a measurable amount of time
+            if median > baseline_median * (1 + tolerance) and median - baseline_median > min_delta_ms:
+                regressions.append((resolution, name, baseline_median, median))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    for resolution, screens in results['results'].items():
+        print(f'{resolution}:')
+        baseline_screens = (baseline or {}).get('results', {}).get(resolution, {})
+        for name, timing in screens.items():
+            line = f'  {name:<26} median {timing["median_ms"]:8.3f} ms   p95 {timing["p95_ms"]:8.3f} ms'
+            expected = baseline_screens.get(name)
+            if expected:
+                change = (timing['median_ms'] / expected['median_ms'] - 1) * 100 if expected['median_ms'] else 0
+                line += f'   baseline {expected["median_ms"]:8.3f} ms ({change:+.0f}%)'
+            print(line)
+
+
+def load_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every Display screen on the dummy video driver')
+    parser.add_argument('--resolutions', default=','.join(RESOLUTIONS),
+                        help=f'comma separated list out of {", ".join(RESOLUTIONS)}')
+    parser.add_argument('--screens', help='comma separated list of screens to run, all by default')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed median slowdown, 0.25 is 25%%')
+    args = parser.parse_args(argv)
+
+    resolutions = [name.strip().lower() for name in args.resolutions.split(',') if name.strip()]
+    unknown = [name for name in resolutions if name not in RESOLUTIONS]
+    if unknown:
+        parser.error(f'unknown resolutions: {", ".join(unknown)}')
+    screens = set(args.screens.split(',')) if args.screens else None
+
+    results = run(resolutions, args.warmup, args.repeat, screens)
+    baseline = None if args.update_baseline else load_json(args.baseline)
+    print_results(results, baseline)
+
+    if args.output:
+        write_json(args.output, results)
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for resolution, name, baseline_median, median in regressions:
+        print(f'Regression in {name} at {resolution}: {baseline_median:.3f} ms -> {median:.3f} ms')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
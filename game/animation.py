@@ -0,0 +1,40 @@
+import time
+
+
+class MoveAnimator:
+    def __init__(self, duration=0.18):
+        self.duration = duration
+        self.moves = []
+        self.hidden = set()
+        self.started = 0.0
+
+    @property
+    def active(self):
+        return bool(self.moves)
+
+    def start(self, cell_moves, now=None):
+        # the board is already in its final state, sprites only cover the squares they are moving into
+        self.started = time.perf_counter() if now is None else now
+        zombie_phase = 1 if any(piece[0] == 'p' for piece, _, _ in cell_moves) else 0
+        self.moves = [(piece, start, end, 0 if piece[0] == 'p' else zombie_phase) for piece, start, end in cell_moves]
+        self.hidden = {end for _, _, end, _ in self.moves}
+
+    def stop(self):
+        self.moves = []
+        self.hidden = set()
+
+    def update(self, now=None):
+        if not self.moves:
+            return
+        elapsed = (time.perf_counter() if now is None else now) - self.started
+        if elapsed >= self.duration * (1 + max(phase for _, _, _, phase in self.moves)):
+            self.stop()
+
+    def sprites(self, now=None):
+        # player moves play first and the zombie wave follows, each eased out over one duration
+        elapsed = (time.perf_counter() if now is None else now) - self.started
+        for piece, (start_row, start_col), (end_row, end_col), phase in self.moves:
+            progress = min(1.0, max(0.0, elapsed / self.duration - phase))
+            progress = 1 - (1 - progress) ** 2
+            yield (piece, start_row + (end_row - start_row) * progress,
+                   start_col + (end_col - start_col) * progress)
@@ -0,0 +1,235 @@
+import pygame
+
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# next to the game rather than in the working directory, so launching from elsewhere reuses the same cache
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+
+class AssetManager:
+    PIECES = ('pawn', 'rook', 'knight', 'bishop', 'queen', 'King',
+              'zombie_walker', 'zombie_stomper', 'zombie_infected', 'zombie_exploding')
+
+    def __init__(self, pieces_dir='img/chess_pieces', backgrounds_dir='img/backgrounds/16-9', fonts_dir='util',
+                 cache_dir=CACHE_DIR, max_cache_bytes=256 * 1024 * 1024):
+        self.pieces_dir = pieces_dir
+        self.backgrounds_dir = backgrounds_dir
+        self.fonts_dir = fonts_dir
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        # files are written from the loading and thumbnail threads as well, the running total is shared
+        self._cache_lock = threading.Lock()
+        self._cache_bytes = None
+        self.source_images = {}
+        self.pieces_hash = None
+        self.piece_images = {}
+        self.atlases = {}
+        self.pixel_format = 'RGBA'
+        self.pending = None
+
+    @staticmethod
+    def piece_name(piece):
+        return f'p{piece[0]}' if piece[0] != 'z' else f'z{piece[7]}'
+
+    @staticmethod
+    def display_pixel_format():
+        surface = pygame.display.get_surface()
+        if surface is not None and surface.get_bitsize() == 32 and surface.get_masks()[:3] == (0xff0000, 0xff00, 0xff):
+            return 'BGRA'
+        return 'RGBA'
+
+    def cache_path(self, kind, asset_hash, size, pixel_format):
+        # the pixel format is passed in rather than read from self, worker threads must not see it change under them
+        return os.path.join(self.cache_dir, f'{kind}-{asset_hash}-{size[0]}x{size[1]}-{pixel_format}.raw')
+
+    def read_cached(self, path, size, pixel_format):
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except IOError:
+            return None
+        if len(data) != size[0] * size[1] * 4:
+            return None
+        try:
+            # the modification time doubles as the last use, see sweep_cache()
+            os.utime(path)
+        except OSError:
+            pass
+        return pygame.image.frombytes(data, size, pixel_format)
+
+    def write_cached(self, path, surface, pixel_format):
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = pygame.image.tobytes(surface, pixel_format)
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except (IOError, OSError) as e:
+            print(f'Could not write cache file {path}: {e}')
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.sweep_cache(len(data))
+
+    def cache_files(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.raw') and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return files
+
+    def sweep_cache(self, added):
+        # every window size and pixel format gets its own files, the least recently used go once over the limit
+        with self._cache_lock:
+            try:
+                if self._cache_bytes is None:
+                    self._cache_bytes = sum(size for _, size, _ in self.cache_files())
+                else:
+                    self._cache_bytes += added
+                if self._cache_bytes <= self.max_cache_bytes:
+                    return
+                files = sorted(self.cache_files())
+                self._cache_bytes = sum(size for _, size, _ in files)
+                for _, size, path in files[:-1]:
+                    if self._cache_bytes <= self.max_cache_bytes:
+                        break
+                    os.remove(path)
+                    self._cache_bytes -= size
+            except OSError as e:
+                print(f'Could not clean up the cache in {self.cache_dir}: {e}')
+                self._cache_bytes = None
+
+    def drop_stale(self, kind, asset_hash):
+        # files of an older version of the same asset can never be read again
+        prefix, current = f'{kind}-', f'{kind}-{asset_hash}-'
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.startswith(prefix) and not entry.name.startswith(current):
+                    os.remove(entry.path)
+        except OSError:
+            return
+        with self._cache_lock:
+            self._cache_bytes = None
+
+    def read_piece_images(self):
+        images = {}
+        pieces_hash = hashlib.sha1()
+        for piece in self.PIECES:
+            filename = piece + '.png'
+            try:
+                with open(os.path.join(self.pieces_dir, filename), 'rb') as file:
+                    data = file.read()
+                images[self.piece_name(piece)] = pygame.image.load(io.BytesIO(data), filename)
+                pieces_hash.update(filename.encode())
+                pieces_hash.update(data)
+            except Exception as e:
+                print(f'Could not load image {filename}: {e}')
+        return images, pieces_hash.hexdigest()[:16]
+
+    def read_background(self, filename, size, pixel_format):
+        try:
+            with open(os.path.join(self.backgrounds_dir, filename), 'rb') as file:
+                data = file.read()
+        except IOError as e:
+            print(f'Could not load image {filename}: {e}')
+            return None
+
+        # prescaled backgrounds are cached on disk, so large displays skip the scaling on later launches
+        path = self.cache_path('background', hashlib.sha1(data).hexdigest()[:16], size, pixel_format)
+        background = self.read_cached(path, size, pixel_format)
+        if background is None:
+            try:
+                image = pygame.image.load(io.BytesIO(data), filename)
+            except Exception as e:
+                print(f'Could not load image {filename}: {e}')
+                return None
+            background = pygame.transform.scale(image, size)
+            self.write_cached(path, background, pixel_format)
+        return background
+
+    def read_fonts(self, filenames):
+        fonts = {}
+        for filename in filenames:
+            try:
+                with open(os.path.join(self.fonts_dir, filename), 'rb') as file:
+                    fonts[filename] = file.read()
+            except IOError as e:
+                print(f'Could not load font {filename}: {e}')
+        return fonts
+
+    def read_all(self, background, background_size, fonts, pixel_format):
+        images = self.read_piece_images()
+        background_image = self.read_background(background, background_size, pixel_format) if background else None
+        return images, background_image, self.read_fonts(fonts)
+
+    def load_piece_images(self):
+        self.source_images, self.pieces_hash = self.read_piece_images()
+        self.convert()
+
+    def load_async(self, background, background_size, fonts):
+        # decoding runs on a worker thread, converting to the display format stays on the main thread
+        self.pixel_format = self.display_pixel_format()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = executor.submit(self.read_all, background, background_size, fonts, self.pixel_format)
+        executor.shutdown(wait=False)
+
+    def take_loaded(self, wait=False):
+        if self.pending is None or not (wait or self.pending.done()):
+            return None
+        pending, self.pending = self.pending, None
+        (self.source_images, self.pieces_hash), background, fonts = pending.result()
+        self.convert()
+        if background is not None and pygame.display.get_surface() is not None:
+            background = background.convert()
+        return background, fonts
+
+    def convert(self):
+        # surfaces in the display's pixel format blit without per-pixel format conversion
+        if pygame.display.get_surface() is None:
+            self.piece_images = dict(self.source_images)
+        else:
+            self.piece_images = {name: image.convert_alpha() for name, image in self.source_images.items()}
+        self.pixel_format = self.display_pixel_format()
+        self.atlases.clear()
+
+    def get_atlas(self, size):
+        atlas = self.atlases.get(size)
+        if atlas is None:
+            atlas_size = (max(1, size * len(self.piece_images)), max(1, size))
+            rects = {name: pygame.Rect(i * size, 0, size, size) for i, name in enumerate(self.piece_images)}
+
+            path = None
+            surface = None
+            if self.pieces_hash and size > 0:
+                path = self.cache_path('atlas', self.pieces_hash, atlas_size, self.pixel_format)
+                surface = self.read_cached(path, atlas_size, self.pixel_format)
+            if surface is None:
+                # scaling into a subsurface copies raw pixels, so the atlas takes the images' pixel format
+                images = list(self.piece_images.values())
+                if images:
+                    surface = pygame.Surface(atlas_size, pygame.SRCALPHA, 32, images[0].get_masks())
+                else:
+                    surface = pygame.Surface(atlas_size, pygame.SRCALPHA)
+                if size > 0:
+                    for name, image in self.piece_images.items():
+                        pygame.transform.scale(image, (size, size), surface.subsurface(rects[name]))
+                    if path:
+                        self.drop_stale('atlas', self.pieces_hash)
+                        self.write_cached(path, surface, self.pixel_format)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            atlas = (surface, rects)
+            self.atlases[size] = atlas
+        return atlas
+
+    def blit_piece(self, target, piece, size, pos):
+        surface, rects = self.get_atlas(size)
+        rect = rects.get(piece)
+        if rect is not None:
+            target.blit(surface, pos, rect)
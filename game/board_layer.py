@@ -0,0 +1,69 @@
+import pygame
+
+
+class BoardLayer:
+    _UNDRAWN = object()
+
+    def __init__(self, rows, cols, square_size, colors, highlight_color):
+        self.rows = rows
+        self.cols = cols
+        self.square_size = int(square_size)
+        self.colors = colors
+        self.highlight_color = highlight_color[:3]
+        self.surface = pygame.Surface((cols * self.square_size, rows * self.square_size))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+
+        self.cells = [[self._UNDRAWN for _ in range(cols)] for _ in range(rows)]
+        self.selected = None
+
+    def update(self, board, assets, selected=None, hidden=()):
+        # only squares whose content changed since the last update are redrawn
+        changed = False
+        if selected != self.selected:
+            for cell in (self.selected, selected):
+                if cell is not None and 0 <= cell[0] < self.rows:
+                    self.cells[cell[0]][cell[1]] = self._UNDRAWN
+            self.selected = selected
+
+        for row in range(self.rows):
+            board_row = board[row]
+            cells_row = self.cells[row]
+            for col in range(self.cols):
+                piece = board_row[col]
+                if hidden and (row, col) in hidden:
+                    piece = None
+                if cells_row[col] is piece:
+                    continue
+                self.draw_square(row, col, piece, assets)
+                cells_row[col] = piece
+                changed = True
+        return changed
+
+    def draw_square(self, row, col, piece, assets):
+        square_size = self.square_size
+        x = col * square_size
+        y = row * square_size
+        if (row, col) == self.selected:
+            color = self.highlight_color
+        else:
+            color = self.colors[(row + col) % 2]
+        self.surface.fill(color, (x, y, square_size, square_size))
+
+        if piece:
+            assets.blit_piece(self.surface, piece[:2], square_size - 10, (x + 5, y + 5))
+
+    def blit(self, target, x, y, start_row=0, end_row=None):
+        if end_row is None:
+            end_row = self.rows
+        area = (0, start_row * self.square_size, self.surface.get_width(), (end_row - start_row) * self.square_size)
+        target.blit(self.surface, (x, y), area)
+
+    def blit_sprites(self, target, x, y, start_row, end_row, sprites, assets):
+        square_size = self.square_size
+        clip = target.get_clip()
+        target.set_clip((x, y, self.surface.get_width(), (end_row - start_row) * square_size))
+        for piece, row, col in sprites:
+            pos = (x + int(col * square_size) + 5, y + int((row - start_row) * square_size) + 5)
+            assets.blit_piece(target, piece[:2], square_size - 10, pos)
+        target.set_clip(clip)
@@ -0,0 +1,144 @@
+import pygame
+
+import weakref
+
+
+class SurfaceCanvas:
+    def __init__(self, surface):
+        self.surface = surface
+        self.blit = surface.blit
+        self.fill = surface.fill
+        self.get_size = surface.get_size
+        self.get_clip = surface.get_clip
+        self.set_clip = surface.set_clip
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        return pygame.draw.rect(self.surface, color, rect, width, border_radius)
+
+    def line(self, color, start, end, width=1):
+        return pygame.draw.line(self.surface, color, start, end, width)
+
+    def invalidate(self, surface):
+        pass
+
+    def snapshot(self, target):
+        target.blit(self.surface, (0, 0))
+
+    def present(self):
+        pygame.display.flip()
+
+
+def as_canvas(target):
+    if isinstance(target, pygame.Surface):
+        return SurfaceCanvas(target)
+    return target
+
+
+class TextureCanvas:
+    def __init__(self, renderer, size):
+        from pygame._sdl2.video import Texture
+
+        self.texture_type = Texture
+        self.renderer = renderer
+        self.size = tuple(size)
+        self.clip = None
+        # textures live as long as the surfaces they were uploaded from
+        self.textures = weakref.WeakKeyDictionary()
+        self.shapes = {}
+
+    @classmethod
+    def open(cls, title, size, fullscreen=False, vsync=False, accelerated=-1):
+        from pygame._sdl2.video import Window, Renderer
+
+        window = Window(title, size, fullscreen_desktop=fullscreen)
+        renderer = Renderer(window, accelerated=accelerated, vsync=vsync)
+        canvas = cls(renderer, size)
+        canvas.window = window
+        return canvas
+
+    def set_mode(self, size, fullscreen):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            self.window.size = size
+        self.size = tuple(size)
+
+    def get_size(self):
+        return self.size
+
+    def get_clip(self):
+        return pygame.Rect(self.clip) if self.clip else pygame.Rect((0, 0), self.size)
+
+    def set_clip(self, rect=None):
+        self.clip = pygame.Rect(rect) if rect is not None else None
+
+    def get_texture(self, surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.texture_type.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def invalidate(self, surface):
+        self.textures.pop(surface, None)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        source_rect = source.get_rect()
+        if area is not None:
+            source_rect = source_rect.clip(area)
+        dest_rect = pygame.Rect(dest[0], dest[1], source_rect.width, source_rect.height)
+        if self.clip:
+            clipped = dest_rect.clip(self.clip)
+            source_rect.x += clipped.x - dest_rect.x
+            source_rect.y += clipped.y - dest_rect.y
+            source_rect.size = clipped.size
+            dest_rect = clipped
+        if dest_rect.width > 0 and dest_rect.height > 0:
+            self.get_texture(source).draw(source_rect, dest_rect)
+        return dest_rect
+
+    def fill(self, color, rect=None):
+        rect = pygame.Rect(rect) if rect is not None else pygame.Rect((0, 0), self.size)
+        if self.clip:
+            rect = rect.clip(self.clip)
+        self.renderer.draw_color = pygame.Color(*color[:3])
+        self.renderer.fill_rect(rect)
+        return rect
+
+    def get_shape(self, key, size, draw):
+        shape = self.shapes.get(key)
+        if shape is None:
+            if len(self.shapes) >= 256:
+                self.shapes.clear()
+            shape = pygame.Surface(size, pygame.SRCALPHA)
+            draw(shape)
+            self.shapes[key] = shape
+        return shape
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        rect = pygame.Rect(rect)
+        if width <= 0 and border_radius <= 0:
+            return self.fill(color, rect)
+        # outlines and rounded corners are drawn once into a surface and reused as a texture
+        # the window surface has no alpha, so shapes are drawn opaque like pygame.draw does there
+        shape = self.get_shape(('rect', color, rect.size, width, border_radius), rect.size,
+                               lambda surface: pygame.draw.rect(surface, color[:3], surface.get_rect(), width,
+                                                                border_radius))
+        self.blit(shape, rect.topleft)
+        return rect
+
+    def line(self, color, start, end, width=1):
+        left, top = min(start[0], end[0]) - width, min(start[1], end[1]) - width
+        size = (abs(end[0] - start[0]) + 2 * width + 1, abs(end[1] - start[1]) + 2 * width + 1)
+        offset_start = (start[0] - left, start[1] - top)
+        offset_end = (end[0] - left, end[1] - top)
+        shape = self.get_shape(('line', color, size, offset_start, offset_end, width), size,
+                               lambda surface: pygame.draw.line(surface, color[:3], offset_start, offset_end, width))
+        return self.blit(shape, (left, top))
+
+    def snapshot(self, target):
+        target.blit(self.renderer.to_surface(), (0, 0))
+
+    def present(self):
+        self.renderer.present()
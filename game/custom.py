@@ -1,10 +1,23 @@
+import argparse
+import hashlib
 import json
-import random
-import string
+import queue
 import os
-
+import sqlite3
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from game.custom_format import Bundle, FormatError, read_game_file, write_bundle, write_game_file
+from game.custom_index import CustomGameIndex
+from game.custom_search import CustomGameSearch
+from game.custom_schema import GAME_MODES, DIFFICULTIES, validate_gm_json, validate_file
+from game.custom_watcher import watch_directory
 from game.game_modes import GameMode, Difficulty
 
+INDEX_PATH = os.path.join('custom_gm', 'index.sqlite3')
+BUNDLE_SUFFIX = '.pwbundle'
+
 
 class CustomGame:
     def __init__(self, name='', board_height=8, can_change_gm=True, can_change_difficulty=True,
@@ -26,6 +39,8 @@ class CustomGameCreator:
         self.input_focused = False
         self.selected_piece = None
         self.error_msg = None
+        self._executor = None
+        self._save_future = None
 
     def reset(self):
         self.game.name = ''
@@ -80,134 +95,647 @@ class CustomGameCreator:
         else:
             self.is_name_ok = False
 
-    def save(self):
-        while True:
-            random_string = ''.join(random.choices(string.digits + string.ascii_letters, k=12))
-            filename = f'custom_gm/{random_string}.json'
-
-            if not os.path.exists(filename):
-                break
-
+    def game_data(self):
+        # pieces get their index in the saved copy only, the board being edited stays as it is
+        board = [[val for val in row] for row in self.game.board]
         index = 0
         for i in range(self.game.board_height):
             for j in range(8):
-                if self.game.board[i][j] and self.game.board[i][j][0] == 'p':
-                    self.game.board[i][j] += str(index)
+                if board[i][j] and board[i][j][0] == 'p':
+                    board[i][j] += str(index)
                     index += 1
 
-        data = {
+        return {
             'name': self.game.name,
             'board_height': self.game.board_height,
             'can_change_gm': self.game.can_change_gm,
             'can_change_difficulty': self.game.can_change_difficulty,
             'base_gm': str(self.game.base_gm),
             'difficulty': str(self.game.difficulty),
-            'board': self.game.board
+            'board': board
         }
+
+    @staticmethod
+    def content_hash(data):
+        # the name is left out, the same board with the same settings is the same game mode
+        settings = {key: value for key, value in data.items() if key != 'name'}
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def write(self, data):
+        filename = os.path.join('custom_gm', f'{self.content_hash(data)[:16]}.json')
+        if os.path.exists(filename):
+            self.error_msg = 'This game mode is already saved'
+            return
+        temp_filename = f'{filename}.{os.getpid()}.tmp'
         try:
-            with open(filename, 'w') as file:
+            os.makedirs('custom_gm', exist_ok=True)
+            with open(temp_filename, 'w') as file:
                 json.dump(data, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            # the loader and its watcher only ever see the finished file
+            os.replace(temp_filename, filename)
         except Exception as e:
             self.error_msg = str(e)
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
 
+    def save(self):
+        self.error_msg = None
+        self.write(self.game_data())
+
+    def save_in_background(self):
+        self.error_msg = None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='custom-save')
+        self._save_future = self._executor.submit(self.write, self.game_data())
+
+    @property
+    def saving(self):
+        return self._save_future is not None and not self._save_future.done()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+class CustomGameFilter:
+    # None stands for any value and comes first in every cycle
+    GAME_MODES = (None, *GameMode)
+    DIFFICULTIES = (None, *Difficulty)
+    BOARD_HEIGHTS = (None, *range(6, 19))
 
-class CustomGameLoader:
     def __init__(self):
+        self.text = ''
+        self.base_gm = None
+        self.difficulty = None
+        self.board_height = None
+        self.input_focused = False
+
+    def reset(self):
+        self.text = ''
+        self.base_gm = None
+        self.difficulty = None
+        self.board_height = None
+        self.input_focused = False
+
+    @property
+    def key(self):
+        return self.text, self.base_gm, self.difficulty, self.board_height
+
+    def add_text(self, text):
+        if len(self.text) + len(text) <= 30:
+            self.text += text
+
+    def rm_char(self):
+        self.text = self.text[:-1]
+
+    @staticmethod
+    def next_value(values, current):
+        return values[(values.index(current) + 1) % len(values)]
+
+    def switch_base_gm(self):
+        self.base_gm = self.next_value(self.GAME_MODES, self.base_gm)
+
+    def switch_difficulty(self):
+        self.difficulty = self.next_value(self.DIFFICULTIES, self.difficulty)
+
+    def switch_board_height(self):
+        self.board_height = self.next_value(self.BOARD_HEIGHTS, self.board_height)
+
+
+class CustomGameLoader:
+    def __init__(self, max_workers=None, index_path=None, max_boards=32):
         self.game_modes = {}
         self.selected_gm = None
         self.error_msg = None
+        self.errors = {}
+        self.loaded = 0
+        self.total = 0
+        self.loading = False
+        self.max_workers = max_workers
+        self.index_path = index_path
+        self.index = None
+        self.watcher = None
+        self.max_boards = max_boards
+        # bumped whenever a game is added, replaced or removed, views keyed on the catalog compare against it
+        self.version = 0
+        self.search_index = CustomGameSearch()
+        # game_modes only holds headers, boards are read when a game is selected and kept for the most recent ones
+        self._boards = OrderedDict()
+        # bundle file -> (mtime_ns, size, Bundle), their games get '<bundle name>/<id>' ids which no json file can
+        # have
+        self.bundles = {}
+        self._executor = None
+        self._futures = []
+        self._announce = True
+        self._results = queue.SimpleQueue()
 
     def reset(self):
         self.error_msg = None
-        self.selected_gm = None
+        self.unselect_gm()
 
     def unselect_gm(self):
+        # boards are kept in _boards only, even when the selected one was evicted from there meanwhile
+        if self.selected_gm:
+            self.selected_gm[1].board = None
         self.selected_gm = None
 
     def select_gm(self, gm_id):
-        self.selected_gm = (gm_id, self.game_modes[gm_id])
+        self.unselect_gm()
+        game = self.game_modes[gm_id]
+        if game.board is None:
+            game.board = self.get_board(gm_id)
+        self.selected_gm = (gm_id, game)
+        return game.board is not None
+
+    def get_board(self, gm_id):
+        board = self._boards.get(gm_id)
+        if board is not None:
+            self._boards.move_to_end(gm_id)
+            return board
+        board = self.read_board(gm_id)
+        if board is not None:
+            self.cache_board(gm_id, board)
+        return board
+
+    def cache_board(self, gm_id, board):
+        self._boards[gm_id] = board
+        self._boards.move_to_end(gm_id)
+        if len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+
+    def read_board(self, gm_id):
+        if '/' in gm_id:
+            return self.read_bundle_board(gm_id)
+        file = f'{gm_id}.json'
+        if self.index is not None:
+            try:
+                board = self.index.board(file)
+                if board is not None:
+                    return board
+            except sqlite3.Error as e:
+                self.drop_index(e)
+        board, error = self.read_board_file(file)
+        if error:
+            self.error_msg = error
+        return board
+
+    def read_bundle_board(self, gm_id):
+        name, entry_id = gm_id.split('/', 1)
+        file = f'{name}{BUNDLE_SUFFIX}'
+        board, error = self.read_bundle_entry(file, self.bundles.get(file), gm_id)
+        if error:
+            self.error_msg = error
+        return board
+
+    @classmethod
+    def read_board_file(cls, file):
+        try:
+            with open(os.path.join('custom_gm', file), 'r') as f:
+                parsed_gm, error = cls.read_gm_json(file, json.load(f))
+        except Exception as e:
+            # also runs on worker threads, where anything not caught here would be lost
+            parsed_gm, error = None, f'Error reading .json file {file}: {e}'
+        return (None, error) if error else (parsed_gm.board, None)
+
+    @classmethod
+    def read_bundle_entry(cls, file, bundle, gm_id):
+        entry_id = gm_id.split('/', 1)[1]
+        try:
+            # a bundle closed by a refresh meanwhile raises ValueError as well
+            parsed_gm, error = cls.read_gm_json(gm_id, bundle[2].read(entry_id))
+        except (KeyError, ValueError, TypeError):
+            parsed_gm, error = None, f'Error reading {entry_id} from bundle {file}'
+        return (None, error) if error else (parsed_gm.board, None)
+
+    def board_reader(self, gm_id):
+        # for boards read on another thread, which can neither use the index connection nor set error_msg
+        board = self._boards.get(gm_id)
+        if board is not None:
+            return lambda: board
+        if '/' not in gm_id:
+            return lambda: self.read_board_file(f'{gm_id}.json')[0]
+        file = f'{gm_id.split("/", 1)[0]}{BUNDLE_SUFFIX}'
+        bundle = self.bundles.get(file)
+        return lambda: self.read_bundle_entry(file, bundle, gm_id)[0]
 
     def parse_gm_json(self, filename, gm_json):
-        if 'board_height' not in gm_json:
-            self.error_msg = f"'board_height' field is required ({filename})"
-            return None
-        if 'base_gm' not in gm_json:
-            self.error_msg = f"'base_gm' field is required ({filename})"
-            return None
-        if 'difficulty' not in gm_json:
-            self.error_msg = f"'difficulty' field is required ({filename})"
-            return None
-        if 'board' not in gm_json:
-            self.error_msg = f"'board' field is required ({filename})"
-            return None
-        if 'can_change_gm' not in gm_json:
-            self.error_msg = f"'can_change_gm' field is required ({filename})"
-            return None
-        if 'can_change_difficulty' not in gm_json:
-            self.error_msg = f"'can_change_difficulty' field is required ({filename})"
-            return None
+        parsed_gm, error = self.read_gm_json(filename, gm_json)
+        if error:
+            self.error_msg = error
+        return parsed_gm
+
+    @staticmethod
+    def read_gm_json(filename, gm_json):
+        errors = validate_gm_json(gm_json)
+        if errors:
+            return None, f"{'; '.join(errors)} ({filename})"
+        return CustomGame(gm_json.get('name', '<unknown>'), gm_json['board_height'], gm_json['can_change_gm'],
+                          gm_json['can_change_difficulty'], GAME_MODES[gm_json['base_gm']],
+                          DIFFICULTIES[gm_json['difficulty']], gm_json['board']), None
+
+    @property
+    def progress(self):
+        return self.loaded, self.total
+
+    def open_index(self):
+        if self.index is None and self.index_path:
+            try:
+                self.index = CustomGameIndex(self.index_path)
+            except sqlite3.Error as e:
+                print(f'Custom game index unavailable, reading every file instead: {e}')
+                self.index_path = None
+        return self.index
+
+    def drop_index(self, error):
+        print(f'Custom game index failed, reading every file from now on: {error}')
+        self.index.close()
+        self.index = None
+        self.index_path = None
+
+    @staticmethod
+    def game_from_header(header):
+        return CustomGame(header.get('name', '<unknown>'), header['board_height'], header['can_change_gm'],
+                          header['can_change_difficulty'], GAME_MODES[header['base_gm']],
+                          DIFFICULTIES[header['difficulty']])
+
+    def load_bundles(self, listed):
+        # a bundle is only reopened when it changed, reading its table of contents and game headers is cheap
+        # enough to happen right here, boards are read from the mapped file on selection
+        for file in list(self.bundles):
+            mtime_ns, size, bundle = self.bundles[file]
+            stat = self.stat_game_file(file)
+            if stat is not None and stat == (mtime_ns, size):
+                continue
+            del self.bundles[file]
+            bundle.close()
+            self.remove_games([], f'{file[:-len(BUNDLE_SUFFIX)]}/')
+        for file in listed:
+            if file in self.bundles:
+                continue
+            stat = self.stat_game_file(file)
+            if stat is None:
+                continue
+            try:
+                bundle = Bundle(os.path.join('custom_gm', file))
+            except (ValueError, OSError) as e:
+                self.errors[file] = f'Error reading bundle {file}: {e}'
+                continue
+            try:
+                games = {f'{file[:-len(BUNDLE_SUFFIX)]}/{entry_id}': self.game_from_header(header)
+                         for entry_id, header in bundle.headers()}
+            except (ValueError, KeyError) as e:
+                bundle.close()
+                self.errors[file] = f'Error reading bundle {file}: {e}'
+                continue
+            self.bundles[file] = (*stat, bundle)
+            for gm_id, game in games.items():
+                self.add_game(gm_id, game)
+
+    @staticmethod
+    def game_from_entry(entry):
+        return CustomGame(entry['name'], entry['board_height'], bool(entry['can_change_gm']),
+                          bool(entry['can_change_difficulty']), GameMode(entry['base_gm']),
+                          Difficulty[entry['difficulty']])
+
+    def load_file(self, file, index, entry=None):
+        path = os.path.join('custom_gm', file)
+        record = None
+        try:
+            if index is None:
+                with open(path, 'r') as f:
+                    parsed_gm, error = self.read_gm_json(file, json.load(f))
+            else:
+                stat = os.stat(path)
+                with open(path, 'rb') as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()
+                record = (stat.st_mtime_ns, stat.st_size, digest)
+                if entry and entry['hash'] == digest:
+                    # touched but not changed, the indexed copy is still valid
+                    parsed_gm, error = self.game_from_entry(entry), None
+                else:
+                    parsed_gm, error = self.read_gm_json(file, json.loads(content))
+        except Exception as e:
+            # whatever goes wrong, the file has to be counted, otherwise the batch never finishes and the loader
+            # stays busy for good, this covers nesting too deep for json (RecursionError) and broken index rows
+            parsed_gm, error, record = None, f'Error reading .json file {file}: {e}', None
+        self._results.put((file, parsed_gm, error, record))
+
+    def start(self, files=None, announce=True):
+        # without files the whole directory is listed and only games that are not loaded yet are read,
+        # edits and deletes of loaded games come in through the watcher
+        if self.loading:
+            return
+        index = self.open_index()
+        entries = {}
+        if index is not None:
+            try:
+                entries = index.entries(files)
+            except sqlite3.Error as e:
+                self.drop_index(e)
+                index = None
 
-        board = gm_json['board']
-        if type(board) != list:
-            self.error_msg = f"Board must be a LIST of lists of strings/nulls ({filename})"
-            return None
-        board_height = gm_json['board_height']
-        if type(board_height) != int or board_height > 18 or board_height < 6 or board_height != len(board):
-            self.error_msg = f"Board height must be an integer between 6 and 18 and match the number of rows in 'board' field ({filename})"
+        if files is None:
+            try:
+                listed_all = os.listdir('custom_gm')
+            except FileNotFoundError:
+                os.makedirs('custom_gm', exist_ok=True)
+                listed_all = []
+            listed_files = [f for f in listed_all if f.endswith('.json')]
+            listed = set(listed_files)
+            self.remove_games(self.missing_files(listed) + [file for file in entries if file not in listed])
+            files = [f for f in listed_files if f[:-5] not in self.game_modes]
+            self.errors = {}
+            self.load_bundles(sorted(f for f in listed_all if f.endswith(BUNDLE_SUFFIX)))
+        else:
+            for file in files:
+                self.errors.pop(file, None)
+
+        self.loading = True
+        self._announce = announce
+        self.loaded = 0
+        self.total = len(files)
+        self._futures = []
+        for file in files:
+            entry = entries.get(file)
+            if entry and self.is_unchanged(file, entry):
+                try:
+                    self._results.put((file, self.game_from_entry(entry), None, None))
+                    continue
+                except (KeyError, ValueError):
+                    # a broken index row is replaced by reading the file again
+                    entry = None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='custom-gm')
+            self._futures.append(self._executor.submit(self.load_file, file, index, entry))
+
+    def add_game(self, gm_id, game):
+        self.game_modes[gm_id] = game
+        self.search_index.add(gm_id, game)
+        self.version += 1
+
+    def drop_game(self, gm_id):
+        if self.game_modes.pop(gm_id, None) is not None:
+            self.search_index.remove(gm_id)
+            self.version += 1
+
+    def missing_files(self, listed):
+        return [f'{gm_id}.json' for gm_id in self.game_modes if '/' not in gm_id and f'{gm_id}.json' not in listed]
+
+    def remove_games(self, files, bundle_prefix=None):
+        gm_ids = [file[:-5] for file in files]
+        if bundle_prefix:
+            gm_ids += [gm_id for gm_id in self.game_modes if gm_id.startswith(bundle_prefix)]
+        for gm_id in gm_ids:
+            self.drop_game(gm_id)
+            self._boards.pop(gm_id, None)
+            if self.selected_gm and self.selected_gm[0] == gm_id:
+                self.selected_gm = None
+        for file in files:
+            self.errors.pop(file, None)
+        if not files:
+            return
+        if self.index is not None:
+            try:
+                self.index.remove(files)
+                self.index.commit()
+            except sqlite3.Error as e:
+                self.drop_index(e)
+
+    def watch(self):
+        if self.watcher is None:
+            os.makedirs('custom_gm', exist_ok=True)
+            self.watcher = watch_directory('custom_gm')
+
+    def poll_watcher(self):
+        if self.watcher is None:
+            return
+        changes = self.watcher.changes()
+        if changes is None:
+            try:
+                files = [f for f in os.listdir('custom_gm') if f.endswith('.json')]
+            except FileNotFoundError:
+                files = []
+            self.remove_games(self.missing_files(set(files)))
+            self.start(files, announce=False)
+            return
+        changed, removed = changes
+        self.remove_games(sorted(removed))
+        if changed:
+            self.start(sorted(changed), announce=False)
+
+    @staticmethod
+    def stat_game_file(file):
+        try:
+            stat = os.stat(os.path.join('custom_gm', file))
+        except OSError:
             return None
+        return stat.st_mtime_ns, stat.st_size
 
-        for i in range(board_height):
-            if type(board[i]) != list:
-                self.error_msg = f"Board must be a list of LISTS of strings/nulls ({filename})"
+    def is_unchanged(self, file, entry):
+        return self.stat_game_file(file) == (entry['mtime_ns'], entry['size'])
+
+    def update_index(self, file, parsed_gm, record):
+        if self.index is None:
+            return
+        try:
+            if parsed_gm is None:
+                self.index.remove([file])
+            elif record is not None and parsed_gm.board is None:
+                self.index.touch(file, *record[:2])
+            elif record is not None:
+                self.index.put(file, *record, parsed_gm)
+        except sqlite3.Error as e:
+            self.drop_index(e)
+
+    def poll(self):
+        # parsed games only enter game_modes here, on the caller's thread, so the menu never sees the dict change
+        # while it draws
+        self.search_index.index_pending(0.002)
+        if not self.loading:
+            self.poll_watcher()
+            if not self.loading:
                 return None
-            for val in board[i]:
-                if val is not None and type(val) != str:
-                    self.error_msg = f"Board must be a list of lists of STRINGS/NULLS ({filename})"
-                    return None
-
-        base_gm = gm_json['base_gm']
-        if type(base_gm) != str or not any(gm.value == base_gm for gm in GameMode):
-            self.error_msg = f"Base game mode must be a string representing a valid game mode ({filename})"
-            return None
-        difficulty = gm_json['difficulty']
-        if type(difficulty) != str or not any(diff.name.capitalize() == difficulty for diff in Difficulty):
-            self.error_msg = f"Difficulty must be a string representing a valid difficulty ({filename})"
-            return None
-        can_change_gm = gm_json['can_change_gm']
-        if type(can_change_gm) != bool:
-            self.error_msg = f"'Can change game mode' must be a boolean ({filename})"
+        while True:
+            try:
+                file, parsed_gm, error, record = self._results.get_nowait()
+            except queue.Empty:
+                break
+            gm_id = file[:-5]
+            self.loaded += 1
+            self.update_index(file, parsed_gm, record)
+            self._boards.pop(gm_id, None)
+            # a selected game that changed on disk is shown again in its new version, or dropped when it broke
+            reselect = self.selected_gm is not None and self.selected_gm[0] == gm_id
+            if reselect:
+                self.selected_gm = None
+            if error:
+                self.errors[file] = error
+                continue
+            if parsed_gm.board is not None and reselect:
+                self.cache_board(gm_id, parsed_gm.board)
+            parsed_gm.board = None
+            self.add_game(gm_id, parsed_gm)
+            if reselect:
+                self.select_gm(gm_id)
+
+        if self.loaded < self.total:
             return None
-        can_change_difficulty = gm_json['can_change_difficulty']
-        if type(can_change_difficulty) != bool:
-            self.error_msg = f"'Can change difficulty' must be a boolean ({filename})"
+        self.loading = False
+        self._futures = []
+        if self.index is not None:
+            try:
+                self.index.commit()
+            except sqlite3.Error as e:
+                self.drop_index(e)
+        if not self._announce:
             return None
+        if self.errors:
+            first_error = next(iter(self.errors.values()))
+            others = len(self.errors) - 1
+            self.error_msg = f'{first_error} and {others} more' if others else first_error
+        return not self.errors
 
-        if 'name' not in gm_json:
-            name = '<unknown>'
-        else:
-            name = gm_json['name']
+    def search(self, text='', base_gm=None, difficulty=None, board_height=None):
+        # answered from memory on every keystroke, sorted by name
+        return self.search_index.search(text, base_gm, difficulty, board_height)
 
-        return CustomGame(name, board_height, can_change_gm, can_change_difficulty,
-                          GameMode(base_gm), Difficulty[difficulty.upper()], board)
+    def wait_until_loaded(self):
+        wait(self._futures)
 
     def get_all(self):
+        self.start()
+        self.wait_until_loaded()
+        return self.poll()
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        for _, _, bundle in self.bundles.values():
+            bundle.close()
+        self.bundles = {}
+
+
+def validate_directory(directory, workers=None):
+    files = sorted(f for f in os.listdir(directory) if f.endswith('.json'))
+    paths = [os.path.join(directory, f) for f in files]
+    # validation is pure python, separate processes are what actually spreads it over the cores
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(files, executor.map(validate_file, paths, chunksize=64)))
+
+
+def read_game(path):
+    if path.endswith('.json'):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return read_game_file(path)
+
+
+def write_game(path, data):
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+    else:
+        write_game_file(path, data)
+
+
+def pack_directory(directory, path):
+    games, invalid = {}, {}
+    for file in sorted(f for f in os.listdir(directory) if f.endswith('.json')):
         try:
-            game_mode_files = [f for f in os.listdir('custom_gm') if f.endswith('.json') and f not in self.game_modes]
-        except FileNotFoundError:
-            os.makedirs('custom_gm', exist_ok=True)
-            return True
-
-        success = True
-        for file in game_mode_files:
-            try:
-                with open(os.path.join('custom_gm', file), 'r') as f:
-                    parsed_gm = self.parse_gm_json(file, json.load(f))
-                    if parsed_gm is None:
-                        success = False
-                        continue
-                    self.game_modes[file[:-5]] = parsed_gm
-            except (json.JSONDecodeError, IOError):
-                self.error_msg = f'Error reading .json file {file}'
-                success = False
-
-        return success
+            data = read_game(os.path.join(directory, file))
+        except (ValueError, IOError) as e:
+            invalid[file] = [f'Error reading .json file: {e}']
+            continue
+        errors = validate_gm_json(data)
+        if errors:
+            invalid[file] = errors
+        else:
+            games[file[:-5]] = data
+    write_bundle(path, games)
+    return games, invalid
+
+
+def unpack_bundle(path, directory):
+    os.makedirs(directory, exist_ok=True)
+    bundle = Bundle(path)
+    try:
+        ids = bundle.ids()
+        for gm_id in ids:
+            write_game(os.path.join(directory, f'{gm_id}.json'), bundle.read(gm_id))
+    finally:
+        bundle.close()
+    return ids
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m game.custom', description='Custom game tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    validate = commands.add_parser('validate', help='check every custom game file in a directory')
+    validate.add_argument('directory')
+    validate.add_argument('--workers', type=int, help='number of processes, one per core by default')
+    pack = commands.add_parser('pack', help=f'store every valid game of a directory in one {BUNDLE_SUFFIX} file')
+    pack.add_argument('directory')
+    pack.add_argument('bundle')
+    unpack = commands.add_parser('unpack', help='write every game of a bundle back as a .json file')
+    unpack.add_argument('bundle')
+    unpack.add_argument('directory')
+    convert = commands.add_parser('convert', help='convert one game between .json and the compact .pwb format')
+    convert.add_argument('source')
+    convert.add_argument('target')
+    args = parser.parse_args(argv)
+
+    if args.command == 'pack':
+        try:
+            games, invalid = pack_directory(args.directory, args.bundle)
+        except (ValueError, OSError) as e:
+            print(f'Cannot pack {args.directory}: {e}')
+            return 2
+        for file, errors in invalid.items():
+            print(f'{file} skipped: {"; ".join(errors)}')
+        print(f'{len(games)} games packed into {args.bundle}')
+        return 1 if invalid else 0
+    if args.command == 'unpack':
+        try:
+            ids = unpack_bundle(args.bundle, args.directory)
+        except (ValueError, OSError) as e:
+            print(f'Cannot unpack {args.bundle}: {e}')
+            return 2
+        print(f'{len(ids)} games written to {args.directory}')
+        return 0
+    if args.command == 'convert':
+        try:
+            data = read_game(args.source)
+            errors = validate_gm_json(data)
+            if not errors:
+                write_game(args.target, data)
+        except (ValueError, OSError) as e:
+            errors = [str(e)]
+        for error in errors:
+            print(f'{args.source}: {error}')
+        return 1 if errors else 0
+
+    try:
+        results = validate_directory(args.directory, args.workers)
+    except OSError as e:
+        print(f'Cannot read {args.directory}: {e}')
+        return 2
+
+    invalid = {file: errors for file, errors in results.items() if errors}
+    for file, errors in invalid.items():
+        for error in errors:
+            print(f'{file}: {error}')
+    print(f'{len(results)} files checked, {len(results) - len(invalid)} valid, {len(invalid)} invalid')
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
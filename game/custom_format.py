@@ -0,0 +1,186 @@
+import bisect
+import mmap
+import os
+import struct
+
+from game.game_modes import GameMode, Difficulty
+
+GAME_MAGIC = b'PWBG'
+BUNDLE_MAGIC = b'PWBB'
+VERSION = 1
+# magic, version, flags, base game mode, difficulty, board height, board width, name length
+GAME_HEADER = struct.Struct('<4sBBBBBBH')
+# magic, version, game count
+BUNDLE_HEADER = struct.Struct('<4sB3xI')
+# game id, offset, length, entries are sorted by id so a game is found without reading the others
+TOC_ENTRY = struct.Struct('<32sQI')
+
+CAN_CHANGE_GM = 1
+CAN_CHANGE_DIFFICULTY = 2
+HAS_NAME = 4
+
+GAME_MODE_LIST = list(GameMode)
+DIFFICULTY_LIST = list(Difficulty)
+GAME_MODE_CODES = {str(gm): i for i, gm in enumerate(GAME_MODE_LIST)}
+DIFFICULTY_CODES = {str(diff): i for i, diff in enumerate(DIFFICULTY_LIST)}
+
+
+class FormatError(ValueError):
+    pass
+
+
+def encode_game(data):
+    # expects a game that already passed validate_gm_json
+    name = data.get('name', '').encode()
+    flags = ((CAN_CHANGE_GM if data['can_change_gm'] else 0) |
+             (CAN_CHANGE_DIFFICULTY if data['can_change_difficulty'] else 0) |
+             (HAS_NAME if 'name' in data else 0))
+    board = data['board']
+    width = len(board[0]) if board else 0
+
+    # every distinct cell string is stored once, the board itself is one byte per square
+    table = []
+    codes = {None: 0}
+    cells = bytearray()
+    for row in board:
+        for val in row:
+            code = codes.get(val)
+            if code is None:
+                table.append(val.encode())
+                code = codes[val] = len(table)
+            cells.append(code)
+    if len(table) > 255:
+        raise FormatError('Too many different pieces for the compact format')
+
+    parts = [GAME_HEADER.pack(GAME_MAGIC, VERSION, flags, GAME_MODE_CODES[data['base_gm']],
+                              DIFFICULTY_CODES[data['difficulty']], data['board_height'], width, len(name)),
+             name, bytes([len(table)])]
+    for val in table:
+        if len(val) > 255:
+            raise FormatError(f'Cell {val!r} is too long for the compact format')
+        parts.append(bytes([len(val)]))
+        parts.append(val)
+    parts.append(bytes(cells))
+    return b''.join(parts)
+
+
+def read_game_header(buffer, offset=0):
+    try:
+        magic, version, flags, base_gm, difficulty, board_height, width, name_length = \
+            GAME_HEADER.unpack_from(buffer, offset)
+    except struct.error:
+        raise FormatError('Truncated game header')
+    if magic != GAME_MAGIC or version != VERSION:
+        raise FormatError('Not a compact custom game')
+    if base_gm >= len(GAME_MODE_LIST) or difficulty >= len(DIFFICULTY_LIST):
+        raise FormatError('Unknown game mode or difficulty')
+    start = offset + GAME_HEADER.size
+    header = {
+        'name': bytes(buffer[start:start + name_length]).decode(),
+        'board_height': board_height,
+        'can_change_gm': bool(flags & CAN_CHANGE_GM),
+        'can_change_difficulty': bool(flags & CAN_CHANGE_DIFFICULTY),
+        'base_gm': str(GAME_MODE_LIST[base_gm]),
+        'difficulty': str(DIFFICULTY_LIST[difficulty]),
+    }
+    if not flags & HAS_NAME:
+        del header['name']
+    return header, width, start + name_length
+
+
+def decode_game(buffer, offset=0, length=None):
+    end = len(buffer) if length is None else offset + length
+    data, width, position = read_game_header(buffer, offset)
+    try:
+        table = [None]
+        for _ in range(buffer[position]):
+            size = buffer[position + 1]
+            table.append(bytes(buffer[position + 2:position + 2 + size]).decode())
+            position += 1 + size
+        position += 1
+        cells = buffer[position:position + data['board_height'] * width]
+        if position + len(cells) != end or len(cells) != data['board_height'] * width:
+            raise FormatError('Board size does not match the header')
+        data['board'] = [[table[code] for code in cells[row * width:(row + 1) * width]]
+                         for row in range(data['board_height'])]
+    except IndexError:
+        raise FormatError('Truncated or corrupt board')
+    return data
+
+
+def read_game_file(path):
+    with open(path, 'rb') as file:
+        return decode_game(file.read())
+
+
+def write_atomic(path, parts):
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.writelines(parts)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def write_game_file(path, data):
+    write_atomic(path, [encode_game(data)])
+
+
+def write_bundle(path, games):
+    ids = sorted(games)
+    blobs = [encode_game(games[gm_id]) for gm_id in ids]
+    offset = BUNDLE_HEADER.size + TOC_ENTRY.size * len(ids)
+    toc = []
+    for gm_id, blob in zip(ids, blobs):
+        encoded_id = gm_id.encode()
+        if len(encoded_id) > TOC_ENTRY.size - 12 or b'\0' in encoded_id:
+            raise FormatError(f'Game id {gm_id!r} cannot be stored in a bundle')
+        toc.append(TOC_ENTRY.pack(encoded_id, offset, len(blob)))
+        offset += len(blob)
+
+    write_atomic(path, [BUNDLE_HEADER.pack(BUNDLE_MAGIC, VERSION, len(ids))] + toc + blobs)
+
+
+class Bundle:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < BUNDLE_HEADER.size:
+                raise FormatError(f'{path} is not a custom game bundle')
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = BUNDLE_HEADER.unpack_from(self.buffer)
+        if magic != BUNDLE_MAGIC or version != VERSION or size < BUNDLE_HEADER.size + self.count * TOC_ENTRY.size:
+            self.close()
+            raise FormatError(f'{path} is not a custom game bundle')
+
+    def __len__(self):
+        return self.count
+
+    def entry(self, i):
+        gm_id, offset, length = TOC_ENTRY.unpack_from(self.buffer, BUNDLE_HEADER.size + i * TOC_ENTRY.size)
+        if offset + length > len(self.buffer):
+            raise FormatError(f'Entry {i} of {self.path} points past the end of the file')
+        return gm_id.rstrip(b'\0').decode(), offset, length
+
+    def ids(self):
+        return [self.entry(i)[0] for i in range(self.count)]
+
+    def headers(self):
+        # only the fixed header and the name of every game are touched, boards stay unread
+        for i in range(self.count):
+            gm_id, offset, _ = self.entry(i)
+            yield gm_id, read_game_header(self.buffer, offset)[0]
+
+    def read(self, gm_id):
+        position = bisect.bisect_left(range(self.count), gm_id, key=lambda i: self.entry(i)[0])
+        if position == self.count or self.entry(position)[0] != gm_id:
+            raise KeyError(gm_id)
+        _, offset, length = self.entry(position)
+        return decode_game(self.buffer, offset, length)
+
+    def close(self):
+        self.buffer.close()
+
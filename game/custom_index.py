@@ -0,0 +1,64 @@
+import json
+import sqlite3
+
+
+class CustomGameIndex:
+    VERSION = 1
+    COLUMNS = ('file', 'mtime_ns', 'size', 'hash', 'name', 'base_gm', 'difficulty', 'board_height',
+               'can_change_gm', 'can_change_difficulty', 'board')
+    HEADER_COLUMNS = COLUMNS[:-1]
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            # the index only mirrors the json files, an old layout is simply rebuilt from them
+            self.connection.execute('DROP TABLE IF EXISTS games')
+            self.connection.execute(f'PRAGMA user_version = {self.VERSION}')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS games (
+                file TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                name TEXT NOT NULL,
+                base_gm TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                board_height INTEGER NOT NULL,
+                can_change_gm INTEGER NOT NULL,
+                can_change_difficulty INTEGER NOT NULL,
+                board TEXT NOT NULL
+            )''')
+        self.connection.commit()
+
+    def entries(self, files=None):
+        # boards stay on disk until a game is opened, see board()
+        query = f'SELECT {", ".join(self.HEADER_COLUMNS)} FROM games'
+        if files is None:
+            rows = self.connection.execute(query)
+        else:
+            rows = [row for file in files for row in self.connection.execute(f'{query} WHERE file = ?', (file,))]
+        return {row[0]: dict(zip(self.HEADER_COLUMNS, row)) for row in rows}
+
+    def board(self, file):
+        row = self.connection.execute('SELECT board FROM games WHERE file = ?', (file,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, file, mtime_ns, size, digest, game):
+        self.connection.execute(
+            f'INSERT OR REPLACE INTO games ({", ".join(self.COLUMNS)}) VALUES ({", ".join("?" * len(self.COLUMNS))})',
+            (file, mtime_ns, size, digest, game.name, game.base_gm.value, game.difficulty.name,
+             game.board_height, game.can_change_gm, game.can_change_difficulty, json.dumps(game.board)))
+
+    def touch(self, file, mtime_ns, size):
+        self.connection.execute('UPDATE games SET mtime_ns = ?, size = ? WHERE file = ?', (mtime_ns, size, file))
+
+    def remove(self, files):
+        self.connection.executemany('DELETE FROM games WHERE file = ?', [(file,) for file in files])
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
@@ -0,0 +1,85 @@
+import json
+import re
+
+from game.game_modes import GameMode, Difficulty
+
+REQUIRED_FIELDS = ('board_height', 'base_gm', 'difficulty', 'board', 'can_change_gm', 'can_change_difficulty')
+GAME_MODES = {gm.value: gm for gm in GameMode}
+DIFFICULTIES = {diff.name.capitalize(): diff for diff in Difficulty}
+# player pieces carry the index the creator gives them when saving, zombies never do
+PIECE_CODE = re.compile(r'p[Kqrbkp]\d*|z[wsie]')
+
+
+def validate_board(gm_json, errors):
+    board = gm_json.get('board')
+    if 'board' in gm_json and type(board) != list:
+        errors.append('Board must be a LIST of lists of strings/nulls')
+    if type(board) != list:
+        board = None
+    if 'board_height' in gm_json:
+        board_height = gm_json['board_height']
+        rows = board_height if board is None else len(board)
+        if type(board_height) != int or board_height > 18 or board_height < 6 or board_height != rows:
+            errors.append("Board height must be an integer between 6 and 18 and match the number of rows in "
+                          "'board' field")
+    if board is None:
+        return
+
+    # one pass over every square, each kind of problem is reported once
+    bad_rows = bad_widths = bad_values = False
+    unknown_codes = set()
+    valid_codes = set()
+    for row in board:
+        if type(row) != list:
+            bad_rows = True
+            continue
+        if len(row) != 8:
+            bad_widths = True
+        for val in row:
+            if val is None or val in valid_codes:
+                continue
+            if type(val) != str:
+                bad_values = True
+            elif PIECE_CODE.fullmatch(val):
+                valid_codes.add(val)
+            else:
+                unknown_codes.add(val)
+
+    if bad_rows:
+        errors.append('Board must be a list of LISTS of strings/nulls')
+    if bad_widths:
+        errors.append('Every board row must have 8 squares')
+    if bad_values:
+        errors.append('Board must be a list of lists of STRINGS/NULLS')
+    if unknown_codes:
+        errors.append(f'Unknown pieces on the board: {", ".join(sorted(unknown_codes))}')
+
+
+def validate_gm_json(gm_json):
+    if type(gm_json) != dict:
+        return ['Custom game must be a JSON object']
+
+    errors = [f"'{field}' field is required" for field in REQUIRED_FIELDS if field not in gm_json]
+    validate_board(gm_json, errors)
+
+    base_gm = gm_json.get('base_gm')
+    if 'base_gm' in gm_json and (type(base_gm) != str or base_gm not in GAME_MODES):
+        errors.append('Base game mode must be a string representing a valid game mode')
+    difficulty = gm_json.get('difficulty')
+    if 'difficulty' in gm_json and (type(difficulty) != str or difficulty not in DIFFICULTIES):
+        errors.append('Difficulty must be a string representing a valid difficulty')
+    if 'can_change_gm' in gm_json and type(gm_json['can_change_gm']) != bool:
+        errors.append("'Can change game mode' must be a boolean")
+    if 'can_change_difficulty' in gm_json and type(gm_json['can_change_difficulty']) != bool:
+        errors.append("'Can change difficulty' must be a boolean")
+    if 'name' in gm_json and type(gm_json['name']) != str:
+        errors.append('Name must be a string')
+    return errors
+
+
+def validate_file(path):
+    try:
+        with open(path, 'r') as f:
+            return validate_gm_json(json.load(f))
+    except (ValueError, IOError) as e:
+        return [f'Error reading .json file: {e}']
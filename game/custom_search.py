@@ -0,0 +1,176 @@
+import bisect
+import time
+from itertools import compress, repeat
+from operator import contains
+
+
+class SearchResults:
+    # matches are put in name order only as far as they are looked at, the list view asks for one page at a time
+    def __init__(self, order, found):
+        self.order = order
+        self.found = found
+        self.items = []
+        self.position = 0
+
+    def __len__(self):
+        return len(self.found)
+
+    def __iter__(self):
+        self.fill(len(self))
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.fill(index.indices(len(self))[1])
+        else:
+            self.fill(len(self) if index < 0 else index + 1)
+        return self.items[index]
+
+    def fill(self, count):
+        if count <= len(self.items):
+            return
+        if count * 2 > len(self):
+            self.items = list(filter(self.found.__contains__, self.order))
+            self.position = len(self.order)
+            return
+        order, found, items = self.order, self.found, self.items
+        position = self.position
+        while len(items) < count and position < len(order):
+            if order[position] in found:
+                items.append(order[position])
+            position += 1
+        self.position = position
+
+
+class CustomGameSearch:
+    # names are indexed by every substring of up to GRAM_SIZE characters, longer searches intersect the
+    # postings of their trigrams and only the survivors are checked against the name itself
+    GRAM_SIZE = 3
+    FIELDS = ('base_gm', 'difficulty', 'board_height')
+
+    def __init__(self):
+        self.names = {}
+        self.folded = {}
+        self.values = {}
+        self.grams = {}
+        self.fields = {}
+        # names wait here until index_pending() gets to them, so adding a whole catalog at once stays cheap
+        self._unindexed = {}
+        # ids sorted like the loader sorts by name, rebuilt on demand, games added since wait in pending
+        self._order = []
+        self._pending = []
+        self._last = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def grams_of(cls, text):
+        return {text[i:i + size] for size in range(1, cls.GRAM_SIZE + 1) for i in range(len(text) - size + 1)}
+
+    def sorted(self, gm_ids):
+        # by id first so that the stable sort by name breaks ties the way the loader's queries do
+        return sorted(sorted(gm_ids), key=self.names.__getitem__)
+
+    def sort_key(self, gm_id):
+        return self.names[gm_id], gm_id
+
+    def add(self, gm_id, game):
+        self.remove(gm_id)
+        folded = game.name.casefold()
+        values = (game.base_gm, game.difficulty, game.board_height)
+        self.names[gm_id] = game.name
+        self.folded[gm_id] = folded
+        self.values[gm_id] = values
+        self._unindexed[gm_id] = None
+        for key in zip(self.FIELDS, values):
+            self.fields.setdefault(key, set()).add(gm_id)
+        if self._order is not None:
+            self._pending.append(gm_id)
+        self._last = None
+
+    def remove(self, gm_id):
+        if self.names.pop(gm_id, None) is None:
+            return
+        folded = self.folded.pop(gm_id)
+        values = self.values.pop(gm_id)
+        grams = () if self._unindexed.pop(gm_id, False) is None else self.grams_of(folded)
+        for postings, keys in ((self.grams, grams), (self.fields, zip(self.FIELDS, values))):
+            for key in keys:
+                ids = postings[key]
+                ids.discard(gm_id)
+                if not ids:
+                    del postings[key]
+        self._order = None
+        self._last = None
+
+    def clear(self):
+        self.names.clear()
+        self.folded.clear()
+        self.values.clear()
+        self.grams.clear()
+        self.fields.clear()
+        self._unindexed.clear()
+        self._order = []
+        self._pending = []
+        self._last = None
+
+    @property
+    def pending(self):
+        return len(self._unindexed)
+
+    def index_pending(self, seconds=None):
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        grams = self.grams
+        while self._unindexed:
+            for _ in range(min(64, len(self._unindexed))):
+                gm_id, _ = self._unindexed.popitem()
+                for gram in self.grams_of(self.folded[gm_id]):
+                    grams.setdefault(gram, set()).add(gm_id)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+    @property
+    def order(self):
+        if self._order is None or len(self._pending) * 16 > len(self._order):
+            self._order = self.sorted(self.names)
+        else:
+            for gm_id in self._pending:
+                bisect.insort(self._order, gm_id, key=self.sort_key)
+        self._pending = []
+        return self._order
+
+    def search(self, text='', base_gm=None, difficulty=None, board_height=None):
+        folded = text.casefold()
+        filters = [key for key in zip(self.FIELDS, (base_gm, difficulty, board_height)) if key[1] is not None]
+        if not folded and not filters:
+            return self.order
+
+        found = self.matches(folded)
+        if found is None:
+            found = self.fields.get(filters.pop()) or set()
+        postings = sorted([self.fields.get(key) or set() for key in filters], key=len)
+        if postings:
+            found = found.intersection(*postings)
+        # a few matches are sorted on their own, a large share of the catalog is picked from the sorted list
+        if len(found) * 16 < len(self.names):
+            return self.sorted(found)
+        return SearchResults(self.order, found)
+
+    def matches(self, folded):
+        if not folded:
+            return None
+        self.index_pending()
+        if len(folded) <= self.GRAM_SIZE:
+            return self.grams.get(folded) or set()
+        if self._last is not None and folded.startswith(self._last[0]):
+            # typing one more character only narrows the previous matches
+            candidates = self._last[1]
+        else:
+            postings = sorted([self.grams.get(folded[i:i + self.GRAM_SIZE]) or set()
+                               for i in range(len(folded) - self.GRAM_SIZE + 1)], key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        candidates = list(candidates)
+        found = set(compress(candidates, map(contains, map(self.folded.__getitem__, candidates), repeat(folded))))
+        self._last = (folded, found)
+        return found
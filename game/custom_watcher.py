@@ -0,0 +1,137 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+
+
+class InotifyWatcher:
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, directory, suffix):
+        self.suffix = suffix
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = (self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_MOVED_FROM | self.IN_DELETE |
+                self.IN_DELETE_SELF | self.IN_MOVE_SELF)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f'inotify_add_watch failed for {directory}')
+
+    def changes(self):
+        changed, removed = set(), set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed, removed
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & (self.IN_Q_OVERFLOW | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    # events were lost or the directory itself went away, only a full scan can tell what changed
+                    return None
+                if not name.endswith(self.suffix):
+                    continue
+                if mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    changed.add(name)
+                    removed.discard(name)
+                else:
+                    removed.add(name)
+                    changed.discard(name)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    # file systems with coarse timestamps can change a directory twice within one mtime tick
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, directory, suffix, interval=1.0):
+        self.directory = directory
+        self.suffix = suffix
+        self.interval = interval
+        self.next_check = time.monotonic() + interval
+        self.directory_mtime = self.read_directory_mtime()
+        self.listed_at = time.time_ns()
+        self.snapshot = {name: self.read_stat(name) for name in self.list_files()}
+
+    def read_directory_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def read_stat(self, name):
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def list_files(self):
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith(self.suffix)]
+        except OSError:
+            return []
+
+    def changes(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self.next_check:
+            return set(), set()
+        self.next_check = now + self.interval
+
+        # the directory mtime only moves when entries are added or removed, so listing is skipped otherwise,
+        # unless the last listing happened so close to that mtime that a later change could share it
+        directory_mtime = self.read_directory_mtime()
+        racy = directory_mtime is not None and directory_mtime >= self.listed_at - self.RACY_WINDOW_NS
+        if directory_mtime != self.directory_mtime or racy:
+            self.directory_mtime = directory_mtime
+            self.listed_at = time.time_ns()
+            names = self.list_files()
+        else:
+            names = list(self.snapshot)
+
+        changed = set()
+        snapshot = {}
+        for name in names:
+            stat = self.read_stat(name)
+            if stat is None:
+                continue
+            snapshot[name] = stat
+            if self.snapshot.get(name) != stat:
+                changed.add(name)
+        removed = set(self.snapshot) - set(snapshot)
+        self.snapshot = snapshot
+        return changed, removed
+
+    def close(self):
+        pass
+
+
+def watch_directory(directory, suffix='.json', interval=1.0):
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory, suffix)
+        except (OSError, AttributeError) as e:
+            print(f'inotify is not available, polling {directory} instead: {e}')
+    return PollingWatcher(directory, suffix, interval)
@@ -1,12 +1,25 @@
 import pygame
 
+import functools
+import io
 import random
-import os
+
+from game.assets import AssetManager
+from game.board_layer import BoardLayer
+from game.canvas import SurfaceCanvas, as_canvas
+from game.thumbnails import BoardThumbnails
+
+
+def static_screen(draw):
+    @functools.wraps(draw)
+    def wrapper(self):
+        return self.draw_static_screen(draw.__name__, draw)
+    return wrapper
 
 
 class Display:
-    def __init__(self, screen, screen_width, screen_height, screen_border_height):
-        self.screen = screen
+    def __init__(self, screen, screen_width, screen_height, screen_border_height, assets=None):
+        self.screen = as_canvas(screen)
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.screen_border_height = screen_border_height
@@ -22,11 +35,23 @@ class Display:
         self.HIGHLIGHT_COLOR = (0, 162, 232, 128)
         self.OUTLINE_COLOR = (40, 15, 5)
 
+        self.assets = assets if assets is not None else AssetManager()
         self.popup_background = None
+        self.popup_overlay = None
         self.background = None
-        self.set_background()
-        self.piece_images = {}
-        self.load_piece_images()
+        self.text_surfaces = {}
+        self.rect_pool = {}
+        self.text_rect = pygame.Rect(0, 0, 0, 0)
+        self.game_mode_areas = []
+        self.load_info = {'game_modes_areas': self.game_mode_areas, 'buttons': {}}
+        self.list_rows = {}
+        self.play_info = {}
+        self.highlight_surfaces = {}
+        self.board_layers = {}
+        self.thumbnails = BoardThumbnails(self.assets, self.BOARD_COLORS)
+        self.static_screens = {}
+        self.static_buttons = None
+        self.debug_font = None
 
         self.scale_factor = min(screen_width, screen_height) / 1000
 
@@ -46,61 +71,163 @@ class Display:
         self.content_start_y = int(screen_height * 0.2)
         self.bottom_margin = int(screen_height * 0.9)
 
-        self.main_font = pygame.font.Font('util/Roboto-Bold.ttf', self.main_font_size)
-        self.font = pygame.font.Font('util/Roboto-Regular.ttf', self.regular_font_size)
-        self.section_font = pygame.font.Font('util/Roboto-Bold.ttf', self.section_font_size)
+        # the first frames use a flat background and the default font until the real assets are decoded
+        self.main_font = pygame.font.Font(None, self.main_font_size)
+        self.font = pygame.font.Font(None, self.regular_font_size)
+        self.section_font = pygame.font.Font(None, self.section_font_size)
+        self.set_background()
 
     def set_background(self):
+        self.background = pygame.Surface((self.screen_width, self.screen_height))
+        self.background.fill(self.BROWN)
+
+        background = None
         if self.aspect_ratio == 16 / 9:
             background_images = ('bg_blur.png', 'bg_alt_blur.png')
             bg_index = random.randint(0, 1)
-            bg = pygame.image.load(os.path.join('img/backgrounds/16-9', background_images[bg_index]))
-            self.background = pygame.transform.scale(bg, (self.screen_width, self.screen_height))
-        else:
-            self.background = pygame.Surface((self.screen_width, self.screen_height))
-            self.background.fill(self.BROWN)
-
-    def load_piece_images(self):
-        pieces = {'pawn', 'rook', 'knight', 'bishop', 'queen', 'King',
-                  'zombie_walker', 'zombie_stomper', 'zombie_infected', 'zombie_exploding'}
-
-        for piece in pieces:
-            filename = piece + '.png'
-            piece_name = f'p{piece[0]}' if piece[0] != 'z' else f'z{piece[7]}'
+            background = background_images[bg_index]
+        self.assets.load_async(background, (self.screen_width, self.screen_height),
+                               ('Roboto-Bold.ttf', 'Roboto-Regular.ttf'))
+
+    def poll_assets(self, wait=False):
+        loaded = self.assets.take_loaded(wait)
+        if loaded is None:
+            return False
+
+        background, fonts = loaded
+        if background is not None:
+            self.background = background
+        if 'Roboto-Bold.ttf' in fonts:
+            self.main_font = pygame.font.Font(io.BytesIO(fonts['Roboto-Bold.ttf']), self.main_font_size)
+            self.section_font = pygame.font.Font(io.BytesIO(fonts['Roboto-Bold.ttf']), self.section_font_size)
+        if 'Roboto-Regular.ttf' in fonts:
+            self.font = pygame.font.Font(io.BytesIO(fonts['Roboto-Regular.ttf']), self.regular_font_size)
+        self.text_surfaces.clear()
+        self.list_rows.clear()
+        self.board_layers.clear()
+        self.thumbnails.clear()
+        self.static_screens.clear()
+        return True
+
+    def wait_for_assets(self):
+        return self.poll_assets(wait=True)
+
+    @property
+    def piece_images(self):
+        return self.assets.piece_images
+
+    def convert_surfaces(self):
+        self.assets.convert()
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        self.popup_overlay = None
+        self.text_surfaces.clear()
+        self.list_rows.clear()
+        self.highlight_surfaces.clear()
+        self.board_layers.clear()
+        self.thumbnails.clear()
+        self.static_screens.clear()
+
+    def close(self):
+        self.thumbnails.close()
+
+    def get_text_surface(self, text, font, color):
+        key = (text, font, color)
+        surface = self.text_surfaces.get(key)
+        if surface is None:
+            if len(self.text_surfaces) >= 512:
+                del self.text_surfaces[next(iter(self.text_surfaces))]
+            surface = font.render(text, True, color)
+            self.text_surfaces[key] = surface
+        return surface
+
+    def get_list_row(self, text, width, height):
+        # a row is drawn once with its outline and outlined text, scrolling only blits it somewhere else
+        key = (text, width, height, self.font)
+        surface = self.list_rows.get(key)
+        if surface is None:
+            if len(self.list_rows) >= 256:
+                del self.list_rows[next(iter(self.list_rows))]
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            screen, self.screen = self.screen, SurfaceCanvas(surface)
             try:
-                image = pygame.image.load(os.path.join('img/chess_pieces', filename))
-                self.piece_images[piece_name] = image
-            except Exception as e:
-                print(f'Could not load image {filename}: {e}')
+                self.screen.rect(self.SEPARATOR_COLOR, surface.get_rect(), 3, 10)
+                self.draw_text(text, self.LIGHT_BROWN, width // 2, height // 2, outline_color=self.OUTLINE_COLOR)
+            finally:
+                self.screen = screen
+            self.list_rows[key] = surface
+        return surface
+
+    def get_rect(self, x, y, width, height):
+        # pooled rects are shared between frames, so they must never be modified by callers
+        key = (x, y, width, height)
+        rect = self.rect_pool.get(key)
+        if rect is None:
+            if len(self.rect_pool) >= 1024:
+                self.rect_pool.clear()
+            rect = pygame.Rect(x, y, width, height)
+            self.rect_pool[key] = rect
+        return rect
+
+    def get_highlight_surface(self, size):
+        surface = self.highlight_surfaces.get(size)
+        if surface is None:
+            surface = pygame.Surface((size, size))
+            pygame.draw.rect(surface, self.HIGHLIGHT_COLOR, (0, 0, size, size))
+            self.highlight_surfaces[size] = surface
+        return surface
+
+    def get_board_layer(self, rows, cols, square_size):
+        key = (rows, cols, int(square_size))
+        layer = self.board_layers.get(key)
+        if layer is None:
+            if len(self.board_layers) >= 8:
+                del self.board_layers[next(iter(self.board_layers))]
+            layer = BoardLayer(rows, cols, square_size, self.BOARD_COLORS, self.HIGHLIGHT_COLOR)
+            self.board_layers[key] = layer
+        return layer
 
     def switch_screen_display(self):
         self.screen_height -= self.screen_border_height
         self.screen_border_height = -self.screen_border_height
+        self.convert_surfaces()
+
+    def draw_static_screen(self, name, draw):
+        key = (name, self.screen_width, self.screen_height)
+        cached = self.static_screens.get(key)
+        if cached is None:
+            screen = self.screen
+            self.screen = SurfaceCanvas(pygame.Surface(screen.get_size()))
+            self.static_buttons = []
+            try:
+                result = draw(self)
+            finally:
+                surface, self.screen = self.screen.surface, screen
+                buttons, self.static_buttons = self.static_buttons, None
+            cached = (surface, buttons, result)
+            self.static_screens[key] = cached
+
+        surface, buttons, result = cached
+        self.screen.blit(surface, (0, 0))
+        mouse_pos = pygame.mouse.get_pos()
+        for text, button_rect, disabled in buttons:
+            if not disabled and button_rect.collidepoint(mouse_pos):
+                self.draw_button_rect(text, button_rect, hovered=True)
+        return result
 
     def set_popup_background(self):
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, (0, 0))
-        self.popup_background = self.screen.copy()
+        if self.popup_overlay is None or self.popup_overlay.get_size() != (self.screen_width, self.screen_height):
+            self.popup_overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self.popup_overlay.fill((0, 0, 0, 128))
+            self.popup_background = pygame.Surface(self.screen.get_size())
+        self.screen.blit(self.popup_overlay, (0, 0))
+        self.screen.snapshot(self.popup_background)
+        self.screen.invalidate(self.popup_background)
 
     def draw_main_text(self, text, color, outline_color=None, outline_width=4, y_pos=None):
-        x = self.screen_width // 2
         if y_pos is None:
             y_pos = self.title_y
-        if outline_color is None:
-            outline_color = self.OUTLINE_COLOR
-
-        for offset_x in range(-outline_width, outline_width + 1):
-            for offset_y in range(-outline_width, outline_width + 1):
-                if offset_x == 0 and offset_y == 0:
-                    continue
-                outline_surface = self.main_font.render(text, True, outline_color)
-                outline_rect = outline_surface.get_rect(center=(x + offset_x, y_pos + offset_y))
-                self.screen.blit(outline_surface, outline_rect)
-
-        text_surface = self.main_font.render(text, True, color)
-        text_rect = text_surface.get_rect(center=(x, y_pos))
-        self.screen.blit(text_surface, text_rect)
+        self.draw_text(text, color, self.screen_width // 2, y_pos, self.main_font, outline_width, outline_color)
 
     def draw_text(self, text, color, x, y, font=None, outline_width=2, outline_color=None, center=True):
         if font is None:
@@ -108,24 +235,44 @@ class Display:
         if outline_color is None:
             outline_color = self.OUTLINE_COLOR
 
+        text_rect = self.text_rect
+        outline_surface = self.get_text_surface(text, font, outline_color)
+        text_rect.size = outline_surface.get_size()
         for offset_x in range(-outline_width, outline_width + 1):
             for offset_y in range(-outline_width, outline_width + 1):
                 if offset_x == 0 and offset_y == 0:
                     continue
-                outline_surface = font.render(text, True, outline_color)
                 if center:
-                    outline_rect = outline_surface.get_rect(center=(x + offset_x, y + offset_y))
+                    text_rect.center = (x + offset_x, y + offset_y)
                 else:
-                    outline_rect = outline_surface.get_rect(x=x + offset_x, y=y + offset_y)
-                self.screen.blit(outline_surface, outline_rect)
+                    text_rect.topleft = (x + offset_x, y + offset_y)
+                self.screen.blit(outline_surface, text_rect)
 
-        text_surface = font.render(text, True, color)
+        text_surface = self.get_text_surface(text, font, color)
+        text_rect.size = text_surface.get_size()
         if center:
-            text_rect = text_surface.get_rect(center=(x, y))
+            text_rect.center = (x, y)
         else:
-            text_rect = text_surface.get_rect(x=x, y=y)
+            text_rect.topleft = (x, y)
         self.screen.blit(text_surface, text_rect)
 
+    def debug_overlay(self, lines):
+        font = self.get_debug_font()
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 20
+        height = line_height * len(lines) + 20
+
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        self.screen.blit(overlay, (10, 10))
+        for i, line in enumerate(lines):
+            self.screen.blit(font.render(line, True, self.LIGHT_BROWN), (20, 20 + i * line_height))
+
+    def get_debug_font(self):
+        if self.debug_font is None:
+            self.debug_font = pygame.font.Font(None, max(16, int(24 * self.scale_factor)))
+        return self.debug_font
+
     def draw_section_row(self, section_name, description, y_pos, buttons_info, disabled=False):
         text_color = self.LIGHT_BROWN if not disabled else self.GREY
         self.draw_text(section_name, text_color, int(self.screen_width * 0.2), y_pos, self.section_font,
@@ -145,8 +292,7 @@ class Display:
         return buttons
 
     def draw_separator(self, y_pos):
-        pygame.draw.line(
-            self.screen,
+        self.screen.line(
             self.SEPARATOR_COLOR,
             (int(self.screen_width * 0.1), y_pos),
             (int(self.screen_width * 0.9), y_pos),
@@ -161,46 +307,40 @@ class Display:
         if x is None:
             x = (self.screen_width // 2) - (width // 2) + x_offset
 
+        button_rect = self.get_rect(x, y - height // 2, width, height)
+        if self.static_buttons is not None:
+            self.static_buttons.append((text, button_rect, disabled))
+            hovered = False
+        else:
+            hovered = not disabled and button_rect.collidepoint(pygame.mouse.get_pos())
+        self.draw_button_rect(text, button_rect, disabled, hovered)
+        return button_rect
+
+    def draw_button_rect(self, text, button_rect, disabled=False, hovered=False):
         bg_color = self.YELLOW if not disabled else self.GREY
         text_color = self.DARK_BROWN
-
-        button_rect = pygame.Rect(x, y - height // 2, width, height)
-        if not disabled and button_rect.collidepoint(pygame.mouse.get_pos()):
+        if hovered:
             bg_color = self.HIGHLIGHT_COLOR
             text_color = self.LIGHT_BROWN
 
         try:
-            pygame.draw.rect(self.screen, bg_color, button_rect, border_radius=10)
-            pygame.draw.rect(self.screen, self.LIGHT_BROWN, button_rect, 2, border_radius=10)
+            self.screen.rect(bg_color, button_rect, border_radius=10)
+            self.screen.rect(self.LIGHT_BROWN, button_rect, 2, border_radius=10)
         except TypeError:
-            pygame.draw.rect(self.screen, bg_color, button_rect)
-            pygame.draw.rect(self.screen, self.LIGHT_BROWN, button_rect, 2)
+            self.screen.rect(bg_color, button_rect)
+            self.screen.rect(self.LIGHT_BROWN, button_rect, 2)
 
-        text_surface = self.font.render(text, True, text_color)
-        text_rect = text_surface.get_rect(center=button_rect.center)
+        text_surface = self.get_text_surface(text, self.font, text_color)
+        text_rect = self.text_rect
+        text_rect.size = text_surface.get_size()
+        text_rect.center = button_rect.center
         self.screen.blit(text_surface, text_rect)
 
-        return button_rect
-
     def draw_board(self, rows, cols, board, x, y, square_size):
-        for row in range(rows):
-            for col in range(cols):
-                square_color = self.BOARD_COLORS[(row + col) % 2]
-                square_rect = pygame.Rect(
-                    x + col * square_size,
-                    y + row * square_size,
-                    square_size,
-                    square_size
-                )
-                pygame.draw.rect(self.screen, square_color, square_rect)
-
-                piece = board[row][col]
-                if piece and piece[:2] in self.piece_images:
-                    image = pygame.transform.scale(self.piece_images[piece[:2]],
-                                                   (square_size - 10, square_size - 10))
-                    self.screen.blit(image,
-                                     ((col * square_size + 5) + x,
-                                      (row * square_size + 5) + y))
+        layer = self.get_board_layer(rows, cols, square_size)
+        if layer.update(board, self.assets):
+            self.screen.invalidate(layer.surface)
+        layer.blit(self.screen, x, y)
 
     def information_menu(self, main_text, first_btn_text, second_btn_text, additional_info=None):
         self.screen.blit(self.background, (0, 0))
@@ -219,6 +359,7 @@ class Display:
 
         return first_btn, second_btn
 
+    @static_screen
     def main_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Zombie Chess Game', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -235,6 +376,7 @@ class Display:
 
         return play_btn, custom_btn, help_btn, quit_btn
 
+    @static_screen
     def custom_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Custom Games', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -273,23 +415,9 @@ class Display:
                                                board_start_y + board_height_px // 2 + self.font.get_height() * 1.5,
                                                width=self.small_button_width, x=settings_x)
 
-        for row in range(board_height):
-            for col in range(8):
-                x = board_start_x + (col * square_size)
-                y = board_start_y + (row * square_size)
-                color = self.BOARD_COLORS[(row + col) % 2]
-                pygame.draw.rect(self.screen, color, (x, y, square_size, square_size))
-
-                piece = board[row][col]
-                if piece in self.piece_images:
-                    piece_size = square_size - 10
-                    image = pygame.transform.scale(
-                        self.piece_images[piece],
-                        (piece_size, piece_size)
-                    )
-                    self.screen.blit(image, (x + 5, y + 5))
-
-        pygame.draw.rect(self.screen, self.SEPARATOR_COLOR,
+        self.draw_board(board_height, 8, board, board_start_x, board_start_y, square_size)
+
+        self.screen.rect(self.SEPARATOR_COLOR,
                          (piece_selector_x, board_start_y, piece_selector_width, board_height_px))
         self.draw_text('Available Pieces', self.LIGHT_BROWN,
                        piece_selector_x + piece_selector_width // 2, board_start_y - 40,
@@ -302,45 +430,41 @@ class Display:
         piece_gap = (board_height_px - (6 * piece_size)) // 7
         selector_square_size = piece_size + 10
         list_gap = (piece_selector_width - 2 * selector_square_size) // 3
-        highlight_surface = pygame.Surface((selector_square_size, selector_square_size))
-        pygame.draw.rect(highlight_surface, self.HIGHLIGHT_COLOR,
-                         (0, 0, selector_square_size, selector_square_size))
+        highlight_surface = self.get_highlight_surface(selector_square_size)
 
         for i, piece in enumerate(pieces):
             if piece in self.piece_images:
                 piece_x = piece_selector_x + 2 * list_gap + selector_square_size
                 piece_y = board_start_y + (i * (piece_size + piece_gap)) + piece_gap
 
-                pygame.draw.rect(self.screen, self.YELLOW,
+                self.screen.rect(self.YELLOW,
                                  (piece_x - 5, piece_y - 5, selector_square_size, selector_square_size))
                 if i == 0:
-                    pygame.draw.rect(self.screen, self.DARK_BROWN,
+                    self.screen.rect(self.DARK_BROWN,
                                      (piece_x - 5, piece_y - 5, selector_square_size, selector_square_size), 3)
                 else:
-                    pygame.draw.rect(self.screen, self.LIGHT_BROWN,
+                    self.screen.rect(self.LIGHT_BROWN,
                                      (piece_x - 5, piece_y - 5, selector_square_size, selector_square_size), 2)
 
                 if piece is selected_piece:
                     self.screen.blit(highlight_surface, (piece_x - 5, piece_y - 5))
 
-                image = pygame.transform.scale(self.piece_images[piece], (piece_size, piece_size))
-                self.screen.blit(image, (piece_x, piece_y))
+                self.assets.blit_piece(self.screen, piece, piece_size, (piece_x, piece_y))
 
         for i, zombie in enumerate(zombies):
             if zombie in self.piece_images:
                 zombie_x = piece_selector_x + list_gap
                 zombie_y = board_start_y + (i * (piece_size + piece_gap)) + piece_gap
 
-                pygame.draw.rect(self.screen, self.YELLOW,
+                self.screen.rect(self.YELLOW,
                                  (zombie_x - 5, zombie_y - 5, selector_square_size, selector_square_size))
-                pygame.draw.rect(self.screen, self.LIGHT_BROWN,
+                self.screen.rect(self.LIGHT_BROWN,
                                  (zombie_x - 5, zombie_y - 5, selector_square_size, selector_square_size), 2)
 
                 if zombie is selected_piece:
                     self.screen.blit(highlight_surface, (zombie_x - 5, zombie_y - 5))
 
-                image = pygame.transform.scale(self.piece_images[zombie], (piece_size, piece_size))
-                self.screen.blit(image, (zombie_x, zombie_y))
+                self.assets.blit_piece(self.screen, zombie, piece_size, (zombie_x, zombie_y))
 
         left_offset = -int(self.screen_width * 0.35)
         right_offset = int(self.screen_width * 0.3)
@@ -408,14 +532,14 @@ class Display:
         input_height = self.font.get_height() * 1.5
         input_start_x = (self.screen_width - input_width) // 2
         if is_focused:
-            pygame.draw.rect(self.screen, self.HIGHLIGHT_COLOR,
+            self.screen.rect(self.HIGHLIGHT_COLOR,
                              (input_start_x - 2, fourth_section_y - 2, input_width + 4, input_height + 4), 6)
         else:
-            pygame.draw.rect(self.screen, self.SEPARATOR_COLOR,
+            self.screen.rect(self.SEPARATOR_COLOR,
                              (input_start_x, fourth_section_y, input_width, input_height), 4)
         input_rect = pygame.Rect(input_start_x + 4, fourth_section_y + 4, input_width - 8, input_height - 8)
-        pygame.draw.rect(self.screen, self.LIGHT_BROWN, input_rect)
-        text_surface = self.font.render(name, True, input_color)
+        self.screen.rect(self.LIGHT_BROWN, input_rect)
+        text_surface = self.get_text_surface(name, self.font, input_color)
         self.screen.blit(text_surface, (input_rect.x + 5, input_rect.y + 8))
 
         self.draw_text('Name should be at least 3 and at most 20 characters long',
@@ -441,7 +565,8 @@ class Display:
             }
         }
 
-    def load_custom_menu(self, game_modes, selected, scroll_offset):
+    def load_custom_menu(self, game_modes, selected, list_view, progress=None, search=None, board_reader=None):
+        self.thumbnails.poll()
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Load Custom Game', self.LIGHT_BROWN, self.OUTLINE_COLOR)
 
@@ -465,36 +590,50 @@ class Display:
         self.draw_text('Details', self.LIGHT_BROWN, right_panel_x + panel_width // 2, self.content_start_y,
                        self.section_font, outline_width=3)
 
-        total_items = len(game_modes)
-        max_scroll = max(0, total_items - max_visible_items)
+        row_height = item_height + item_spacing
+        list_view.resize(row_height, max_visible_items * row_height)
+        total_items = len(list_view.keys)
+        thumbnail_box = int(item_height) - 8
 
         if total_items > max_visible_items:
             sidebar_bg_rect = pygame.Rect(sidebar_x, sidebar_y, sidebar_width, panel_height)
-            pygame.draw.rect(self.screen, self.LIGHT_BROWN, sidebar_bg_rect, 0, 5)
+            self.screen.rect(self.LIGHT_BROWN, sidebar_bg_rect, 0, 5)
 
             scrollbar_height = panel_height * (max_visible_items / total_items)
-            scrollbar_y = sidebar_y + (panel_height - scrollbar_height) * (scroll_offset / max_scroll)
+            scrollbar_y = sidebar_y + (panel_height - scrollbar_height) * (list_view.offset / list_view.max_offset)
 
             scrollbar_outline = pygame.Rect(sidebar_x - 5, scrollbar_y - 5, sidebar_width + 10, scrollbar_height + 10)
             scrollbar_rect = pygame.Rect(sidebar_x, scrollbar_y, sidebar_width, scrollbar_height)
-            pygame.draw.rect(self.screen, self.DARK_BROWN, scrollbar_outline, 0, 5)
-            pygame.draw.rect(self.screen, self.YELLOW, scrollbar_rect, 0, 5)
-
-        game_mode_areas = []
-        items = list(game_modes.items())
-        visible_items = items[scroll_offset:scroll_offset + max_visible_items]
-
-        for i, (gm_id, gm) in enumerate(visible_items):
-            item_y = list_start_y + i * (item_height + item_spacing)
-            gm_rect = pygame.Rect(left_panel_x, item_y - item_height // 2, item_width, item_height)
-            game_mode_areas.append((gm_id, gm_rect))
+            self.screen.rect(self.DARK_BROWN, scrollbar_outline, 0, 5)
+            self.screen.rect(self.YELLOW, scrollbar_rect, 0, 5)
+
+        game_mode_areas = self.game_mode_areas
+        game_mode_areas.clear()
+        # rows scroll by pixels, the ones cut by the edges of the list are clipped to it
+        list_top = list_start_y - item_height // 2
+        list_rect = self.get_rect(left_panel_x, list_top, item_width, list_view.view_height)
+        clip = self.screen.get_clip()
+        self.screen.set_clip(list_rect)
+        _, first_y, visible_keys = list_view.visible()
+
+        for i, gm_id in enumerate(visible_keys):
+            gm = game_modes.get(gm_id)
+            if gm is None:
+                continue
+            gm_rect = self.get_rect(left_panel_x, round(list_top + first_y + i * row_height), item_width, item_height)
+            game_mode_areas.append((gm_id, gm_rect if list_rect.contains(gm_rect) else gm_rect.clip(list_rect)))
 
             if selected and gm_id == selected[0]:
-                pygame.draw.rect(self.screen, self.HIGHLIGHT_COLOR, gm_rect, 0, 10)
+                self.screen.rect(self.HIGHLIGHT_COLOR, gm_rect, 0, 10)
+            self.screen.blit(self.get_list_row(gm.name, gm_rect.width, gm_rect.height), gm_rect)
+            # boards are drawn once on a worker thread, until then the row shows without one
+            if board_reader is not None:
+                thumbnail = self.thumbnails.get(gm_id, gm, thumbnail_box, board_reader)
+                if thumbnail is not None:
+                    self.screen.blit(thumbnail, (gm_rect.x + 10 + (thumbnail_box - thumbnail.get_width()) // 2,
+                                                 gm_rect.y + (gm_rect.height - thumbnail.get_height()) // 2))
 
-            pygame.draw.rect(self.screen, self.SEPARATOR_COLOR, gm_rect, 3, 10)
-            self.draw_text(gm.name, self.LIGHT_BROWN, left_panel_x + item_width // 2, item_y,
-                           outline_color=self.OUTLINE_COLOR)
+        self.screen.set_clip(clip)
 
         if selected:
             selected_gm = selected[1]
@@ -512,6 +651,15 @@ class Display:
         else:
             show_board_btn = None
 
+        search_area = filter_buttons = None
+        if search is not None:
+            search_area, filter_buttons = self.draw_search(search, right_panel_x + 50, panel_width - 100)
+
+        if progress:
+            loaded, total = progress
+            self.draw_text(f'Loading {loaded}/{total}', self.LIGHT_BROWN, right_panel_x + panel_width // 2,
+                           self.bottom_margin - self.element_spacing, outline_color=self.OUTLINE_COLOR)
+
         left_offset = -int(self.screen_width * 0.35)
         right_offset = int(self.screen_width * 0.3)
 
@@ -519,16 +667,41 @@ class Display:
         refresh_btn = self.draw_button('Refresh', self.bottom_margin)
         load_btn = self.draw_button('Load', self.bottom_margin, x_offset=right_offset, disabled=not selected)
 
-        return {
-            'max_items': max_visible_items,
-            'game_modes_areas': game_mode_areas,
-            'buttons': {
-                'show_board': show_board_btn,
-                'back': go_back_btn,
-                'refresh': refresh_btn,
-                'load': load_btn
-            }
-        }
+        load_info = self.load_info
+        buttons = load_info['buttons']
+        buttons['show_board'] = show_board_btn
+        load_info['search_area'] = search_area
+        load_info['filters'] = filter_buttons
+        buttons['back'] = go_back_btn
+        buttons['refresh'] = refresh_btn
+        buttons['load'] = load_btn
+        return load_info
+
+    def draw_search(self, search, x, width):
+        input_y = self.content_start_y + 5 * self.element_spacing
+        input_height = self.font.get_height() * 1.5
+        input_top = input_y - input_height // 2
+        if search.input_focused:
+            self.screen.rect(self.HIGHLIGHT_COLOR, (x - 2, input_top - 2, width + 4, input_height + 4), 6)
+        else:
+            self.screen.rect(self.SEPARATOR_COLOR, (x, input_top, width, input_height), 4)
+        input_rect = self.get_rect(x + 4, input_top + 4, width - 8, input_height - 8)
+        self.screen.rect(self.LIGHT_BROWN, input_rect)
+        text, color = (search.text, self.DARK_BROWN) if search.text else ('Search', self.GREY)
+        self.screen.blit(self.get_text_surface(text, self.font, color), (input_rect.x + 5, input_rect.y + 8))
+
+        labels = (str(search.base_gm) if search.base_gm else 'Any Mode',
+                  str(search.difficulty) if search.difficulty else 'Any Difficulty',
+                  f'Height {search.board_height}' if search.board_height else 'Any Height')
+        # game mode names are the longest, they get a row of their own
+        gap = 10 * self.scale_factor
+        half_width = int((width - gap) // 2)
+        filter_y = input_y + self.element_spacing
+        buttons = [self.draw_button(labels[0], filter_y, x=x, width=width),
+                   self.draw_button(labels[1], filter_y + self.element_spacing, x=x, width=half_width),
+                   self.draw_button(labels[2], filter_y + self.element_spacing, x=int(x + width - half_width),
+                                    width=half_width)]
+        return input_rect, buttons
 
     def preview_board(self, board_height, board):
         square_size = self.screen_height // max(8, board_height)
@@ -584,7 +757,7 @@ class Display:
         buttons = (game_mode_btn, difficulty_btn, add_btn, rm_btn, play_btn, go_back_btn)
         return buttons
 
-    def playing_screen(self, board_height, board, selected, game_stats, displayed_board_part=-1):
+    def playing_screen(self, board_height, board, selected, game_stats, displayed_board_part=-1, animation=None):
         self.screen.blit(self.background, (0, 0))
         stats_sidebar_width = self.screen_width // 4
         stats_x_padding = stats_sidebar_width // 2 + 30
@@ -620,32 +793,14 @@ class Display:
 
         board_start_x = max(stats_sidebar_width + 50, (self.screen_width - square_size * 8) // 2)
 
-        highlight_surface = pygame.Surface((square_size, square_size))
-        pygame.draw.rect(highlight_surface, self.HIGHLIGHT_COLOR,
-                         (0, 0, square_size, square_size))
-        for row in range(start_row, end_row):
-            local_row = row - start_row
-            for col in range(8):
-                square_color = self.BOARD_COLORS[(row + col) % 2]
-                square_rect = pygame.Rect(
-                    board_start_x + col * square_size,
-                    board_start_y + local_row * square_size,
-                    square_size,
-                    square_size
-                )
-                pygame.draw.rect(self.screen, square_color, square_rect)
-                if (row, col) == selected:
-                    self.screen.blit(highlight_surface,
-                                     ((col * square_size) + board_start_x,
-                                      (local_row * square_size) + board_start_y))
-
-                piece = board[row][col]
-                if piece and piece[:2] in self.piece_images:
-                    image = pygame.transform.scale(self.piece_images[piece[:2]],
-                                                   (square_size - 10, square_size - 10))
-                    self.screen.blit(image,
-                                     ((col * square_size + 5) + board_start_x,
-                                      (local_row * square_size + 5) + board_start_y))
+        layer = self.get_board_layer(board_height, 8, square_size)
+        animating = animation is not None and animation.active
+        if layer.update(board, self.assets, selected, animation.hidden if animating else ()):
+            self.screen.invalidate(layer.surface)
+        layer.blit(self.screen, board_start_x, board_start_y, start_row, end_row)
+        if animating:
+            layer.blit_sprites(self.screen, board_start_x, board_start_y, start_row, end_row, animation.sprites(),
+                               self.assets)
 
         switch_halves_btn = None
         if can_split and not display_whole_board:
@@ -654,12 +809,12 @@ class Display:
             sign = '^' if display_lower_half else 'v'
             switch_halves_btn = self.draw_button(sign, button_y, button_x, width=self.small_button_width)
 
-        return {
-            'board_start': (board_start_x, board_start_y),
-            'square_size': square_size,
-            'row_offset': start_row,
-            'switch_halves_btn': switch_halves_btn
-        }
+        play_info = self.play_info
+        play_info['board_start'] = (board_start_x, board_start_y)
+        play_info['square_size'] = square_size
+        play_info['row_offset'] = start_row
+        play_info['switch_halves_btn'] = switch_halves_btn
+        return play_info
 
     def pawn_promotion_menu(self):
         self.screen.blit(self.popup_background, (0, 0))
@@ -669,9 +824,9 @@ class Display:
         popup_x = (self.screen_width - popup_width) // 2
         popup_y = (self.screen_height - popup_height) // 2
 
-        pygame.draw.rect(self.screen, self.LIGHT_BROWN,
+        self.screen.rect(self.LIGHT_BROWN,
                          (popup_x, popup_y, popup_width, popup_height))
-        pygame.draw.rect(self.screen, self.BROWN,
+        self.screen.rect(self.BROWN,
                          (popup_x, popup_y, popup_width, popup_height), 2)
 
         piece_size = min(popup_height - 60, popup_width // 4 - 20)
@@ -683,20 +838,20 @@ class Display:
         for i, piece in enumerate(pieces):
             piece_x = popup_x + spacing + (i * (piece_size + spacing))
 
-            pygame.draw.rect(self.screen, self.YELLOW,
+            self.screen.rect(self.YELLOW,
                              (piece_x, piece_y, piece_size, piece_size))
-            pygame.draw.rect(self.screen, self.BROWN,
+            self.screen.rect(self.BROWN,
                              (piece_x, piece_y, piece_size, piece_size), 1)
 
             if piece in self.piece_images:
-                image = pygame.transform.scale(self.piece_images[piece], (piece_size - 10, piece_size - 10))
                 image_x = piece_x + 5
                 image_y = piece_y + 5
-                self.screen.blit(image, (image_x, image_y))
+                self.assets.blit_piece(self.screen, piece, piece_size - 10, (image_x, image_y))
             piece_areas[piece] = pygame.Rect(piece_x, piece_y, piece_size, piece_size)
 
         return piece_areas
 
+    @static_screen
     def help_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Help', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -716,6 +871,7 @@ class Display:
 
         return rules_btn, zombies_btn, game_modes_btn, difficulties_btn, go_back_btn
 
+    @static_screen
     def help_rules_1_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Rules 1/2', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -752,6 +908,7 @@ class Display:
 
         return go_back_btn, next_btn
 
+    @static_screen
     def help_rules_2_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Rules 2/2', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -783,6 +940,7 @@ class Display:
 
         return go_back_btn
 
+    @static_screen
     def help_zombies_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Zombies', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -801,19 +959,19 @@ class Display:
                        self.screen_width // 2, self.content_start_y, self.section_font, 3)
 
         walker_btn = self.draw_button('Walker', name_y, x=walker_x, width=img_space)
-        self.screen.blit(pygame.transform.scale(self.piece_images['zw'], (img_space, img_space)), (walker_x, img_y))
+        self.assets.blit_piece(self.screen, 'zw', img_space, (walker_x, img_y))
         self.draw_text('50%', self.LIGHT_BROWN, walker_x + img_space // 2, info_y, self.section_font, 3)
 
         infected_btn = self.draw_button('Infected', name_y, x=infected_x, width=img_space)
-        self.screen.blit(pygame.transform.scale(self.piece_images['zi'], (img_space, img_space)), (infected_x, img_y))
+        self.assets.blit_piece(self.screen, 'zi', img_space, (infected_x, img_y))
         self.draw_text('30%', self.LIGHT_BROWN, infected_x + img_space // 2, info_y, self.section_font, 3)
 
         stomper_btn = self.draw_button('Stomper', name_y, x=stomper_x, width=img_space)
-        self.screen.blit(pygame.transform.scale(self.piece_images['zs'], (img_space, img_space)), (stomper_x, img_y))
+        self.assets.blit_piece(self.screen, 'zs', img_space, (stomper_x, img_y))
         self.draw_text('10%', self.LIGHT_BROWN, stomper_x + img_space // 2, info_y, self.section_font, 3)
 
         explosive_btn = self.draw_button('Explosive', name_y, x=explosive_x, width=img_space)
-        self.screen.blit(pygame.transform.scale(self.piece_images['ze'], (img_space, img_space)), (explosive_x, img_y))
+        self.assets.blit_piece(self.screen, 'ze', img_space, (explosive_x, img_y))
         self.draw_text('10%', self.LIGHT_BROWN, explosive_x + img_space // 2, info_y, self.section_font, 3)
 
         left_offset = -int(self.screen_width * 0.35)
@@ -823,9 +981,9 @@ class Display:
 
     def zombie_info_popup(self, zombie, movement, order, *behaviour):
         panel_width = self.screen_width // 2
-        panel_rect = pygame.draw.rect(self.screen, self.BROWN,
+        panel_rect = self.screen.rect(self.BROWN,
                                       (self.screen_width // 4, 0, panel_width, self.screen_height))
-        panel_rect = pygame.draw.rect(self.screen, self.OUTLINE_COLOR,
+        panel_rect = self.screen.rect(self.OUTLINE_COLOR,
                                       (self.screen_width // 4, 0, panel_width, self.screen_height), 20)
 
         img_side = self.screen_height // 4
@@ -836,8 +994,7 @@ class Display:
         order_y = mvm_y + self.section_spacing + desc_spacing
         bhvr_y = order_y + self.section_spacing + desc_spacing
 
-        self.screen.blit(pygame.transform.scale(self.piece_images[zombie], (img_side, img_side)),
-                         ((self.screen_width - img_side) // 2, self.title_y))
+        self.assets.blit_piece(self.screen, zombie, img_side, ((self.screen_width - img_side) // 2, self.title_y))
 
         self.draw_text('Movement', self.LIGHT_BROWN, info_x, mvm_y, self.section_font, 3)
         self.draw_text(movement, self.LIGHT_BROWN, info_x, mvm_y + desc_spacing,
@@ -855,6 +1012,7 @@ class Display:
 
         return panel_rect
 
+    @static_screen
     def help_game_modes_1_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Game Modes 1/2', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -890,6 +1048,7 @@ class Display:
 
         return go_back_btn, next_btn
 
+    @static_screen
     def help_game_modes_2_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Game Modes 2/2', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -909,6 +1068,7 @@ class Display:
 
         return go_back_btn
 
+    @static_screen
     def help_difficulties_menu(self):
         self.screen.blit(self.background, (0, 0))
         self.draw_main_text('Difficulties', self.LIGHT_BROWN, self.OUTLINE_COLOR)
@@ -929,16 +1089,16 @@ class Display:
         )
 
         table_height = row_height * 5
-        pygame.draw.rect(self.screen, self.OUTLINE_COLOR,
+        self.screen.rect(self.OUTLINE_COLOR,
                          (table_x - 5, table_y - 5, table_width + 10, table_height + 10), 0)
-        pygame.draw.rect(self.screen, self.LIGHT_BROWN,
+        self.screen.rect(self.LIGHT_BROWN,
                          (table_x, table_y, table_width, table_height), 0)
 
         current_x = table_x
         for i, header in enumerate(headers):
             cell_rect = pygame.Rect(current_x, table_y, col_width, row_height)
-            pygame.draw.rect(self.screen, self.BROWN, cell_rect, 0)
-            pygame.draw.rect(self.screen, self.OUTLINE_COLOR, cell_rect, 2)
+            self.screen.rect(self.BROWN, cell_rect, 0)
+            self.screen.rect(self.OUTLINE_COLOR, cell_rect, 2)
 
             self.draw_text(header, self.LIGHT_BROWN,
                            current_x + col_width // 2,
@@ -952,8 +1112,8 @@ class Display:
 
             for col_idx, cell_data in enumerate(row_data):
                 cell_rect = pygame.Rect(current_x, current_y, col_width, row_height)
-                pygame.draw.rect(self.screen, self.DARK_BROWN, cell_rect, 0)
-                pygame.draw.rect(self.screen, self.OUTLINE_COLOR, cell_rect, 1)
+                self.screen.rect(self.DARK_BROWN, cell_rect, 0)
+                self.screen.rect(self.OUTLINE_COLOR, cell_rect, 1)
 
                 self.draw_text(cell_data, self.LIGHT_BROWN,
                                current_x + col_width // 2,
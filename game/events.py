@@ -0,0 +1,45 @@
+import pygame
+
+# TEXTINPUT stays allowed because pygame fills KEYDOWN.unicode from it
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL)
+WHEEL_BUTTONS = (pygame.BUTTON_WHEELUP, pygame.BUTTON_WHEELDOWN)
+
+
+def allow_input_events():
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+
+
+def is_wheel_button(event):
+    return event.type == pygame.MOUSEBUTTONDOWN and event.button in WHEEL_BUTTONS
+
+
+def coalesce(events):
+    result = []
+    wheel_clicked = False
+    for event in events:
+        if event.type == pygame.TEXTINPUT:
+            continue
+        elif is_wheel_button(event):
+            # pygame reports every wheel step twice, scrolling uses the MOUSEWHEEL events, one click per frame is
+            # kept for the popups that close on any mouse button
+            if wheel_clicked:
+                continue
+            wheel_clicked = True
+        elif event.type == pygame.MOUSEWHEEL:
+            # wheel events carry the pointer position like clicks do, so handlers never read the live mouse
+            pos = getattr(event, 'pos', None) or pygame.mouse.get_pos()
+            x, y = event.x, event.y
+            last = len(result) - 1
+            while last >= 0 and is_wheel_button(result[last]):
+                last -= 1
+            if last >= 0 and result[last].type == pygame.MOUSEWHEEL:
+                x += result[last].x
+                y += result[last].y
+                del result[last]
+            if x == 0 and y == 0:
+                # steps in opposite directions within one frame cancel out, nothing is left to handle
+                continue
+            event = pygame.event.Event(pygame.MOUSEWHEEL, x=x, y=y, flipped=event.flipped, pos=pos)
+        result.append(event)
+    return result
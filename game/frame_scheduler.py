@@ -0,0 +1,56 @@
+import pygame
+
+
+class FrameScheduler:
+    DEFAULT_REFRESH_RATE = 60
+
+    def __init__(self, idle_fps=20, fps_cap=0, vsync=False):
+        self.idle_fps = idle_fps
+        self.fps_cap = fps_cap
+        self.vsync = vsync
+        self.vsync_active = False
+        self.refresh_rate = self.DEFAULT_REFRESH_RATE
+        self.clock = pygame.time.Clock()
+
+    def set_mode(self, size, flags):
+        if self.vsync:
+            # vsync needs a renderer behind the window, which pygame only creates for SCALED or OPENGL, a
+            # SCALED window maps mouse positions and fullscreen through a logical surface, so it is opt-in and
+            # without it the window is opened exactly like before
+            try:
+                screen = pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+                self.vsync_active = True
+                self.refresh_rate = self.read_refresh_rate()
+                return screen
+            except pygame.error as e:
+                print(f'Vsync is not available, falling back to timed frames: {e}')
+                self.vsync = False
+        self.vsync_active = False
+        screen = pygame.display.set_mode(size, flags)
+        self.refresh_rate = self.read_refresh_rate()
+        return screen
+
+    def read_refresh_rate(self):
+        get_refresh_rates = getattr(pygame.display, 'get_desktop_refresh_rates', None)
+        if get_refresh_rates is not None:
+            try:
+                rates = [rate for rate in get_refresh_rates() if rate > 0]
+            except pygame.error:
+                rates = []
+            if rates:
+                return rates[0]
+        return self.DEFAULT_REFRESH_RATE
+
+    def target_fps(self, animating):
+        fps = self.refresh_rate if animating else self.idle_fps
+        if self.fps_cap:
+            fps = min(fps, self.fps_cap)
+        return fps
+
+    def tick(self, animating=False):
+        # with vsync the flip already waits for the vertical blank, the timer stays as a ceiling for drivers
+        # that accept the flag but do not honour it
+        return self.clock.tick(self.target_fps(animating))
+
+    def get_fps(self):
+        return self.clock.get_fps()
@@ -1,6 +1,17 @@
 import pygame
 
+import functools
+import random
+import time
+
+from game.animation import MoveAnimator
+from game.canvas import SurfaceCanvas, TextureCanvas
 from game.display import Display
+from game.events import allow_input_events, coalesce
+from game.frame_scheduler import FrameScheduler
+from game.list_view import ListView
+from game.profiling import FrameProfiler, LatencyTracer, ProfileCapture
+from game.replay import InputRecorder
 from game.game_modes import *
 from game.custom import *
 
@@ -39,35 +50,93 @@ class GameState(Enum):
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, idle_fps=20, fps_cap=0, vsync=False, renderer='surface', screen_size=None, seed=None,
+                 record=None):
+        self._start_time = time.perf_counter()
         pygame.init()
+        # a known seed lets a recorded session be played back into the same boards and zombie waves
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        random.seed(self.seed)
+        self.frame_scheduler = FrameScheduler(idle_fps, fps_cap, vsync)
+        self.renderer = renderer
+        self.screen = None
         self.won = False
+        self.latency = LatencyTracer()
         self.gameplay = Gameplay.init_game_mode(8, Difficulty.EASY, GameMode.BLOCK_THE_BORDER)
         self.custom_creator = CustomGameCreator()
-        self.custom_loader = CustomGameLoader()
+        self.custom_loader = CustomGameLoader(index_path=INDEX_PATH)
 
-        self._scroll_offset = 0
-        self._max_scroll = 0
+        self.custom_filter = CustomGameFilter()
+        self.custom_list = ListView()
+        self._custom_list_version = None
         self._displayed_board_part = 0
         self._promotion_col = 0
-
-        info_object = pygame.display.Info()
-        screen_width = info_object.current_w
-        screen_height = info_object.current_h
+        self._game_stats = {}
+        self._first_frame_reported = False
+        self.animator = MoveAnimator()
+        self.profiler = FrameProfiler()
+        self.profile_capture = ProfileCapture()
+
+        if screen_size is None:
+            info_object = pygame.display.Info()
+            screen_size = (info_object.current_w, info_object.current_h)
+        screen_width, screen_height = screen_size
         screen_border_height = 50
         self.fullscreen = True
         bordered_screen_height = screen_height - screen_border_height
-        self.screen = pygame.display.set_mode(
-            (screen_width, screen_height if self.fullscreen else bordered_screen_height),
-            pygame.FULLSCREEN if self.fullscreen else pygame.SHOWN)
+        self.screen = self.open_screen((screen_width, screen_height if self.fullscreen else bordered_screen_height))
         self.display = Display(self.screen, screen_width, screen_height, screen_border_height)
 
         pygame.display.set_caption('Pawnbies')
+        allow_input_events()
+        self.recorder = InputRecorder(record, self.seed, screen_size, self.fullscreen) if record else None
         self.current_state = GameState.MENU
+        self.state_handlers = {
+            GameState.MENU: self.handle_menu_state,
+            GameState.CUSTOM_MENU: self.handle_custom_menu_state,
+            GameState.CREATE_CUSTOM: self.handle_create_custom_state,
+            GameState.SAVE_CUSTOM: self.handle_save_custom_state,
+            GameState.SAVING_STATUS: self.handle_saving_status_state,
+            GameState.LOAD_CUSTOM: self.handle_load_custom_state,
+            GameState.BOARD_PREVIEW: self.handle_board_preview_state,
+            GameState.LOADING_FAILURE: self.handle_loading_failure_state,
+            GameState.CUSTOM_SETTINGS: self.handle_custom_settings_state,
+            GameState.SETTINGS: self.handle_settings_state,
+            GameState.GAME_OVER: self.handle_game_over_state,
+            GameState.PLAYING: self.handle_playing_state,
+            GameState.PAWN_PROMOTION: self.handle_pawn_promotion_state,
+            GameState.HELP_MENU: self.handle_help_menu_state,
+            GameState.HELP_RULES_1: functools.partial(self.handle_help_rules_state, page=1),
+            GameState.HELP_RULES_2: functools.partial(self.handle_help_rules_state, page=2),
+            GameState.HELP_ZOMBIES: self.handle_help_zombies_state,
+            GameState.HELP_WALKER: self.handle_help_zombie_state,
+            GameState.HELP_INFECTED: self.handle_help_zombie_state,
+            GameState.HELP_STOMPER: self.handle_help_zombie_state,
+            GameState.HELP_EXPLOSIVE: self.handle_help_zombie_state,
+            GameState.HELP_GAME_MODES_1: functools.partial(self.handle_help_game_modes_state, page=1),
+            GameState.HELP_GAME_MODES_2: functools.partial(self.handle_help_game_modes_state, page=2),
+            GameState.HELP_DIFFICULTIES: self.handle_help_difficulties_state,
+        }
+
+    def open_screen(self, size):
+        if self.renderer == 'texture':
+            if self.screen is None:
+                return TextureCanvas.open('Pawnbies', size, self.fullscreen, self.frame_scheduler.vsync)
+            self.screen.set_mode(size, self.fullscreen)
+            return self.screen
+        return SurfaceCanvas(self.frame_scheduler.set_mode(size, pygame.FULLSCREEN if self.fullscreen else pygame.SHOWN))
+
+    @property
+    def gameplay(self):
+        return self._gameplay
+
+    @gameplay.setter
+    def gameplay(self, gameplay):
+        self._gameplay = self.latency.watch(gameplay, 'move_piece', 'skip_turn', 'move_wave')
 
     def handle_menu_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             play_btn, custom_btn, help_btn, quit_btn = self.display.main_menu()
             if play_btn.collidepoint(mouse_pos):
                 self.current_state = GameState.SETTINGS
@@ -81,13 +150,14 @@ class Game:
 
     def handle_custom_menu_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             create_btn, load_btn, back_btn = self.display.custom_menu()
             if create_btn.collidepoint(mouse_pos):
                 self.custom_creator.reset()
                 self.current_state = GameState.CREATE_CUSTOM
             elif load_btn.collidepoint(mouse_pos):
                 self.custom_loader.reset()
+                self.custom_filter.reset()
                 self.current_state = GameState.LOAD_CUSTOM
             elif back_btn.collidepoint(mouse_pos):
                 self.current_state = GameState.MENU
@@ -100,7 +170,7 @@ class Game:
         board_x, board_y = custom_info['board_start']
 
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             buttons = custom_info['buttons']
             square_size = custom_info['square_size']
             col = int((mouse_pos[0] - board_x) // square_size)
@@ -142,7 +212,7 @@ class Game:
 
     def handle_save_custom_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             game = self.custom_creator.game
             custom_info = self.display.save_custom_menu(game.base_gm,
                                                         game.difficulty,
@@ -167,8 +237,8 @@ class Game:
             elif buttons['disable_difficulty'].collidepoint(mouse_pos):
                 game.can_change_difficulty = not game.can_change_difficulty
             elif buttons['save'].collidepoint(mouse_pos):
-                if self.custom_creator.is_name_ok:
-                    self.custom_creator.save()
+                if self.custom_creator.is_name_ok and not self.custom_creator.saving:
+                    self.custom_creator.save_in_background()
                     self.current_state = GameState.SAVING_STATUS
 
             if input_area.collidepoint(mouse_pos):
@@ -186,15 +256,18 @@ class Game:
                         self.custom_creator.game.name += event.unicode
                     self.custom_creator.check_name()
 
+    def saving_status(self):
+        if self.custom_creator.saving:
+            return 'Saving', 'Writing the game mode to disk'
+        if self.custom_creator.error_msg:
+            return 'Saving Failed', self.custom_creator.error_msg
+        return 'Success', 'Game Mode saved successfully'
+
     def handle_saving_status_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
 
-            main_text = 'Success'
-            additional_info = 'Game Mode saved successfully'
-            if self.custom_creator.error_msg:
-                main_text = 'Saving Failed'
-                additional_info = self.custom_creator.error_msg
+            main_text, additional_info = self.saving_status()
             restart_btn, menu_btn = self.display.information_menu(main_text, 'Go Back', 'Main Menu',
                                                                   additional_info=additional_info)
             if restart_btn.collidepoint(mouse_pos):
@@ -205,29 +278,47 @@ class Game:
                 self.current_state = GameState.MENU
 
     def handle_load_custom_state(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-
-            if event.button == pygame.BUTTON_WHEELUP:
-                self._scroll_offset = max(0, self._scroll_offset - 1)
-            elif event.button == pygame.BUTTON_WHEELDOWN:
-                self._scroll_offset = min(self._max_scroll, self._scroll_offset + 1)
-
+        if event.type == pygame.MOUSEWHEEL:
+            self.custom_list.scroll_rows(-event.y)
+        elif event.type == pygame.KEYDOWN:
+            if self.custom_filter.input_focused and event.key == pygame.K_BACKSPACE:
+                self.custom_filter.rm_char()
+            elif self.custom_filter.input_focused and event.unicode and event.unicode.isprintable():
+                self.custom_filter.add_text(event.unicode)
+            elif event.key == pygame.K_UP:
+                self.custom_list.scroll_rows(-1)
+            elif event.key == pygame.K_DOWN:
+                self.custom_list.scroll_rows(1)
+            elif event.key == pygame.K_PAGEUP:
+                self.custom_list.page(-1)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.custom_list.page(1)
+            elif event.key == pygame.K_HOME:
+                self.custom_list.scroll_to(0)
+            elif event.key == pygame.K_END:
+                self.custom_list.scroll_to(self.custom_list.max_offset)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
             custom_info = self.display.load_custom_menu(self.custom_loader.game_modes,
                                                         self.custom_loader.selected_gm,
-                                                        self._scroll_offset)
-
-            max_visible_items = custom_info['max_items']
-            total_items = len(self.custom_loader.game_modes)
-            self._max_scroll = max(0, total_items - max_visible_items)
+                                                        self.custom_list, self.custom_games_progress(),
+                                                        self.custom_filter, self.custom_loader.board_reader)
 
             if event.button == pygame.BUTTON_LEFT:
+                self.custom_filter.input_focused = custom_info['search_area'].collidepoint(mouse_pos)
+                filter_gm_btn, filter_difficulty_btn, filter_height_btn = custom_info['filters']
+                if filter_gm_btn.collidepoint(mouse_pos):
+                    self.custom_filter.switch_base_gm()
+                elif filter_difficulty_btn.collidepoint(mouse_pos):
+                    self.custom_filter.switch_difficulty()
+                elif filter_height_btn.collidepoint(mouse_pos):
+                    self.custom_filter.switch_board_height()
+
                 buttons = custom_info['buttons']
                 if buttons['back'].collidepoint(mouse_pos):
                     self.current_state = GameState.CUSTOM_MENU
                 elif buttons['refresh'].collidepoint(mouse_pos):
-                    if not self.custom_loader.get_all():
-                        self.current_state = GameState.LOADING_FAILURE
+                    self.load_custom_games()
                 elif buttons['show_board'] and buttons['show_board'].collidepoint(mouse_pos):
                     self.display.set_popup_background()
                     self.current_state = GameState.BOARD_PREVIEW
@@ -252,12 +343,12 @@ class Game:
                     if rect.collidepoint(mouse_pos):
                         if self.custom_loader.selected_gm and self.custom_loader.selected_gm[0] == gm_id:
                             self.custom_loader.unselect_gm()
-                        else:
-                            self.custom_loader.select_gm(gm_id)
+                        elif not self.custom_loader.select_gm(gm_id):
+                            self.current_state = GameState.LOADING_FAILURE
 
     def handle_board_preview_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             board_area = self.display.preview_board(self.custom_loader.selected_gm[1].board_height,
                                                     self.custom_loader.selected_gm[1].board)
 
@@ -266,7 +357,7 @@ class Game:
 
     def handle_loading_failure_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             menu_btn, quit_btn = self.display.information_menu('Loading Failed', 'Main Menu', 'Quit',
                                                                additional_info=self.custom_loader.error_msg)
             if menu_btn.collidepoint(mouse_pos):
@@ -278,7 +369,7 @@ class Game:
 
     def handle_custom_settings_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             selected_gm = self.custom_loader.selected_gm[1]
             game_mode = self.gameplay.game_mode if selected_gm.can_change_gm else None
             difficulty = self.gameplay.difficulty if selected_gm.can_change_difficulty else None
@@ -305,7 +396,7 @@ class Game:
 
     def handle_settings_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             buttons = self.display.game_settings_menu(
                 self.gameplay.game_mode,
                 self.gameplay.difficulty,
@@ -336,7 +427,7 @@ class Game:
 
     def handle_game_over_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             main_text = 'You Win' if self.won else 'Game Over'
             show_btn, menu_btn = self.display.information_menu(main_text, 'Show Board', 'Main Menu',
                                                                additional_info=self.gameplay.endgame_info(self.won))
@@ -345,14 +436,17 @@ class Game:
             elif menu_btn.collidepoint(mouse_pos):
                 self.current_state = GameState.MENU
 
+    def update_game_stats(self):
+        game_stats = self._game_stats
+        game_stats['Turn'] = self.gameplay.turns
+        game_stats['Moves'] = self.gameplay.moves
+        game_stats['Captured Zombies'] = self.gameplay.zombies_captured
+        return game_stats
+
     def handle_playing_state(self, event):
-        game_stats = {
-            'Turn': self.gameplay.turns,
-            'Moves': self.gameplay.moves,
-            'Captured Zombies': self.gameplay.zombies_captured,
-        }
         play_info = self.display.playing_screen(self.gameplay.board_height, self.gameplay.board,
-                                                self.gameplay.selected_piece, game_stats, self._displayed_board_part)
+                                                self.gameplay.selected_piece, self.update_game_stats(),
+                                                self._displayed_board_part)
         board_x, board_y = play_info['board_start']
         square_size = play_info['square_size']
 
@@ -360,12 +454,14 @@ class Game:
             if event.button == pygame.BUTTON_RIGHT:
                 self.gameplay.unselect_piece()
             elif event.button == pygame.BUTTON_MIDDLE:
-                if self.gameplay.skip_turn() == TurnResult.CHECKMATE:
+                turn_result = self.gameplay.skip_turn()
+                self.animator.start(self.gameplay.cell_moves)
+                if turn_result == TurnResult.CHECKMATE:
                     self.current_state = GameState.GAME_OVER
                     self.won = False
             elif event.button == pygame.BUTTON_LEFT:
                 switch_btn = play_info['switch_halves_btn']
-                if switch_btn and switch_btn.collidepoint(pygame.mouse.get_pos()):
+                if switch_btn and switch_btn.collidepoint(event.pos):
                     self._displayed_board_part = -self._displayed_board_part
                     return
 
@@ -377,6 +473,8 @@ class Game:
                 if self.gameplay.selected_piece:
                     start_row, start_col = self.gameplay.selected_piece
                     turn_result = self.gameplay.move_piece(start_row, start_col, row, col)
+                    if self.gameplay.cell_moves:
+                        self.animator.start(self.gameplay.cell_moves)
                     if turn_result == TurnResult.CHECKMATE:
                         self.current_state = GameState.GAME_OVER
                         self.won = False
@@ -400,9 +498,9 @@ class Game:
         elif event.type == pygame.MOUSEWHEEL:
             if event.y < 0:
                 self._displayed_board_part = 0
-            else:
+            elif event.y > 0:
                 if self._displayed_board_part == 0:
-                    if pygame.mouse.get_pos()[1] < self.display.screen_height // 2:
+                    if event.pos[1] < self.display.screen_height // 2:
                         self._displayed_board_part = 1
                     else:
                         self._displayed_board_part = -1
@@ -415,7 +513,7 @@ class Game:
 
     def handle_pawn_promotion_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             piece_areas = self.display.pawn_promotion_menu()
 
             for piece, area in piece_areas.items():
@@ -433,7 +531,7 @@ class Game:
             difficulties_btn = buttons[3]
             back_btn = buttons[4]
 
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             if back_btn.collidepoint(mouse_pos):
                 self.current_state = GameState.MENU
             elif rules_btn.collidepoint(mouse_pos):
@@ -447,7 +545,7 @@ class Game:
 
     def handle_help_rules_state(self, event, page):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             if page == 1:
                 back_btn, next_btn = self.display.help_rules_1_menu()
 
@@ -463,7 +561,7 @@ class Game:
 
     def handle_help_zombies_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             walker_btn, infected_btn, stomper_btn, explosive_btn, back_btn = self.display.help_zombies_menu()
 
             if back_btn.collidepoint(mouse_pos):
@@ -483,7 +581,7 @@ class Game:
 
     def handle_help_zombie_state(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
 
             if self.current_state == GameState.HELP_WALKER:
                 area = self.display.zombie_info_popup('zw', '1 each turn', 'Down -> Right -> Left', 'None')
@@ -503,7 +601,7 @@ class Game:
 
     def handle_help_game_modes_state(self, event, page):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             if page == 1:
                 back_btn, next_btn = self.display.help_game_modes_1_menu()
 
@@ -521,11 +619,15 @@ class Game:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
             back_btn = self.display.help_difficulties_menu()
 
-            if back_btn.collidepoint(pygame.mouse.get_pos()):
+            if back_btn.collidepoint(event.pos):
                 self.current_state = GameState.HELP_MENU
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        events = coalesce(pygame.event.get() if events is None else events)
+        if self.recorder:
+            self.recorder.record(events)
+        for event in events:
+            self.latency.begin_event(event, self.current_state)
             if event.type == pygame.QUIT:
                 return False
 
@@ -535,154 +637,182 @@ class Game:
                 if event.key == pygame.K_F11:
                     self.fullscreen = not self.fullscreen
                     if self.fullscreen:
-                        self.screen = pygame.display.set_mode(
-                            (self.display.screen_width, self.display.screen_height),
-                            pygame.FULLSCREEN)
+                        self.screen = self.open_screen((self.display.screen_width, self.display.screen_height))
                     else:
-                        self.screen = pygame.display.set_mode(
-                            (self.display.screen_width, self.display.screen_height - self.display.screen_border_height),
-                            pygame.SHOWN)
+                        self.screen = self.open_screen(
+                            (self.display.screen_width, self.display.screen_height - self.display.screen_border_height))
+                    self.display.screen = self.screen
                     self.display.switch_screen_display()
-
-            if self.current_state == GameState.MENU:
-                if not self.handle_menu_state(event):
-                    return False
-            elif self.current_state == GameState.CUSTOM_MENU:
-                self.handle_custom_menu_state(event)
-            elif self.current_state == GameState.CREATE_CUSTOM:
-                self.handle_create_custom_state(event)
-            elif self.current_state == GameState.SAVE_CUSTOM:
-                self.handle_save_custom_state(event)
-            elif self.current_state == GameState.SAVING_STATUS:
-                self.handle_saving_status_state(event)
-            elif self.current_state == GameState.LOAD_CUSTOM:
-                self.handle_load_custom_state(event)
-            elif self.current_state == GameState.BOARD_PREVIEW:
-                self.handle_board_preview_state(event)
-            elif self.current_state == GameState.LOADING_FAILURE:
-                if not self.handle_loading_failure_state(event):
-                    return False
-            elif self.current_state == GameState.CUSTOM_SETTINGS:
-                self.handle_custom_settings_state(event)
-            elif self.current_state == GameState.SETTINGS:
-                self.handle_settings_state(event)
-            elif self.current_state == GameState.GAME_OVER:
-                self.handle_game_over_state(event)
-            elif self.current_state == GameState.PLAYING:
-                self.handle_playing_state(event)
-            elif self.current_state == GameState.PAWN_PROMOTION:
-                self.handle_pawn_promotion_state(event)
-            elif self.current_state == GameState.HELP_MENU:
-                self.handle_help_menu_state(event)
-            elif self.current_state == GameState.HELP_RULES_1:
-                self.handle_help_rules_state(event, 1)
-            elif self.current_state == GameState.HELP_RULES_2:
-                self.handle_help_rules_state(event, 2)
-            elif self.current_state == GameState.HELP_ZOMBIES:
-                self.handle_help_zombies_state(event)
-            elif self.current_state in (GameState.HELP_WALKER, GameState.HELP_INFECTED,
-                                        GameState.HELP_STOMPER, GameState.HELP_EXPLOSIVE):
-                self.handle_help_zombie_state(event)
-            elif self.current_state == GameState.HELP_GAME_MODES_1:
-                self.handle_help_game_modes_state(event, 1)
-            elif self.current_state == GameState.HELP_GAME_MODES_2:
-                self.handle_help_game_modes_state(event, 2)
-            elif self.current_state == GameState.HELP_DIFFICULTIES:
-                self.handle_help_difficulties_state(event)
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    self.profile_capture.toggle()
+                elif event.key == pygame.K_F5:
+                    self.latency.toggle()
+
+            handler = self.state_handlers.get(self.current_state)
+            if handler and handler(event) is False:
+                return False
+            self.latency.end_event()
         return True
 
+    def load_custom_games(self):
+        self.custom_loader.start()
+
+    def poll_custom_games(self):
+        if self.custom_loader.poll() is False and self.current_state in (GameState.MENU, GameState.LOAD_CUSTOM):
+            self.current_state = GameState.LOADING_FAILURE
+        if self.custom_loader.selected_gm is None and self.current_state in (GameState.BOARD_PREVIEW,
+                                                                              GameState.CUSTOM_SETTINGS):
+            # the watcher dropped the game being looked at, its file was deleted or no longer parses
+            self.current_state = GameState.LOAD_CUSTOM
+        self.refresh_custom_list()
+
+    def refresh_custom_list(self):
+        # the sorted keys are only rebuilt when the catalog or the search changed, not on every frame or scroll
+        version = (self.custom_loader.version, self.custom_filter.key)
+        if self._custom_list_version == version:
+            return
+        if self._custom_list_version is None or self._custom_list_version[1] != version[1]:
+            self.custom_list.scroll_to(0, animate=False)
+        self._custom_list_version = version
+        text, base_gm, difficulty, board_height = self.custom_filter.key
+        self.custom_list.set_keys(self.custom_loader.search(text, base_gm, difficulty, board_height))
+
+    def custom_games_progress(self):
+        return self.custom_loader.progress if self.custom_loader.loading else None
+
+    def wait_for_custom_games(self):
+        self.load_custom_games()
+        self.custom_loader.wait_until_loaded()
+        self.poll_custom_games()
+
+    def report_first_frame(self):
+        self._first_frame_reported = True
+        print(f'First frame after {(time.perf_counter() - self._start_time) * 1000:.1f} ms')
+
+    def render(self):
+        if self.current_state == GameState.MENU:
+            self.display.main_menu()
+        elif self.current_state == GameState.CUSTOM_MENU:
+            self.display.custom_menu()
+        elif self.current_state == GameState.CREATE_CUSTOM:
+            game = self.custom_creator.game
+            self.display.create_custom_menu(game.board_height, game.board,
+                                            self.custom_creator.selected_piece,
+                                            self.custom_creator.has_king)
+        elif self.current_state == GameState.SAVE_CUSTOM:
+            game = self.custom_creator.game
+            self.display.save_custom_menu(game.base_gm,
+                                          game.difficulty,
+                                          game.can_change_gm,
+                                          game.can_change_difficulty,
+                                          game.name, self.custom_creator.input_focused,
+                                          self.custom_creator.is_name_ok)
+        elif self.current_state == GameState.SAVING_STATUS:
+            main_text, additional_info = self.saving_status()
+            self.display.information_menu(main_text, 'Go Back', 'Main Menu', additional_info=additional_info)
+        elif self.current_state == GameState.LOAD_CUSTOM:
+            self.custom_list.update()
+            self.display.load_custom_menu(self.custom_loader.game_modes, self.custom_loader.selected_gm,
+                                          self.custom_list, self.custom_games_progress(), self.custom_filter,
+                                          self.custom_loader.board_reader)
+        elif self.current_state == GameState.BOARD_PREVIEW:
+            self.display.preview_board(self.custom_loader.selected_gm[1].board_height,
+                                       self.custom_loader.selected_gm[1].board)
+        elif self.current_state == GameState.LOADING_FAILURE:
+            self.display.information_menu('Loading Failed', 'Main Menu', 'Quit',
+                                          additional_info=self.custom_loader.error_msg)
+        elif self.current_state == GameState.CUSTOM_SETTINGS:
+            selected_gm = self.custom_loader.selected_gm[1]
+            difficulty = self.gameplay.difficulty if selected_gm.can_change_difficulty else None
+            game_mode = self.gameplay.game_mode if selected_gm.can_change_gm else None
+            self.display.game_settings_menu(game_mode, difficulty)
+        elif self.current_state == GameState.HELP_MENU:
+            self.display.help_menu()
+        elif self.current_state == GameState.HELP_RULES_1:
+            self.display.help_rules_1_menu()
+        elif self.current_state == GameState.HELP_RULES_2:
+            self.display.help_rules_2_menu()
+        elif self.current_state == GameState.HELP_ZOMBIES:
+            self.display.help_zombies_menu()
+        elif self.current_state == GameState.HELP_WALKER:
+            self.display.zombie_info_popup('zw', '1 each turn', 'Down -> Right -> Left', 'None')
+        elif self.current_state == GameState.HELP_INFECTED:
+            self.display.zombie_info_popup('zi', '1 each turn', 'Down -> Right -> Left',
+                                           'Turns captured pieces into Walkers')
+        elif self.current_state == GameState.HELP_STOMPER:
+            self.display.zombie_info_popup('zs', '1-3 each turn', 'Down -> Right -> Left',
+                                           'Moves 1 more time when capturing, up to 3 times')
+        elif self.current_state == GameState.HELP_EXPLOSIVE:
+            self.display.zombie_info_popup('ze', '1 each turn', 'Random',
+                                           'Removes ALL adjacent pieces (not diagonal)',
+                                           'when captured')
+        elif self.current_state == GameState.HELP_GAME_MODES_1:
+            self.display.help_game_modes_1_menu()
+        elif self.current_state == GameState.HELP_GAME_MODES_2:
+            self.display.help_game_modes_2_menu()
+        elif self.current_state == GameState.HELP_DIFFICULTIES:
+            self.display.help_difficulties_menu()
+        elif self.current_state == GameState.SETTINGS:
+            self.display.game_settings_menu(self.gameplay.game_mode, self.gameplay.difficulty,
+                                            self.gameplay.board_height)
+        elif self.current_state == GameState.PLAYING or self.current_state == GameState.ENDGAME_BOARD:
+            self.animator.update()
+            self.display.playing_screen(self.gameplay.board_height, self.gameplay.board,
+                                        self.gameplay.selected_piece, self.update_game_stats(),
+                                        self._displayed_board_part, self.animator)
+        elif self.current_state == GameState.PAWN_PROMOTION:
+            self.display.pawn_promotion_menu()
+        elif self.current_state == GameState.GAME_OVER:
+            main_text = 'You Win' if self.won else 'Game Over'
+            self.display.information_menu(main_text, 'Show Board', 'Main Menu',
+                                          additional_info=self.gameplay.endgame_info(self.won))
+
+    def animating(self):
+        # render only advances what the current screen shows, an animation left behind by a state change
+        # would otherwise keep the frame rate up on an idle screen
+        self.animator.update()
+        self.custom_list.update()
+        return self.animator.active or self.custom_list.scrolling
+
     def run(self):
         running = True
-        clock = pygame.time.Clock()
-        if not self.custom_loader.get_all():
-            self.current_state = GameState.LOADING_FAILURE
+        self.custom_loader.watch()
+        self.load_custom_games()
 
         while running:
+            self.profiler.begin_frame()
+            start = time.perf_counter()
             running = self.handle_events()
-
-            if self.current_state == GameState.MENU:
-                self.display.main_menu()
-            elif self.current_state == GameState.CUSTOM_MENU:
-                self.display.custom_menu()
-            elif self.current_state == GameState.CREATE_CUSTOM:
-                game = self.custom_creator.game
-                self.display.create_custom_menu(game.board_height, game.board,
-                                                self.custom_creator.selected_piece,
-                                                self.custom_creator.has_king)
-            elif self.current_state == GameState.SAVE_CUSTOM:
-                game = self.custom_creator.game
-                self.display.save_custom_menu(game.base_gm,
-                                              game.difficulty,
-                                              game.can_change_gm,
-                                              game.can_change_difficulty,
-                                              game.name, self.custom_creator.input_focused,
-                                              self.custom_creator.is_name_ok)
-            elif self.current_state == GameState.SAVING_STATUS:
-                main_text = 'Success'
-                additional_info = 'Game Mode saved successfully'
-                if self.custom_creator.error_msg:
-                    main_text = 'Saving Failed'
-                    additional_info = self.custom_creator.error_msg
-                self.display.information_menu(main_text, 'Go Back', 'Main Menu', additional_info=additional_info)
-            elif self.current_state == GameState.LOAD_CUSTOM:
-                self.display.load_custom_menu(self.custom_loader.game_modes, self.custom_loader.selected_gm,
-                                              self._scroll_offset)
-            elif self.current_state == GameState.BOARD_PREVIEW:
-                self.display.preview_board(self.custom_loader.selected_gm[1].board_height,
-                                           self.custom_loader.selected_gm[1].board)
-            elif self.current_state == GameState.LOADING_FAILURE:
-                self.display.information_menu('Loading Failed', 'Main Menu', 'Quit',
-                                              additional_info=self.custom_loader.error_msg)
-            elif self.current_state == GameState.CUSTOM_SETTINGS:
-                selected_gm = self.custom_loader.selected_gm[1]
-                difficulty = self.gameplay.difficulty if selected_gm.can_change_difficulty else None
-                game_mode = self.gameplay.game_mode if selected_gm.can_change_gm else None
-                self.display.game_settings_menu(game_mode, difficulty)
-            elif self.current_state == GameState.HELP_MENU:
-                self.display.help_menu()
-            elif self.current_state == GameState.HELP_RULES_1:
-                self.display.help_rules_1_menu()
-            elif self.current_state == GameState.HELP_RULES_2:
-                self.display.help_rules_2_menu()
-            elif self.current_state == GameState.HELP_ZOMBIES:
-                self.display.help_zombies_menu()
-            elif self.current_state == GameState.HELP_WALKER:
-                self.display.zombie_info_popup('zw', '1 each turn', 'Down -> Right -> Left', 'None')
-            elif self.current_state == GameState.HELP_INFECTED:
-                self.display.zombie_info_popup('zi', '1 each turn', 'Down -> Right -> Left',
-                                               'Turns captured pieces into Walkers')
-            elif self.current_state == GameState.HELP_STOMPER:
-                self.display.zombie_info_popup('zs', '1-3 each turn', 'Down -> Right -> Left',
-                                               'Moves 1 more time when capturing, up to 3 times')
-            elif self.current_state == GameState.HELP_EXPLOSIVE:
-                self.display.zombie_info_popup('ze', '1 each turn', 'Random',
-                                               'Removes ALL adjacent pieces (not diagonal)',
-                                               'when captured')
-            elif self.current_state == GameState.HELP_GAME_MODES_1:
-                self.display.help_game_modes_1_menu()
-            elif self.current_state == GameState.HELP_GAME_MODES_2:
-                self.display.help_game_modes_2_menu()
-            elif self.current_state == GameState.HELP_DIFFICULTIES:
-                self.display.help_difficulties_menu()
-            elif self.current_state == GameState.SETTINGS:
-                self.display.game_settings_menu(self.gameplay.game_mode, self.gameplay.difficulty,
-                                                self.gameplay.board_height)
-            elif self.current_state == GameState.PLAYING or self.current_state == GameState.ENDGAME_BOARD:
-                game_stats = {
-                    'Turn': self.gameplay.turns,
-                    'Moves': self.gameplay.moves,
-                    'Captured Zombies': self.gameplay.zombies_captured,
-                }
-                self.display.playing_screen(self.gameplay.board_height, self.gameplay.board,
-                                            self.gameplay.selected_piece, game_stats, self._displayed_board_part)
-            elif self.current_state == GameState.PAWN_PROMOTION:
-                self.display.pawn_promotion_menu()
-            elif self.current_state == GameState.GAME_OVER:
-                main_text = 'You Win' if self.won else 'Game Over'
-                self.display.information_menu(main_text, 'Show Board', 'Main Menu',
-                                              additional_info=self.gameplay.endgame_info(self.won))
-
-            pygame.display.flip()
-            clock.tick(20)
-
+            self.profiler.add('events', start)
+            self.display.poll_assets()
+            self.poll_custom_games()
+
+            start = time.perf_counter()
+            self.render()
+            self.profiler.add('render', start)
+            if self.profiler.enabled:
+                self.display.debug_overlay(self.profiler.overlay_lines())
+
+            start = time.perf_counter()
+            self.screen.present()
+            self.profiler.add('flip', start)
+            self.latency.frame_flipped()
+            self.profiler.end_frame(self.current_state)
+            self.profile_capture.poll()
+            if not self._first_frame_reported:
+                self.report_first_frame()
+            # animations run at the display refresh rate, game logic still only advances on input
+            self.frame_scheduler.tick(self.animating())
+
+        if self.profile_capture.active:
+            self.profile_capture.stop()
+        if self.latency.enabled:
+            self.latency.toggle()
+        if self.recorder:
+            self.recorder.close()
+        self.custom_loader.close()
+        self.custom_creator.close()
+        self.display.close()
         pygame.quit()
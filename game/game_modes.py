@@ -84,6 +84,7 @@ class Gameplay:
 
         self.selected_piece = None
         self.last_moved_piece = None
+        self.cell_moves = []
         self.turns = 1
         self.moves = 0
         self.zombies_captured = 0
@@ -134,6 +135,7 @@ class Gameplay:
         return self.board[i][j] and self.board[i][j][:2] == 'pK'
 
     def skip_turn(self):
+        self.cell_moves.clear()
         self.last_moved_piece = None
         self.turns += 1
         if self.move_wave() == TurnResult.CHECKMATE:
@@ -168,7 +170,9 @@ class Gameplay:
         return False
 
     def move_piece(self, start_row, start_col, end_row, end_col):
+        self.cell_moves.clear()
         if self.is_valid_move(start_row, start_col, end_row, end_col):
+            self.cell_moves.append((self.board[start_row][start_col], (start_row, start_col), (end_row, end_col)))
             if self.is_zombie(end_row, end_col):
                 self.zombies_captured += 1
 
@@ -205,10 +209,15 @@ class Gameplay:
             self.turns += 1
             self.moves += 1
             self.castling_combinations = None
+            rook = f'pr{castling_move[2]}'
+            king_col = start_col if self.board[start_row][start_col] == 'pK12' else end_col
+            rook_col = end_col if king_col == start_col else start_col
+            self.cell_moves.append(('pK12', (start_row, king_col), (start_row, castling_move[0])))
+            self.cell_moves.append((rook, (start_row, rook_col), (start_row, castling_move[1])))
             self.board[start_row][start_col] = None
             self.board[end_row][end_col] = None
             self.board[start_row][castling_move[0]] = 'pK12'
-            self.board[start_row][castling_move[1]] = f'pr{castling_move[2]}'
+            self.board[start_row][castling_move[1]] = rook
             if self.move_wave() == TurnResult.CHECKMATE:
                 return TurnResult.CHECKMATE
             if self.difficulty == Difficulty.EXTREME:
@@ -239,10 +248,16 @@ class Gameplay:
 
                 if result == TurnResult.CHECKMATE:
                     return TurnResult.CHECKMATE
+                self.record_zombie_move(i, j, pos)
                 moved_zombies.add(pos)
 
         return self.create_new_zombies(self.difficulty.roll_n())
 
+    def record_zombie_move(self, i, j, pos):
+        # zombies that infect or stay put keep their square, so only real moves are animated
+        if pos and self.board[i][j] is None:
+            self.cell_moves.append((self.board[pos[0]][pos[1]], (i, j), pos))
+
     def move_walker(self, i, j):
         captured = False
         if i + 1 == self.board_height or self.is_zombie(i + 1, j):  # down occupied, go right
@@ -563,6 +578,7 @@ class BlockTheBorder(Gameplay):
                     self.pieces_left -= 1
                 elif result == TurnResult.CHECKMATE:
                     return TurnResult.CHECKMATE
+                self.record_zombie_move(i, j, pos)
                 moved_zombies.add(pos)
 
         if self.pieces_left < 8:
@@ -667,6 +683,7 @@ class ClearTheBoard(BlockAndClear):
                     self.pieces_left -= 1
                 elif result == TurnResult.CHECKMATE:
                     return TurnResult.CHECKMATE
+                self.record_zombie_move(i, j, pos)
                 moved_zombies.add(pos)
 
         return TurnResult.OK
@@ -0,0 +1,82 @@
+import math
+import time
+
+
+class ListView:
+    def __init__(self, keys=(), duration=0.12):
+        self.keys = list(keys)
+        self.row_height = 1
+        self.view_height = 1
+        self.duration = duration
+        # offsets are in pixels from the top of the first row, scrolling eases from start_offset to target
+        self.offset = 0.0
+        self.target = 0.0
+        self.start_offset = 0.0
+        self.started = 0.0
+
+    def set_keys(self, keys):
+        self.keys = keys
+        self.clamp()
+
+    @property
+    def max_offset(self):
+        return max(0, len(self.keys) * self.row_height - self.view_height)
+
+    @property
+    def page_rows(self):
+        return max(1, int(self.view_height // self.row_height))
+
+    @property
+    def scrolling(self):
+        return self.offset != self.target
+
+    def resize(self, row_height, view_height):
+        if row_height == self.row_height and view_height == self.view_height:
+            return
+        # the row at the top of the view stays there when the rows change size
+        scale = row_height / self.row_height
+        self.offset *= scale
+        self.target *= scale
+        self.start_offset *= scale
+        self.row_height = row_height
+        self.view_height = view_height
+        self.clamp()
+
+    def clamp(self):
+        max_offset = self.max_offset
+        self.offset = min(max(0, self.offset), max_offset)
+        self.target = min(max(0, self.target), max_offset)
+
+    def scroll_to(self, offset, now=None, animate=True):
+        now = time.perf_counter() if now is None else now
+        self.update(now)
+        self.start_offset = self.offset
+        self.target = min(max(0, offset), self.max_offset)
+        self.started = now
+        if not animate:
+            self.offset = self.target
+
+    def scroll_by(self, pixels, now=None):
+        self.scroll_to(self.target + pixels, now)
+
+    def scroll_rows(self, rows, now=None):
+        self.scroll_by(rows * self.row_height, now)
+
+    def page(self, pages, now=None):
+        self.scroll_rows(pages * self.page_rows, now)
+
+    def update(self, now=None):
+        if not self.scrolling:
+            return
+        progress = ((time.perf_counter() if now is None else now) - self.started) / self.duration
+        if progress >= 1:
+            self.offset = self.target
+            return
+        progress = 1 - (1 - max(0.0, progress)) ** 2
+        self.offset = self.start_offset + (self.target - self.start_offset) * progress
+
+    def visible(self):
+        # only the rows that overlap the view, with the y of the first one relative to the top of the view
+        first = int(self.offset // self.row_height)
+        last = min(len(self.keys), math.ceil((self.offset + self.view_height) / self.row_height))
+        return first, first * self.row_height - self.offset, self.keys[first:last]
@@ -0,0 +1,233 @@
+import pygame
+
+import bisect
+import cProfile
+import functools
+import os
+import pstats
+import time
+from collections import deque
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class FrameProfiler:
+    SECTIONS = ('events', 'render', 'flip')
+
+    def __init__(self, window=120):
+        self.enabled = False
+        self.window = window
+        self.frame_starts = deque(maxlen=window)
+        self.frame_times = deque(maxlen=window)
+        self.state_samples = {}
+        self.current = dict.fromkeys(self.SECTIONS, 0.0)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        self.frame_starts.clear()
+        self.frame_times.clear()
+        self.state_samples.clear()
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_starts.append(time.perf_counter())
+            for section in self.SECTIONS:
+                self.current[section] = 0.0
+
+    def add(self, section, start):
+        if self.enabled:
+            self.current[section] += time.perf_counter() - start
+
+    def end_frame(self, state):
+        if not self.enabled:
+            return
+        frame_time = sum(self.current.values())
+        self.frame_times.append(frame_time)
+        samples = self.state_samples.get(state)
+        if samples is None:
+            samples = self.state_samples[state] = deque(maxlen=self.window)
+        samples.append((frame_time, *(self.current[section] for section in self.SECTIONS)))
+
+    def fps(self):
+        if len(self.frame_starts) < 2:
+            return 0.0
+        elapsed = self.frame_starts[-1] - self.frame_starts[0]
+        return (len(self.frame_starts) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def overlay_lines(self):
+        frame_times = self.frame_times
+        lines = [
+            f'FPS {self.fps():.1f}   frame p50 {percentile(frame_times, 50) * 1000:.2f} ms'
+            f'   p95 {percentile(frame_times, 95) * 1000:.2f} ms'
+            f'   p99 {percentile(frame_times, 99) * 1000:.2f} ms'
+        ]
+        for state, samples in self.state_samples.items():
+            averages = [sum(sample[i] for sample in samples) / len(samples) * 1000 for i in range(1, 4)]
+            p95 = percentile([sample[0] for sample in samples], 95) * 1000
+            sections = '   '.join(f'{section} {average:.2f}' for section, average in zip(self.SECTIONS, averages))
+            lines.append(f'{state.name}: {sections} ms   p95 {p95:.2f} ms   ({len(samples)} frames)')
+        return lines
+
+
+class ProfileCapture:
+    def __init__(self, duration=10, output_dir='profiles', top=30):
+        self.duration = duration
+        self.output_dir = output_dir
+        self.top = top
+        self.profile = None
+        self.started = 0.0
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def toggle(self):
+        if self.active:
+            return self.stop()
+        self.start()
+        return None
+
+    def start(self):
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.profile.enable()
+
+    def poll(self):
+        # captures end on their own so a hot path can be recorded without touching the keyboard again
+        if self.active and time.perf_counter() - self.started >= self.duration:
+            return self.stop()
+        return None
+
+    def stop(self):
+        profile, self.profile = self.profile, None
+        profile.disable()
+        elapsed = time.perf_counter() - self.started
+
+        name = time.strftime('%Y%m%d-%H%M%S')
+        stats_path = os.path.join(self.output_dir, name + '.pstats')
+        summary_path = os.path.join(self.output_dir, name + '.txt')
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profile.dump_stats(stats_path)
+            with open(summary_path, 'w') as file:
+                file.write(f'Captured {elapsed:.1f} s\n\n')
+                stats = pstats.Stats(profile, stream=file)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+                stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        except (IOError, OSError) as e:
+            print(f'Could not write profile {stats_path}: {e}')
+            return None
+        print(f'Profile written to {stats_path}')
+        return stats_path
+
+
+class LatencyTracer:
+    INPUT_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+                    pygame.MOUSEMOTION)
+    BUCKETS = (5, 10, 20, 50, 100, 200, 500)
+
+    def __init__(self, output_dir='profiles', window=1000):
+        self.enabled = False
+        self.output_dir = output_dir
+        self.window = window
+        self.current = None
+        self.pending = []
+        self.samples = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.samples.clear()
+            return None
+        self.current = None
+        self.pending.clear()
+        return self.write_report()
+
+    def watch(self, obj, *names):
+        # engine calls are wrapped on the instance, so they are timed inside whichever event triggered them
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, functools.partial(self.call, name, method))
+        return obj
+
+    def call(self, name, method, *args, **kwargs):
+        trace = self.current
+        if trace is None:
+            return method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            spans = trace['spans']
+            spans[name] = spans.get(name, 0.0) + time.perf_counter() - start
+
+    def begin_event(self, event, state):
+        if self.enabled and event.type in self.INPUT_EVENTS:
+            self.current = {'key': (pygame.event.event_name(event.type), state.name),
+                            'dequeued': time.perf_counter(), 'handled': 0.0, 'spans': {}}
+
+    def end_event(self):
+        trace = self.current
+        if trace is not None:
+            trace['handled'] = time.perf_counter()
+            self.pending.append(trace)
+            self.current = None
+
+    def frame_flipped(self):
+        if not self.pending:
+            return
+        flipped = time.perf_counter()
+        for trace in self.pending:
+            samples = self.samples.get(trace['key'])
+            if samples is None:
+                samples = self.samples[trace['key']] = deque(maxlen=self.window)
+            samples.append((flipped - trace['dequeued'], trace['handled'] - trace['dequeued'], trace['spans']))
+        self.pending.clear()
+
+    def histogram(self, latencies):
+        counts = [0] * (len(self.BUCKETS) + 1)
+        for latency in latencies:
+            counts[bisect.bisect_left(self.BUCKETS, latency * 1000)] += 1
+        return counts
+
+    def report_lines(self):
+        labels = [f'<={bucket}' for bucket in self.BUCKETS] + [f'>{self.BUCKETS[-1]}']
+        lines = []
+        for (event_type, state), samples in sorted(self.samples.items()):
+            latencies = [sample[0] for sample in samples]
+            handled = sum(sample[1] for sample in samples) / len(samples) * 1000
+            span_totals = {}
+            for sample in samples:
+                for name, duration in sample[2].items():
+                    span_totals[name] = span_totals.get(name, 0.0) + duration
+            spans = ''.join(f'   {name} {total / len(samples) * 1000:.2f}' for name, total in span_totals.items())
+
+            lines.append(f'{event_type} in {state}: {len(samples)} events   p50 {percentile(latencies, 50) * 1000:.2f}'
+                         f'   p95 {percentile(latencies, 95) * 1000:.2f}   max {max(latencies) * 1000:.2f} ms')
+            lines.append(f'    avg handler {handled:.2f}{spans} ms')
+            counts = self.histogram(latencies)
+            lines.append('    ' + '  '.join(f'{label} ms: {count}' for label, count in zip(labels, counts)))
+        return lines
+
+    def write_report(self):
+        if not self.samples:
+            return None
+        path = os.path.join(self.output_dir, time.strftime('latency-%Y%m%d-%H%M%S.txt'))
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path, 'w') as file:
+                file.write('\n'.join(self.report_lines()) + '\n')
+        except (IOError, OSError) as e:
+            print(f'Could not write latency report {path}: {e}')
+            return None
+        print(f'Latency report written to {path}')
+        return path
@@ -0,0 +1,80 @@
+import pygame
+
+import json
+import time
+
+FORMAT_VERSION = 1
+
+
+def event_to_record(event, t, frame):
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (bool, int, float, str, list)):
+            attrs[name] = value
+    return {'t': round(t, 6), 'frame': frame, 'type': event.type, 'name': pygame.event.event_name(event.type),
+            'attrs': attrs}
+
+
+def record_to_event(record):
+    attrs = {name: tuple(value) if isinstance(value, list) else value for name, value in record['attrs'].items()}
+    return pygame.event.Event(record['type'], **attrs)
+
+
+class InputRecorder:
+    def __init__(self, path, seed, screen_size, fullscreen):
+        self.path = path
+        self.file = open(path, 'w')
+        self.started = time.perf_counter()
+        self.frame = 0
+        self.write({'version': FORMAT_VERSION, 'seed': seed, 'screen_size': list(screen_size),
+                    'fullscreen': fullscreen})
+
+    def write(self, data):
+        self.file.write(json.dumps(data) + '\n')
+
+    def record(self, events):
+        # called once per frame with the coalesced events, so frame numbers match what the handlers saw
+        t = time.perf_counter() - self.started
+        for event in events:
+            self.write(event_to_record(event, t, self.frame))
+        self.frame += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            print(f'Input recording written to {self.path}')
+
+
+class Recording:
+    def __init__(self, header, frames):
+        self.header = header
+        self.frames = frames
+
+    @property
+    def seed(self):
+        return self.header['seed']
+
+    @property
+    def screen_size(self):
+        return tuple(self.header['screen_size'])
+
+    @property
+    def event_count(self):
+        return sum(len(events) for _, _, events in self.frames)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            lines = [json.loads(line) for line in file if line.strip()]
+        if not lines or lines[0].get('version') != FORMAT_VERSION:
+            raise ValueError(f'{path} is not an input recording')
+
+        # frames without input are not stored, only the ones that dispatched events
+        frames = []
+        for record in lines[1:]:
+            if not frames or frames[-1][0] != record['frame']:
+                frames.append((record['frame'], record['t'], []))
+            frames[-1][2].append(record_to_event(record))
+        return cls(lines[0], frames)
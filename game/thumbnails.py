@@ -0,0 +1,140 @@
+import pygame
+
+import hashlib
+import json
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoardThumbnails:
+    def __init__(self, assets, colors, max_items=256, max_pending=64, max_workers=2):
+        self.assets = assets
+        self.colors = colors
+        self.max_items = max_items
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        # (gm_id, box) -> (game, surface or None), the game object is replaced when its file changes
+        self.thumbnails = OrderedDict()
+        self.pending = {}
+        self.scaled_pieces = {}
+        self._executor = None
+        self._results = queue.SimpleQueue()
+
+    @staticmethod
+    def square_size(board_height, box):
+        return max(1, box // max(8, board_height))
+
+    def board_hash(self, board):
+        # the same board drawn with the same pieces gives the same picture, whichever game it belongs to
+        content = json.dumps([board, self.assets.pieces_hash, self.colors], separators=(',', ':'))
+        return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+    def get(self, gm_id, game, box, board_reader):
+        key = (gm_id, box)
+        entry = self.thumbnails.get(key)
+        if entry is not None and entry[0] is game:
+            self.thumbnails.move_to_end(key)
+            return entry[1]
+        if self.assets.pieces_hash is None:
+            # piece images are still being decoded, drawing now would cache boards without pieces
+            return None
+        pending = self.pending.get(key)
+        if pending is None or pending[0] is not game:
+            self.request(key, game, board_reader(gm_id))
+        return None
+
+    def request(self, key, game, read_board):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='thumbnails')
+        old = self.pending.pop(key, None)
+        if old is not None:
+            old[1].cancel()
+        future = self._executor.submit(self.render, key, game, read_board, self.assets.source_images,
+                                       self.assets.pixel_format)
+        self.pending[key] = (game, future)
+        # rows that were scrolled past give up their place to the ones on screen now
+        for old_key in list(self.pending):
+            if len(self.pending) <= self.max_pending:
+                break
+            if self.pending[old_key][1].cancel():
+                del self.pending[old_key]
+
+    def render(self, key, game, read_board, pieces, pixel_format):
+        surface = None
+        try:
+            board = read_board()
+            if board is not None:
+                surface = self.load_or_draw(board, game.board_height, key[1], pieces, pixel_format)
+        except (ValueError, pygame.error) as e:
+            print(f'Could not draw the board of {key[0]}: {e}')
+        self._results.put((key, game, surface))
+
+    def load_or_draw(self, board, board_height, box, pieces, pixel_format):
+        square_size = self.square_size(board_height, box)
+        size = (8 * square_size, board_height * square_size)
+        path = self.assets.cache_path('thumbnail', self.board_hash(board), size, pixel_format)
+        surface = self.assets.read_cached(path, size, pixel_format)
+        if surface is None:
+            surface = self.draw(board, board_height, square_size, pieces)
+            self.assets.write_cached(path, surface, pixel_format)
+        return surface
+
+    def draw(self, board, board_height, square_size, pieces):
+        surface = pygame.Surface((8 * square_size, board_height * square_size))
+        inset = square_size // 8
+        piece_size = square_size - 2 * inset
+        for row in range(board_height):
+            for col in range(8):
+                x, y = col * square_size, row * square_size
+                surface.fill(self.colors[(row + col) % 2], (x, y, square_size, square_size))
+                piece = board[row][col]
+                if piece and piece_size > 0:
+                    image = self.scaled_piece(pieces, piece[:2], piece_size)
+                    if image is not None:
+                        surface.blit(image, (x + inset, y + inset))
+        return surface
+
+    def scaled_piece(self, pieces, name, size):
+        key = (name, size)
+        image = self.scaled_pieces.get(key)
+        if image is None:
+            source = pieces.get(name)
+            if source is None:
+                return None
+            # averaging keeps a few pixel wide piece recognisable, plain scaling would only pick single pixels
+            image = pygame.transform.smoothscale(source, (size, size))
+            self.scaled_pieces[key] = image
+        return image
+
+    def poll(self):
+        # finished thumbnails are converted and stored here, on the main thread, the frame draws them right away
+        arrived = False
+        while True:
+            try:
+                key, game, surface = self._results.get_nowait()
+            except queue.Empty:
+                return arrived
+            pending = self.pending.get(key)
+            if pending is None or pending[0] is not game:
+                continue
+            del self.pending[key]
+            if surface is not None and pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self.thumbnails[key] = (game, surface)
+            if len(self.thumbnails) > self.max_items:
+                self.thumbnails.popitem(last=False)
+            arrived = True
+
+    def clear(self):
+        self.thumbnails.clear()
+        self.scaled_pieces.clear()
+        for _, future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+    def close(self):
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -1,8 +1,25 @@
+import argparse
+
 from game.game import Game
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Pawnbies')
+    parser.add_argument('--fps-cap', type=int, default=0, help='upper frame rate limit, 0 for the display refresh rate')
+    parser.add_argument('--idle-fps', type=int, default=20, help='frame rate while nothing is animating')
+    parser.add_argument('--vsync', action='store_true',
+                        help='wait for the vertical blank, opens a SCALED window with the surface renderer')
+    parser.add_argument('--renderer', choices=('surface', 'texture'), default='surface',
+                        help='draw with software surface blits or with SDL renderer textures')
+    parser.add_argument('--record', metavar='FILE', help='record the input events of this session for playback')
+    parser.add_argument('--seed', type=int, help='random seed, recorded sessions store the one they used')
+    return parser.parse_args()
+
+
 def main():
-    game = Game()
+    args = parse_args()
+    game = Game(idle_fps=args.idle_fps, fps_cap=args.fps_cap, vsync=args.vsync, renderer=args.renderer,
+                seed=args.seed, record=args.record)
     game.run()
 
 
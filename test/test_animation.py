@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from game.animation import MoveAnimator
+
+
+class TestMoveAnimator(TestCase):
+    def setUp(self):
+        self.animator = MoveAnimator(duration=1.0)
+        self.animator.start([('pp4', (6, 4), (4, 4)), ('zw', (2, 3), (3, 3))], now=10.0)
+
+    def test_destinations_are_hidden(self):
+        self.assertTrue(self.animator.active)
+        self.assertEqual(self.animator.hidden, {(4, 4), (3, 3)})
+
+    def test_zombies_move_after_player(self):
+        player, zombie = self.animator.sprites(now=10.5)
+        self.assertEqual(player[0], 'pp4')
+        self.assertAlmostEqual(player[1], 4.5)
+        self.assertEqual(zombie, ('zw', 2, 3))
+
+        player, zombie = self.animator.sprites(now=12.0)
+        self.assertEqual(player, ('pp4', 4, 4))
+        self.assertEqual(zombie, ('zw', 3, 3))
+
+    def test_update_stops_after_last_phase(self):
+        self.animator.update(now=11.5)
+        self.assertTrue(self.animator.active)
+
+        self.animator.update(now=12.0)
+        self.assertFalse(self.animator.active)
+        self.assertEqual(self.animator.hidden, set())
+
+    def test_zombie_only_wave(self):
+        self.animator.start([('zw', (2, 3), (3, 3))], now=0.0)
+        self.assertEqual(next(self.animator.sprites(now=1.0)), ('zw', 3, 3))
+        self.animator.update(now=0.5)
+        self.assertTrue(self.animator.active)
+        self.animator.update(now=1.0)
+        self.assertFalse(self.animator.active)
@@ -0,0 +1,124 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+import pygame
+
+from game import assets as assets_module
+from game.assets import AssetManager
+
+
+class TestAssetManager(TestCase):
+    def setUp(self):
+        self.assets = AssetManager()
+        for name, color in (('pK', (255, 0, 0, 255)), ('zw', (0, 255, 0, 255))):
+            image = pygame.Surface((64, 64), pygame.SRCALPHA)
+            image.fill(color)
+            self.assets.source_images[name] = image
+        self.assets.convert()
+
+    def test_piece_name(self):
+        self.assertEqual(AssetManager.piece_name('King'), 'pK')
+        self.assertEqual(AssetManager.piece_name('knight'), 'pk')
+        self.assertEqual(AssetManager.piece_name('zombie_exploding'), 'ze')
+
+    def test_atlas_packs_all_pieces_per_size(self):
+        surface, rects = self.assets.get_atlas(16)
+
+        self.assertEqual(surface.get_size(), (32, 16))
+        self.assertEqual(set(rects), {'pK', 'zw'})
+        self.assertEqual(surface.get_at(rects['pK'].center), (255, 0, 0, 255))
+        self.assertEqual(surface.get_at(rects['zw'].center), (0, 255, 0, 255))
+        self.assertIs(self.assets.get_atlas(16)[0], surface)
+
+    def test_convert_drops_atlases(self):
+        self.assets.get_atlas(16)
+        self.assets.convert()
+        self.assertEqual(self.assets.atlases, {})
+
+    def test_blit_piece(self):
+        target = MagicMock()
+        surface, rects = self.assets.get_atlas(16)
+
+        self.assets.blit_piece(target, 'zw', 16, (5, 5))
+        target.blit.assert_called_once_with(surface, (5, 5), rects['zw'])
+
+        target.reset_mock()
+        self.assets.blit_piece(target, 'zx', 16, (5, 5))
+        target.blit.assert_not_called()
+
+    def test_atlas_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assets.cache_dir = cache_dir
+            self.assets.pieces_hash = 'abc'
+            surface, _ = self.assets.get_atlas(16)
+            self.assertEqual(os.listdir(cache_dir), [f'atlas-abc-32x16-{self.assets.pixel_format}.raw'])
+
+            assets = AssetManager(cache_dir=cache_dir)
+            assets.source_images = self.assets.source_images
+            assets.pieces_hash = 'abc'
+            assets.convert()
+            with patch('pygame.transform.scale') as mock_scale:
+                cached_surface, rects = assets.get_atlas(16)
+
+            mock_scale.assert_not_called()
+            self.assertEqual(cached_surface.get_at(rects['zw'].center), (0, 255, 0, 255))
+
+    def test_read_background_uses_disk_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image = pygame.Surface((8, 8))
+            image.fill((10, 20, 30))
+            pygame.image.save(image, os.path.join(temp_dir, 'bg.png'))
+            assets = AssetManager(backgrounds_dir=temp_dir, cache_dir=os.path.join(temp_dir, 'cache'))
+
+            background = assets.read_background('bg.png', (16, 16), 'RGBA')
+            self.assertEqual(len(os.listdir(assets.cache_dir)), 1)
+
+            with patch('pygame.transform.scale') as mock_scale:
+                cached_background = assets.read_background('bg.png', (16, 16), 'RGBA')
+
+            mock_scale.assert_not_called()
+            self.assertEqual(cached_background.get_size(), (16, 16))
+            self.assertEqual(cached_background.get_at((3, 3)), background.get_at((3, 3)))
+
+    def test_cache_is_anchored_to_the_game_directory(self):
+        game_dir = os.path.dirname(os.path.dirname(os.path.abspath(assets_module.__file__)))
+        self.assertEqual(AssetManager().cache_dir, os.path.join(game_dir, 'cache'))
+
+    def test_least_recently_used_files_are_swept(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # every 4x4 file holds 64 bytes, three of them fit
+            assets = AssetManager(cache_dir=cache_dir, max_cache_bytes=200)
+            surface = pygame.Surface((4, 4))
+            paths = [assets.cache_path('thumbnail', str(i), (4, 4), 'RGBA') for i in range(4)]
+            for i, path in enumerate(paths[:3]):
+                assets.write_cached(path, surface, 'RGBA')
+                os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+
+            # reading the oldest file makes it the most recently used one
+            self.assertIsNotNone(assets.read_cached(paths[0], (4, 4), 'RGBA'))
+            assets.write_cached(paths[3], surface, 'RGBA')
+
+            self.assertEqual(sorted(os.listdir(cache_dir)), sorted(os.path.basename(path) for path in
+                                                                   (paths[0], paths[2], paths[3])))
+
+    def test_atlases_of_old_piece_images_are_dropped(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assets.cache_dir = cache_dir
+            self.assets.pieces_hash = 'old'
+            self.assets.get_atlas(16)
+            self.assets.pieces_hash = 'new'
+            self.assets.atlases.clear()
+            self.assets.get_atlas(16)
+            self.assertEqual(os.listdir(cache_dir), [f'atlas-new-32x16-{self.assets.pixel_format}.raw'])
+
+    def test_background_is_cached_in_the_format_it_was_asked_for(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pygame.image.save(pygame.Surface((8, 8)), os.path.join(temp_dir, 'bg.png'))
+            assets = AssetManager(pieces_dir=temp_dir, backgrounds_dir=temp_dir,
+                                  cache_dir=os.path.join(temp_dir, 'cache'))
+            assets.pixel_format = 'RGBA'
+            assets.read_all('bg.png', (16, 16), (), 'BGRA')
+            (name,) = os.listdir(assets.cache_dir)
+            self.assertTrue(name.startswith('background-') and name.endswith('-16x16-BGRA.raw'))
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from game.board_layer import BoardLayer
+
+
+class TestBoardLayer(TestCase):
+    def setUp(self):
+        self.layer = BoardLayer(4, 8, 20, ((255, 215, 175), (205, 132, 55)), (0, 162, 232, 128))
+        self.board = [[None for _ in range(8)] for _ in range(4)]
+        self.board[3][4] = 'pK12'
+        self.assets = MagicMock()
+
+    def test_first_update_draws_every_square(self):
+        self.layer.draw_square = MagicMock()
+        self.layer.update(self.board, self.assets)
+        self.assertEqual(self.layer.draw_square.call_count, 32)
+
+    def test_update_redraws_only_changed_squares(self):
+        self.layer.update(self.board, self.assets)
+        self.layer.draw_square = MagicMock()
+
+        self.board[2][4] = self.board[3][4]
+        self.board[3][4] = None
+        self.layer.update(self.board, self.assets)
+
+        redrawn = {(args[0], args[1]) for args, _ in self.layer.draw_square.call_args_list}
+        self.assertEqual(redrawn, {(2, 4), (3, 4)})
+
+    def test_selection_change_redraws_old_and_new_square(self):
+        self.layer.update(self.board, self.assets, (3, 4))
+        self.assertEqual(self.layer.surface.get_at((4 * 20, 3 * 20))[:3], (0, 162, 232))
+        self.layer.draw_square = MagicMock()
+
+        self.layer.update(self.board, self.assets, (0, 0))
+
+        redrawn = {(args[0], args[1]) for args, _ in self.layer.draw_square.call_args_list}
+        self.assertEqual(redrawn, {(3, 4), (0, 0)})
+
+    def test_hidden_squares_are_drawn_empty(self):
+        self.layer.update(self.board, self.assets, hidden={(3, 4)})
+        self.assertIsNone(self.layer.cells[3][4])
+        self.layer.draw_square = MagicMock()
+
+        self.layer.update(self.board, self.assets)
+
+        self.layer.draw_square.assert_called_once_with(3, 4, 'pK12', self.assets)
+
+    def test_blit_viewport(self):
+        self.layer.update(self.board, self.assets)
+        target = MagicMock()
+
+        self.layer.blit(target, 10, 20, 2, 4)
+
+        target.blit.assert_called_once_with(self.layer.surface, (10, 20), (0, 40, 160, 40))
@@ -0,0 +1,65 @@
+import os
+from unittest import TestCase
+
+import pygame
+
+from game.canvas import SurfaceCanvas, TextureCanvas
+
+
+class TestTextureCanvas(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        cls.canvas = TextureCanvas.open('test', (64, 48), accelerated=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.canvas.window.destroy()
+        pygame.display.quit()
+
+    def setUp(self):
+        self.surface_canvas = SurfaceCanvas(pygame.Surface((64, 48)))
+        self.surface_canvas.fill((0, 0, 0))
+        self.canvas.set_clip(None)
+        self.canvas.fill((0, 0, 0))
+
+    def frame(self):
+        return pygame.image.tobytes(self.canvas.renderer.to_surface(), 'RGB')
+
+    def assert_same_frame(self):
+        self.assertEqual(self.frame(), pygame.image.tobytes(self.surface_canvas.surface, 'RGB'))
+
+    def test_shapes_match_surface_drawing(self):
+        for canvas in (self.canvas, self.surface_canvas):
+            canvas.rect((255, 244, 108), (4, 4, 30, 20), border_radius=6)
+            canvas.rect((153, 90, 32), (4, 4, 30, 20), 2, border_radius=6)
+            canvas.rect((0, 162, 232, 128), (40, 4, 10, 10))
+            canvas.line((223, 178, 110), (2, 40), (60, 40), 3)
+        self.assert_same_frame()
+
+    def test_blit_respects_clip_and_area(self):
+        source = pygame.Surface((20, 20))
+        source.fill((255, 0, 0), (0, 0, 10, 20))
+        source.fill((0, 255, 0), (10, 0, 10, 20))
+        for canvas in (self.canvas, self.surface_canvas):
+            canvas.set_clip((5, 5, 20, 20))
+            canvas.blit(source, (0, 0))
+            canvas.blit(source, (30, 0), (10, 0, 10, 20))
+            canvas.set_clip(None)
+            canvas.blit(source, (40, 20), (10, 5, 10, 10))
+        self.assert_same_frame()
+
+    def test_textures_are_cached_until_invalidated(self):
+        source = pygame.Surface((4, 4))
+        texture = self.canvas.get_texture(source)
+        self.assertIs(self.canvas.get_texture(source), texture)
+
+        self.canvas.invalidate(source)
+        self.assertIsNot(self.canvas.get_texture(source), texture)
+
+    def test_snapshot(self):
+        self.canvas.fill((10, 20, 30), (0, 0, 8, 8))
+        target = pygame.Surface((64, 48))
+        self.canvas.snapshot(target)
+        self.assertEqual(target.get_at((4, 4))[:3], (10, 20, 30))
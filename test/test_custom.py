@@ -1,8 +1,12 @@
 import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 from unittest.mock import patch, mock_open, MagicMock
 
-from game.custom import CustomGame, CustomGameLoader, CustomGameCreator
+from game.custom import CustomGame, CustomGameLoader, CustomGameCreator, CustomGameFilter, main
+from game.custom_format import write_bundle
 from game.game_modes import GameMode, Difficulty
 
 
@@ -151,20 +155,30 @@ class TestCustomGameCreator(TestCase):
         self.creator.check_name()
         self.assertFalse(self.creator.is_name_ok)
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.dump')
-    @patch('random.choices', return_value=['a', 'b', 'c', 'd', '1', '2', '3', '4', '5', '6'])
-    def test_save(self, mock_random_choices, mock_json_dump, mock_file_open):
+    def saved_files(self):
+        return sorted(f for f in os.listdir('custom_gm') if f.endswith('.json'))
+
+    def in_temp_dir(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(temp_dir.name)
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_save(self):
+        self.in_temp_dir()
         self.creator.game.board[0][0] = 'pK'
         self.creator.game.board[0][1] = 'pq'
         self.creator.game.name = 'Test Mode'
 
         self.creator.save()
 
-        mock_file_open.assert_called_once_with('custom_gm/abcd123456.json', 'w')
-
-        args, _ = mock_json_dump.call_args
-        data = args[0]
+        self.assertIsNone(self.creator.error_msg)
+        files = self.saved_files()
+        self.assertEqual(len(files), 1)
+        self.assertEqual(os.listdir('custom_gm'), files)
+        with open(os.path.join('custom_gm', files[0])) as file:
+            data = json.load(file)
 
         self.assertEqual(data['name'], 'Test Mode')
         self.assertEqual(data['board_height'], 8)
@@ -172,9 +186,36 @@ class TestCustomGameCreator(TestCase):
         self.assertTrue(data['can_change_difficulty'])
         self.assertEqual(data['base_gm'], 'Clear The Board')
         self.assertEqual(data['difficulty'], 'Easy')
+        self.assertEqual(data['board'][0][:2], ['pK0', 'pq1'])
+        self.assertEqual(self.creator.game.board[0][:2], ['pK', 'pq'])
+        self.assertEqual(files[0], f'{CustomGameCreator.content_hash(data)[:16]}.json')
+
+    def test_save_detects_duplicates(self):
+        self.in_temp_dir()
+        self.creator.game.board[0][0] = 'pK'
+        self.creator.game.name = 'First'
+        self.creator.save()
+
+        self.creator.game.name = 'Second'
+        self.creator.save()
+        self.assertEqual(self.creator.error_msg, 'This game mode is already saved')
 
-        self.assertTrue(data['board'][0][0].startswith('pK'))
-        self.assertTrue(data['board'][0][1].startswith('pq'))
+        self.creator.game.board[1][1] = 'zw'
+        self.creator.save()
+        self.assertIsNone(self.creator.error_msg)
+        self.assertEqual(len(self.saved_files()), 2)
+
+    def test_save_in_background(self):
+        self.in_temp_dir()
+        self.creator.game.board[0][0] = 'pK'
+        self.creator.game.name = 'Background'
+
+        self.creator.save_in_background()
+        self.creator.close()
+
+        self.assertFalse(self.creator.saving)
+        self.assertIsNone(self.creator.error_msg)
+        self.assertEqual(len(self.saved_files()), 1)
 
     @patch('builtins.open', side_effect=Exception('Test exception'))
     def test_save_exception(self, mock_open):
@@ -182,6 +223,37 @@ class TestCustomGameCreator(TestCase):
         self.assertEqual(self.creator.error_msg, 'Test exception')
 
 
+class TestCustomGameFilter(TestCase):
+    def setUp(self):
+        self.filter = CustomGameFilter()
+
+    def test_switches_cycle_back_to_any(self):
+        self.filter.switch_base_gm()
+        self.assertEqual(self.filter.base_gm, list(GameMode)[0])
+        for _ in range(len(GameMode)):
+            self.filter.switch_base_gm()
+        self.assertIsNone(self.filter.base_gm)
+
+        self.filter.switch_board_height()
+        self.filter.switch_board_height()
+        self.assertEqual(self.filter.board_height, 7)
+        self.filter.switch_difficulty()
+        self.assertEqual(self.filter.key, ('', None, list(Difficulty)[0], 7))
+
+    def test_text_and_reset(self):
+        self.filter.add_text('a' * 29)
+        self.filter.add_text('bc')
+        self.filter.add_text('b')
+        self.filter.rm_char()
+        self.filter.input_focused = True
+        self.assertEqual(self.filter.text, 'a' * 29)
+
+        self.filter.switch_difficulty()
+        self.filter.reset()
+        self.assertEqual(self.filter.key, ('', None, None, None))
+        self.assertFalse(self.filter.input_focused)
+
+
 class TestCustomGameLoader(TestCase):
     def setUp(self):
         self.loader = CustomGameLoader()
@@ -404,3 +476,300 @@ class TestCustomGameLoader(TestCase):
 
         self.assertFalse(result)
         self.assertIn('Error reading .json file', self.loader.error_msg)
+
+
+class TestCustomGameLoaderDirectory(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        os.makedirs('custom_gm')
+        self.loader = CustomGameLoader(max_workers=4)
+
+    def tearDown(self):
+        self.loader.close()
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def write(self, gm_id, data):
+        with open(os.path.join('custom_gm', f'{gm_id}.json'), 'w') as file:
+            file.write(data if isinstance(data, str) else json.dumps(data))
+
+    def valid_data(self, name):
+        return {
+            'name': name,
+            'board_height': 8,
+            'base_gm': str(GameMode.BLOCK_THE_BORDER),
+            'difficulty': 'Easy',
+            'board': [[None for _ in range(8)] for _ in range(8)],
+            'can_change_gm': True,
+            'can_change_difficulty': True
+        }
+
+    def test_get_all_collects_every_error(self):
+        for i in range(20):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        self.write('broken', '{')
+        self.write('incomplete', {'board_height': 8})
+        self.write('not_an_object', '5')
+
+        result = self.loader.get_all()
+
+        self.assertFalse(result)
+        self.assertEqual(len(self.loader.game_modes), 20)
+        self.assertEqual(self.loader.game_modes['gm7'].name, 'Game 7')
+        self.assertEqual(set(self.loader.errors), {'broken.json', 'incomplete.json', 'not_an_object.json'})
+        self.assertIn("'base_gm' field is required", self.loader.errors['incomplete.json'])
+        self.assertIn('and 2 more', self.loader.error_msg)
+        self.assertEqual(self.loader.progress, (23, 23))
+        self.assertFalse(self.loader.loading)
+
+    def test_results_arrive_through_poll(self):
+        for i in range(5):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+
+        self.loader.start()
+        self.assertTrue(self.loader.loading)
+        self.assertEqual(self.loader.progress, (0, 5))
+        self.loader.wait_until_loaded()
+        self.assertEqual(self.loader.game_modes, {})
+
+        self.assertTrue(self.loader.poll())
+        self.assertEqual(len(self.loader.game_modes), 5)
+        self.assertIsNone(self.loader.poll())
+
+    def test_empty_directory_finishes_on_first_poll(self):
+        self.loader.start()
+        self.assertTrue(self.loader.poll())
+        self.assertFalse(self.loader.loading)
+
+    def indexed_loader(self):
+        loader = CustomGameLoader(max_workers=2, index_path=os.path.join('custom_gm', 'index.sqlite3'))
+        self.addCleanup(loader.close)
+        return loader
+
+    def test_index_skips_unchanged_files(self):
+        for i in range(3):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        self.assertTrue(self.indexed_loader().get_all())
+
+        changed = self.valid_data('Changed')
+        changed['board_height'] = 10
+        changed['board'] = [[None for _ in range(8)] for _ in range(10)]
+        self.write('gm1', changed)
+        os.remove(os.path.join('custom_gm', 'gm2.json'))
+
+        loader = self.indexed_loader()
+        with patch.object(CustomGameLoader, 'read_gm_json', wraps=CustomGameLoader.read_gm_json) as read_gm_json:
+            self.assertTrue(loader.get_all())
+
+        read_gm_json.assert_called_once()
+        self.assertEqual(read_gm_json.call_args.args[0], 'gm1.json')
+        self.assertEqual(set(loader.game_modes), {'gm0', 'gm1'})
+        self.assertEqual(loader.get_board('gm0'), self.valid_data('')['board'])
+        self.assertEqual(loader.game_modes['gm1'].board_height, 10)
+        self.assertEqual(set(loader.index.entries()), {'gm0.json', 'gm1.json'})
+
+    def test_search_follows_catalog_changes(self):
+        for i, name in enumerate(('Zombie Rush', 'Last Stand', 'Rush Hour')):
+            self.write(f'gm{i}', self.valid_data(name))
+        self.loader.watch()
+        self.loader.get_all()
+        version = self.loader.version
+
+        self.assertEqual(list(self.loader.search('rush')), ['gm2', 'gm0'])
+        self.assertEqual(list(self.loader.search(board_height=10)), [])
+
+        self.write('gm1', self.valid_data('Rush of Blood'))
+        os.remove(os.path.join('custom_gm', 'gm0.json'))
+        self.finish_batch(self.loader)
+
+        self.assertGreater(self.loader.version, version)
+        self.assertEqual(list(self.loader.search('rush')), ['gm2', 'gm1'])
+        self.assertEqual(list(self.loader.search('zombie')), [])
+        self.assertEqual(list(self.loader.search(base_gm=GameMode.BLOCK_THE_BORDER)), ['gm2', 'gm1'])
+
+    def test_unusable_index_falls_back_to_files(self):
+        os.makedirs(os.path.join('custom_gm', 'index.sqlite3'))
+        self.write('gm0', self.valid_data('Game'))
+        loader = self.indexed_loader()
+
+        with patch('builtins.print'):
+            self.assertTrue(loader.get_all())
+
+        self.assertIsNone(loader.index)
+        self.assertIn('gm0', loader.game_modes)
+
+    def test_any_failure_still_finishes_the_batch(self):
+        self.write('gm0', self.valid_data('Game'))
+        # json gives up on deep nesting with a RecursionError
+        self.write('deep', '[' * 200000)
+
+        self.assertFalse(self.loader.get_all())
+        self.assertFalse(self.loader.loading)
+        self.assertEqual(self.loader.progress, (2, 2))
+        self.assertEqual(set(self.loader.errors), {'deep.json'})
+
+        self.write('gm1', self.valid_data('New'))
+        self.assertFalse(self.loader.get_all())
+        self.assertIn('gm1', self.loader.game_modes)
+
+    def test_broken_index_row_is_read_from_the_file(self):
+        self.write('gm0', self.valid_data('Game'))
+        self.assertTrue(self.indexed_loader().get_all())
+
+        loader = self.indexed_loader()
+        loader.open_index().connection.execute("UPDATE games SET base_gm = 'Nope'")
+        self.assertTrue(loader.get_all())
+        self.assertEqual(loader.game_modes['gm0'].base_gm, GameMode.BLOCK_THE_BORDER)
+
+    def test_boards_load_on_selection(self):
+        for i in range(4):
+            data = self.valid_data(f'Game {i}')
+            data['board'][7][i] = 'pK0'
+            self.write(f'gm{i}', data)
+        loader = CustomGameLoader(max_boards=2)
+        self.addCleanup(loader.close)
+        loader.get_all()
+
+        self.assertTrue(all(game.board is None for game in loader.game_modes.values()))
+        for i in range(4):
+            self.assertTrue(loader.select_gm(f'gm{i}'))
+            self.assertEqual(loader.selected_gm[1].board[7][i], 'pK0')
+        self.assertEqual(list(loader._boards), ['gm2', 'gm3'])
+        self.assertEqual([gm_id for gm_id, game in loader.game_modes.items() if game.board], ['gm3'])
+
+        loader.unselect_gm()
+        self.assertIsNone(loader.game_modes['gm3'].board)
+
+    def test_unselecting_drops_an_evicted_board(self):
+        for i in range(3):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        loader = CustomGameLoader(max_workers=2, max_boards=1)
+        self.addCleanup(loader.close)
+        loader.get_all()
+
+        loader.select_gm('gm0')
+        loader.get_board('gm1')
+        self.assertNotIn('gm0', loader._boards)
+        loader.unselect_gm()
+        self.assertTrue(all(game.board is None for game in loader.game_modes.values()))
+
+    def test_selecting_a_removed_game_fails(self):
+        self.write('gm0', self.valid_data('Game'))
+        self.loader.get_all()
+        os.remove(os.path.join('custom_gm', 'gm0.json'))
+
+        self.assertFalse(self.loader.select_gm('gm0'))
+        self.assertIn('gm0.json', self.loader.error_msg)
+
+    def finish_batch(self, loader):
+        loader.poll()
+        loader.wait_until_loaded()
+        return loader.poll()
+
+    def test_watcher_applies_changes_incrementally(self):
+        for i in range(3):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        self.loader.watch()
+        self.loader.get_all()
+        self.loader.select_gm('gm1')
+
+        self.write('gm1', self.valid_data('Renamed'))
+        self.write('gm3', self.valid_data('New'))
+        self.write('gm4', '{')
+        os.remove(os.path.join('custom_gm', 'gm0.json'))
+        with patch.object(CustomGameLoader, 'read_gm_json', wraps=CustomGameLoader.read_gm_json) as read_gm_json:
+            self.assertIsNone(self.finish_batch(self.loader))
+
+        self.assertEqual(sorted(call.args[0] for call in read_gm_json.call_args_list), ['gm1.json', 'gm3.json'])
+        self.assertEqual(sorted(self.loader.game_modes), ['gm1', 'gm2', 'gm3'])
+        self.assertEqual(self.loader.game_modes['gm1'].name, 'Renamed')
+        self.assertEqual(self.loader.selected_gm[1].name, 'Renamed')
+        self.assertIsNotNone(self.loader.selected_gm[1].board)
+        self.assertEqual(set(self.loader.errors), {'gm4.json'})
+
+        self.write('gm4', self.valid_data('Fixed'))
+        self.finish_batch(self.loader)
+        self.assertEqual(self.loader.errors, {})
+        self.assertEqual(self.loader.game_modes['gm4'].name, 'Fixed')
+
+    def test_refresh_only_reads_new_files_and_drops_deleted_ones(self):
+        for i in range(2):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        self.loader.get_all()
+        self.write('gm2', self.valid_data('New'))
+        os.remove(os.path.join('custom_gm', 'gm0.json'))
+
+        with patch.object(CustomGameLoader, 'read_gm_json', wraps=CustomGameLoader.read_gm_json) as read_gm_json:
+            self.assertTrue(self.loader.get_all())
+
+        self.assertEqual([call.args[0] for call in read_gm_json.call_args_list], ['gm2.json'])
+        self.assertEqual(sorted(self.loader.game_modes), ['gm1', 'gm2'])
+
+    def test_bundled_games_are_listed_and_opened_on_selection(self):
+        self.write('gm0', self.valid_data('Loose'))
+        games = {f'b{i}': self.valid_data(f'Bundled {i}') for i in range(3)}
+        games['b1']['board'][7][1] = 'pK0'
+        write_bundle(os.path.join('custom_gm', 'pack.pwbundle'), games)
+
+        self.assertTrue(self.loader.get_all())
+
+        self.assertEqual(sorted(self.loader.game_modes), ['gm0', 'pack/b0', 'pack/b1', 'pack/b2'])
+        self.assertEqual(self.loader.game_modes['pack/b1'].name, 'Bundled 1')
+        self.assertIsNone(self.loader.game_modes['pack/b1'].board)
+        self.assertTrue(self.loader.select_gm('pack/b1'))
+        self.assertEqual(self.loader.selected_gm[1].board[7][1], 'pK0')
+        self.assertEqual(list(self.loader.search('bundled', base_gm=GameMode.BLOCK_THE_BORDER)),
+                         ['pack/b0', 'pack/b1', 'pack/b2'])
+
+        # an unchanged bundle keeps its selected game, a replaced one is read again
+        self.assertTrue(self.loader.get_all())
+        self.assertEqual(self.loader.selected_gm[0], 'pack/b1')
+        write_bundle(os.path.join('custom_gm', 'pack.pwbundle'), {'c': self.valid_data('Replaced')})
+        os.utime(os.path.join('custom_gm', 'pack.pwbundle'), ns=(1, 1))
+        self.assertTrue(self.loader.get_all())
+        self.assertEqual(sorted(self.loader.game_modes), ['gm0', 'pack/c'])
+        self.assertIsNone(self.loader.selected_gm)
+
+    def test_board_reader_works_off_the_main_thread(self):
+        data = self.valid_data('Loose')
+        data['board'][7][4] = 'pK'
+        self.write('gm0', data)
+        games = {'b0': self.valid_data('Bundled')}
+        games['b0']['board'][0][0] = 'zw'
+        write_bundle(os.path.join('custom_gm', 'pack.pwbundle'), games)
+        self.write('broken', '{')
+        self.loader.get_all()
+        self.loader.error_msg = None
+
+        readers = [self.loader.board_reader(gm_id) for gm_id in ('gm0', 'pack/b0', 'broken', 'missing/b0')]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            boards = list(executor.map(lambda read: read(), readers))
+
+        self.assertEqual(boards[0][7][4], 'pK')
+        self.assertEqual(boards[1][0][0], 'zw')
+        self.assertEqual(boards[2:], [None, None])
+        self.assertIsNone(self.loader.error_msg)
+
+    def test_broken_bundle_is_reported(self):
+        with open(os.path.join('custom_gm', 'broken.pwbundle'), 'wb') as file:
+            file.write(b'nothing to see')
+
+        self.assertFalse(self.loader.get_all())
+        self.assertIn('broken.pwbundle', self.loader.error_msg)
+
+    def test_pack_and_unpack_round_trip(self):
+        for i in range(3):
+            self.write(f'gm{i}', self.valid_data(f'Game {i}'))
+        self.write('broken', '{')
+
+        with patch('builtins.print'):
+            self.assertEqual(main(['pack', 'custom_gm', 'games.pwbundle']), 1)
+            self.assertEqual(main(['unpack', 'games.pwbundle', 'unpacked']), 0)
+            self.assertEqual(main(['convert', os.path.join('unpacked', 'gm1.json'), 'gm1.pwb']), 0)
+            self.assertEqual(main(['convert', 'gm1.pwb', 'gm1.json']), 0)
+
+        self.assertEqual(sorted(os.listdir('unpacked')), ['gm0.json', 'gm1.json', 'gm2.json'])
+        with open('gm1.json') as file:
+            self.assertEqual(json.load(file), self.valid_data('Game 1'))
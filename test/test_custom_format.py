@@ -0,0 +1,93 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from game.custom_format import Bundle, FormatError, decode_game, encode_game, write_bundle
+from game.custom_schema import validate_gm_json
+from game.game_modes import GameMode
+
+
+def game_data(name='Game', height=8):
+    board = [[None for _ in range(8)] for _ in range(height)]
+    board[0][0] = 'zw'
+    board[0][1] = 'zs'
+    board[-1][4] = 'pK0'
+    board[-1][3] = 'pq1'
+    board[-2][0] = 'pp2'
+    data = {
+        'name': name,
+        'board_height': height,
+        'can_change_gm': False,
+        'can_change_difficulty': True,
+        'base_gm': str(GameMode.SURVIVE_THE_LONGEST),
+        'difficulty': 'Hard',
+        'board': board
+    }
+    if name is None:
+        del data['name']
+    return data
+
+
+class TestCompactGame(TestCase):
+    def test_round_trip_is_lossless(self):
+        for data in (game_data(), game_data('Ünïcode name', 18), game_data(None, 6)):
+            with self.subTest(name=data.get('name')):
+                decoded = decode_game(encode_game(data))
+                self.assertEqual(decoded, data)
+                self.assertEqual(validate_gm_json(decoded), [])
+
+    def test_board_takes_one_byte_per_square(self):
+        encoded = encode_game(game_data(height=18))
+        self.assertLess(len(encoded), 18 * 8 + 64)
+
+    def test_corrupt_data_is_rejected(self):
+        encoded = encode_game(game_data())
+        for corrupt in (b'', encoded[:5], b'XXXX' + encoded[4:], encoded[:-1], encoded + b'\0'):
+            with self.assertRaises(FormatError):
+                decode_game(corrupt)
+
+
+class TestBundle(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'games.pwbundle')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self):
+        bundle = Bundle(self.path)
+        self.addCleanup(bundle.close)
+        return bundle
+
+    def test_games_are_read_back_by_id(self):
+        games = {f'gm{i}': game_data(f'Game {i}', 6 + i) for i in range(10)}
+        write_bundle(self.path, games)
+
+        bundle = self.open()
+        self.assertEqual(len(bundle), 10)
+        self.assertEqual(bundle.ids(), sorted(games))
+        for gm_id, data in games.items():
+            self.assertEqual(bundle.read(gm_id), data)
+        with self.assertRaises(KeyError):
+            bundle.read('missing')
+
+    def test_headers_leave_out_boards(self):
+        write_bundle(self.path, {'a': game_data('A'), 'b': game_data(None)})
+
+        headers = dict(self.open().headers())
+        self.assertEqual(headers['a']['name'], 'A')
+        self.assertNotIn('name', headers['b'])
+        self.assertNotIn('board', headers['a'])
+        self.assertEqual(headers['a']['base_gm'], str(GameMode.SURVIVE_THE_LONGEST))
+
+    def test_other_files_are_rejected(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"name": "not a bundle"}')
+        with self.assertRaises(FormatError):
+            Bundle(self.path)
+
+    def test_ids_must_fit_the_table_of_contents(self):
+        with self.assertRaises(FormatError):
+            write_bundle(self.path, {'x' * 40: game_data()})
+        self.assertFalse(os.path.exists(self.path))
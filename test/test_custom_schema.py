@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from game.custom import main
+from game.custom_schema import validate_gm_json
+from game.game_modes import GameMode
+
+
+class TestValidateGmJson(TestCase):
+    def valid_data(self):
+        board = [[None for _ in range(8)] for _ in range(8)]
+        board[7] = ['pr8', 'pk9', 'pb10', 'pq11', 'pK12', 'pb13', 'pk14', 'pr15']
+        board[2][3] = 'zw'
+        board[3][4] = 'ze'
+        return {
+            'name': 'Test',
+            'board_height': 8,
+            'base_gm': str(GameMode.SURVIVE_THE_LONGEST),
+            'difficulty': 'Hard',
+            'board': board,
+            'can_change_gm': False,
+            'can_change_difficulty': True
+        }
+
+    def test_valid_game(self):
+        self.assertEqual(validate_gm_json(self.valid_data()), [])
+
+    def test_reports_every_error(self):
+        data = self.valid_data()
+        del data['can_change_gm']
+        data['difficulty'] = 'Impossible'
+        data['name'] = 5
+        data['board'][0][0] = 'pX'
+        data['board'][1][1] = 'zz1'
+        data['board'][2].append(None)
+
+        errors = validate_gm_json(data)
+
+        self.assertEqual(errors, [
+            "'can_change_gm' field is required",
+            'Every board row must have 8 squares',
+            'Unknown pieces on the board: pX, zz1',
+            'Difficulty must be a string representing a valid difficulty',
+            'Name must be a string',
+        ])
+
+    def test_missing_board_is_reported_once(self):
+        data = self.valid_data()
+        del data['board']
+        self.assertEqual(validate_gm_json(data), ["'board' field is required"])
+
+    def test_rejects_non_objects(self):
+        self.assertEqual(validate_gm_json([1, 2]), ['Custom game must be a JSON object'])
+
+
+class TestValidateCommand(TestCase):
+    def test_reports_invalid_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            valid = TestValidateGmJson.valid_data(None)
+            for i in range(3):
+                with open(os.path.join(directory, f'gm{i}.json'), 'w') as file:
+                    json.dump(valid, file)
+            with open(os.path.join(directory, 'broken.json'), 'w') as file:
+                file.write('{')
+            with open(os.path.join(directory, 'bad_height.json'), 'w') as file:
+                json.dump(dict(valid, board_height=5), file)
+
+            with patch('builtins.print') as mock_print:
+                result = main(['validate', directory, '--workers', '2'])
+            output = '\n'.join(str(call.args[0]) for call in mock_print.call_args_list)
+
+        self.assertEqual(result, 1)
+        self.assertIn('broken.json', output)
+        self.assertIn('bad_height.json: Board height must be', output)
+        self.assertNotIn('gm1.json', output)
+        self.assertIn('5 files checked, 3 valid, 2 invalid', output)
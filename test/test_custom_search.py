@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+from game.custom import CustomGame
+from game.custom_search import CustomGameSearch, SearchResults
+from game.game_modes import GameMode, Difficulty
+
+
+class TestCustomGameSearch(TestCase):
+    def setUp(self):
+        self.search = CustomGameSearch()
+        self.add('a', 'Zombie Rush', 8, GameMode.BLOCK_THE_BORDER, Difficulty.EASY)
+        self.add('b', 'Last Stand', 10, GameMode.SURVIVE_THE_LONGEST, Difficulty.HARD)
+        self.add('c', 'zombie horde', 8, GameMode.SURVIVE_THE_LONGEST, Difficulty.EASY)
+        self.add('d', 'Rush Hour', 12, GameMode.BLOCK_THE_BORDER, Difficulty.HARD)
+
+    def add(self, gm_id, name, board_height=8, base_gm=GameMode.CLEAR_THE_BOARD, difficulty=Difficulty.EASY):
+        self.search.add(gm_id, CustomGame(name, board_height, base_gm=base_gm, difficulty=difficulty))
+
+    def find(self, *args, **kwargs):
+        return list(self.search.search(*args, **kwargs))
+
+    def test_everything_is_sorted_by_name(self):
+        self.assertEqual(self.find(), ['b', 'd', 'a', 'c'])
+
+    def test_names_match_by_substring_ignoring_case(self):
+        self.assertEqual(self.find('z'), ['a', 'c'])
+        self.assertEqual(self.find('RUSH'), ['d', 'a'])
+        self.assertEqual(self.find('ie hor'), ['c'])
+        self.assertEqual(self.find('zombie rush'), ['a'])
+        self.assertEqual(self.find('rushx'), [])
+        self.assertEqual(self.find('q'), [])
+
+    def test_filters_combine_with_the_name(self):
+        self.assertEqual(self.find(base_gm=GameMode.SURVIVE_THE_LONGEST), ['b', 'c'])
+        self.assertEqual(self.find(difficulty=Difficulty.EASY, board_height=8), ['a', 'c'])
+        self.assertEqual(self.find('zombie', GameMode.BLOCK_THE_BORDER), ['a'])
+        self.assertEqual(self.find('rush', difficulty=Difficulty.EXTREME), [])
+
+    def test_typing_narrows_and_backspace_widens(self):
+        self.assertEqual(self.find('zomb'), ['a', 'c'])
+        self.assertEqual(self.find('zombi'), ['a', 'c'])
+        self.assertEqual(self.find('zombie r'), ['a'])
+        self.assertEqual(self.find('zombie'), ['a', 'c'])
+
+    def test_updates_are_incremental(self):
+        self.assertEqual(self.find('zomb'), ['a', 'c'])
+        self.add('e', 'Zombie Apocalypse')
+        self.add('a', 'Quiet Morning', 8, GameMode.BLOCK_THE_BORDER, Difficulty.EASY)
+        self.search.remove('c')
+        self.search.remove('missing')
+
+        self.assertEqual(self.find('zomb'), ['e'])
+        self.assertEqual(self.find('quiet'), ['a'])
+        self.assertEqual(self.find(), ['b', 'a', 'd', 'e'])
+        self.assertEqual(self.find(base_gm=GameMode.SURVIVE_THE_LONGEST), ['b'])
+        self.assertNotIn('zombie horde', {name for name in self.search.names.values()})
+        self.assertFalse(any(not ids for ids in self.search.grams.values()))
+
+    def test_names_are_indexed_in_slices(self):
+        search = CustomGameSearch()
+        for i in range(500):
+            search.add(f'gm{i}', CustomGame(f'Game {i}'))
+        self.assertEqual(search.pending, 500)
+
+        search.index_pending(0)
+        self.assertEqual(search.pending, 436)
+        # removing a game that was never indexed leaves the postings alone
+        search.remove('gm0')
+        self.assertEqual(len(search.search('game 1')), 111)
+        self.assertEqual(search.pending, 0)
+
+    def test_large_results_come_out_a_page_at_a_time(self):
+        search = CustomGameSearch()
+        for i in range(1000):
+            search.add(f'gm{i:04}', CustomGame(f'Game {i:04}', 6 + i % 2))
+        expected = [f'gm{i:04}' for i in range(0, 1000, 2)]
+
+        results = search.search(board_height=6)
+        self.assertIsInstance(results, SearchResults)
+        self.assertEqual(len(results), 500)
+        self.assertEqual(results[10:13], expected[10:13])
+        self.assertLess(len(results.items), 20)
+        self.assertEqual(results[-1], expected[-1])
+        self.assertEqual(list(results), expected)
@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import TestCase
+
+from game.custom_watcher import InotifyWatcher, PollingWatcher
+
+
+class WatcherCases:
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        self.write('kept.json', '{}')
+        self.write('removed.json', '{}')
+        self.watcher = self.create_watcher()
+
+    def tearDown(self):
+        self.watcher.close()
+        self.temp_dir.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.directory, name), 'w') as file:
+            file.write(content)
+
+    def test_reports_added_changed_and_removed_files(self):
+        self.write('added.json', '{}')
+        self.write('kept.json', '{"name": "changed"}')
+        self.write('notes.txt', 'ignored')
+        os.remove(os.path.join(self.directory, 'removed.json'))
+
+        changed, removed = self.changes()
+
+        self.assertEqual(changed, {'added.json', 'kept.json'})
+        self.assertEqual(removed, {'removed.json'})
+        self.assertEqual(self.changes(), (set(), set()))
+
+    def test_renamed_file_is_removed_and_added(self):
+        os.replace(os.path.join(self.directory, 'removed.json'), os.path.join(self.directory, 'renamed.json'))
+
+        self.assertEqual(self.changes(), ({'renamed.json'}, {'removed.json'}))
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux only')
+class TestInotifyWatcher(WatcherCases, TestCase):
+    def create_watcher(self):
+        return InotifyWatcher(self.directory, '.json')
+
+    def changes(self):
+        return self.watcher.changes()
+
+
+class TestPollingWatcher(WatcherCases, TestCase):
+    def create_watcher(self):
+        return PollingWatcher(self.directory, '.json', interval=1.0)
+
+    def changes(self):
+        return self.watcher.changes(now=self.watcher.next_check)
+
+    def test_waits_for_the_interval(self):
+        self.write('added.json', '{}')
+        self.assertEqual(self.watcher.changes(now=self.watcher.next_check - 0.5), (set(), set()))
+        self.assertEqual(self.watcher.changes(now=self.watcher.next_check), ({'added.json'}, set()))
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+import pygame
+
+from game.assets import AssetManager
+from game.custom import CustomGame
+from game.display import Display
+from game.list_view import ListView
+from game.game_modes import Gameplay, GameMode, Difficulty
+
+
+class TestDisplayAllocations(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.font.init()
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        screen = pygame.display.set_mode((1280, 720))
+        cls.display = Display(screen, 1280, 720, 50, AssetManager(cache_dir=cls.cache_dir.name))
+        cls.display.wait_for_assets()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+        cls.cache_dir.cleanup()
+
+    def setUp(self):
+        self.gameplay = Gameplay.init_game_mode(18, Difficulty.EXTREME, GameMode.BLOCK_THE_BORDER)
+        self.game_stats = {'Turn': 1, 'Moves': 0, 'Captured Zombies': 0}
+        self.game_modes = {f'gm{i}': CustomGame(f'Game {i}') for i in range(1000)}
+        self.list_view = ListView(self.game_modes)
+        self.list_view.scroll_to(500, animate=False)
+        self.frames = {
+            'playing_screen': lambda: self.display.playing_screen(18, self.gameplay.board, (16, 2),
+                                                                  self.game_stats, -1),
+            'main_menu': self.display.main_menu,
+            'load_custom_menu': lambda: self.display.load_custom_menu(self.game_modes, None, self.list_view),
+            'game_settings_menu': lambda: self.display.game_settings_menu(GameMode.BLOCK_THE_BORDER,
+                                                                          Difficulty.EASY, 8),
+        }
+
+    @staticmethod
+    def measure(frame, count=20):
+        for _ in range(3):
+            frame()
+
+        tracemalloc.start()
+        try:
+            start_snapshot = tracemalloc.take_snapshot()
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(count):
+                frame()
+            _, peak = tracemalloc.get_traced_memory()
+            end_snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        display_filter = [tracemalloc.Filter(True, Display.__init__.__code__.co_filename)]
+        growth = sum(stat.size_diff for stat in end_snapshot.filter_traces(display_filter)
+                     .compare_to(start_snapshot.filter_traces(display_filter), 'lineno'))
+        return growth, peak - start
+
+    def test_steady_state_frames_do_not_grow_memory(self):
+        for name, frame in self.frames.items():
+            with self.subTest(screen=name):
+                growth, _ = self.measure(frame)
+                # pygame.draw returns a fresh bounding rect for every call, the last one stays alive
+                self.assertLessEqual(growth, 256)
+
+    def test_steady_state_frame_peak_is_bounded(self):
+        for name, frame in self.frames.items():
+            with self.subTest(screen=name):
+                _, peak = self.measure(frame)
+                self.assertLess(peak, 4096)
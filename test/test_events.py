@@ -0,0 +1,59 @@
+import os
+from unittest import TestCase
+
+import pygame
+
+from game.events import coalesce
+
+
+class TestCoalesce(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+
+    def wheel(self, y):
+        return pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=y, flipped=False)
+
+    def click(self, button):
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(1, 1))
+
+    def test_consecutive_wheel_events_are_summed(self):
+        events = coalesce([self.wheel(1), self.wheel(1), self.wheel(-3)])
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].y, -1)
+
+    def test_opposite_wheel_steps_cancel_out(self):
+        self.assertEqual(coalesce([self.wheel(1), self.wheel(-1)]), [])
+        self.assertEqual(coalesce([self.wheel(0)]), [])
+
+        events = coalesce([self.wheel(1), self.wheel(-1), self.wheel(1)])
+        self.assertEqual([event.y for event in events], [1])
+
+    def test_one_wheel_button_is_kept_per_frame(self):
+        wheel_up = self.click(pygame.BUTTON_WHEELUP)
+        events = coalesce([wheel_up, self.wheel(1), self.click(pygame.BUTTON_WHEELUP), self.wheel(1),
+                           self.click(pygame.BUTTON_WHEELDOWN)])
+
+        self.assertEqual([event.type for event in events], [pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL])
+        self.assertIs(events[0], wheel_up)
+        self.assertEqual(events[1].y, 2)
+
+    def test_order_is_kept_around_other_events(self):
+        left = self.click(pygame.BUTTON_LEFT)
+        events = coalesce([self.wheel(1), left, self.wheel(2), self.wheel(2)])
+
+        self.assertEqual([event.type for event in events], [pygame.MOUSEWHEEL, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL])
+        self.assertIs(events[1], left)
+        self.assertEqual(events[2].y, 4)
+
+    def test_wheel_events_carry_pointer_position(self):
+        wheel = pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1, flipped=False, pos=(10, 20))
+        events = coalesce([self.wheel(1), wheel])
+        self.assertEqual(events[0].pos, (10, 20))
+        self.assertEqual(coalesce([self.wheel(1)])[0].pos, pygame.mouse.get_pos())
+
+    def test_text_input_is_not_dispatched(self):
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode='a')
+        events = coalesce([key, pygame.event.Event(pygame.TEXTINPUT, text='a')])
+        self.assertEqual(events, [key])
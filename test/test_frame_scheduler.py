@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+import pygame
+
+from game.frame_scheduler import FrameScheduler
+
+
+class TestFrameScheduler(TestCase):
+    def setUp(self):
+        self.scheduler = FrameScheduler(idle_fps=10)
+        self.scheduler.refresh_rate = 144
+        self.scheduler.clock = MagicMock()
+
+    def test_target_fps(self):
+        self.assertEqual(self.scheduler.target_fps(False), 10)
+        self.assertEqual(self.scheduler.target_fps(True), 144)
+
+        self.scheduler.fps_cap = 60
+        self.assertEqual(self.scheduler.target_fps(True), 60)
+        self.scheduler.fps_cap = 5
+        self.assertEqual(self.scheduler.target_fps(False), 5)
+
+    def test_tick_uses_idle_rate_unless_animating(self):
+        self.scheduler.tick(False)
+        self.scheduler.clock.tick.assert_called_once_with(10)
+
+        self.scheduler.clock.reset_mock()
+        self.scheduler.tick(True)
+        self.scheduler.clock.tick.assert_called_once_with(144)
+
+    def test_set_mode_without_vsync_keeps_the_plain_window(self):
+        with patch('pygame.display.set_mode') as mock_set_mode:
+            self.scheduler.set_mode((100, 50), pygame.FULLSCREEN)
+
+        self.assertFalse(self.scheduler.vsync_active)
+        mock_set_mode.assert_called_once_with((100, 50), pygame.FULLSCREEN)
+
+    def test_set_mode_falls_back_without_vsync(self):
+        self.scheduler.vsync = True
+        screen = MagicMock()
+        with patch('pygame.display.set_mode', side_effect=[pygame.error('no renderer'), screen]) as mock_set_mode, \
+                patch('builtins.print'):
+            self.assertIs(self.scheduler.set_mode((100, 50), pygame.SHOWN), screen)
+
+        self.assertFalse(self.scheduler.vsync_active)
+        self.assertFalse(self.scheduler.vsync)
+        mock_set_mode.assert_called_with((100, 50), pygame.SHOWN)
+
+    def test_set_mode_with_vsync(self):
+        self.scheduler.vsync = True
+        with patch('pygame.display.set_mode') as mock_set_mode:
+            self.scheduler.set_mode((100, 50), pygame.SHOWN)
+
+        self.assertTrue(self.scheduler.vsync_active)
+        mock_set_mode.assert_called_once_with((100, 50), pygame.SHOWN | pygame.SCALED, vsync=1)
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import pygame
+
+from game.animation import MoveAnimator
+from game.custom import CustomGameFilter, CustomGameLoader
+from game.frame_scheduler import FrameScheduler
+from game.game import Game, GameState
+from game.game_modes import GameMode
+from game.list_view import ListView
+from game.profiling import LatencyTracer
+
+
+class TestCustomGamePolling(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        os.makedirs('custom_gm')
+        for i in range(2):
+            self.write(f'gm{i}', f'Game {i}')
+
+        # only the parts of the game that polling the catalog touches, no window is opened
+        self.game = Game.__new__(Game)
+        self.game.custom_loader = CustomGameLoader(max_workers=2)
+        self.game.custom_filter = CustomGameFilter()
+        self.game.custom_list = ListView()
+        self.game._custom_list_version = None
+        self.loader = self.game.custom_loader
+        self.loader.watch()
+        self.loader.get_all()
+        self.loader.select_gm('gm1')
+        self.game.current_state = GameState.BOARD_PREVIEW
+
+    def tearDown(self):
+        self.loader.close()
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def write(self, gm_id, name):
+        data = name if name.startswith('{') else json.dumps({
+            'name': name,
+            'board_height': 8,
+            'base_gm': str(GameMode.BLOCK_THE_BORDER),
+            'difficulty': 'Easy',
+            'board': [[None for _ in range(8)] for _ in range(8)],
+            'can_change_gm': True,
+            'can_change_difficulty': True
+        })
+        with open(os.path.join('custom_gm', f'{gm_id}.json'), 'w') as file:
+            file.write(data)
+
+    def poll(self):
+        self.game.poll_custom_games()
+        self.loader.wait_until_loaded()
+        self.game.poll_custom_games()
+
+    def test_deleting_the_previewed_game_goes_back_to_the_list(self):
+        os.remove(os.path.join('custom_gm', 'gm1.json'))
+        self.poll()
+        self.assertIsNone(self.loader.selected_gm)
+        self.assertEqual(self.game.current_state, GameState.LOAD_CUSTOM)
+
+    def test_breaking_the_previewed_game_goes_back_to_the_list(self):
+        self.write('gm1', '{broken')
+        self.poll()
+        self.assertIsNone(self.loader.selected_gm)
+        self.assertEqual(self.game.current_state, GameState.LOAD_CUSTOM)
+
+    def test_preview_stays_open_for_other_changes(self):
+        self.write('gm1', 'Renamed')
+        os.remove(os.path.join('custom_gm', 'gm0.json'))
+        self.poll()
+        self.assertEqual(self.loader.selected_gm[1].name, 'Renamed')
+        self.assertEqual(self.game.current_state, GameState.BOARD_PREVIEW)
+
+
+class TestPlayingWheel(TestCase):
+    def setUp(self):
+        self.game = Game.__new__(Game)
+        self.game.display = MagicMock(screen_height=600)
+        self.game.display.playing_screen.return_value = {'board_start': (0, 0), 'square_size': 50}
+        self.game.latency = LatencyTracer()
+        self.game.gameplay = MagicMock()
+        self.game.update_game_stats = MagicMock()
+        self.game._displayed_board_part = 0
+
+    def wheel(self, y, pos=(0, 100)):
+        self.game.handle_playing_state(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=y, flipped=False, pos=pos))
+        return self.game._displayed_board_part
+
+    def test_wheel_without_vertical_movement_does_not_zoom(self):
+        self.assertEqual(self.wheel(0), 0)
+        self.assertEqual(self.wheel(1), 1)
+        self.assertEqual(self.wheel(0), 1)
+        self.assertEqual(self.wheel(-1), 0)
+
+
+class TestFrameRate(TestCase):
+    def setUp(self):
+        self.game = Game.__new__(Game)
+        self.game.animator = MoveAnimator()
+        self.game.custom_list = ListView(range(100))
+        self.game.custom_list.resize(10, 100)
+        self.scheduler = FrameScheduler(idle_fps=20)
+        self.scheduler.refresh_rate = 144
+
+    def test_leaving_the_board_mid_animation_drops_to_the_idle_rate(self):
+        now = time.perf_counter()
+        self.game.animator.start([('pP', (6, 0), (5, 0))], now=now)
+        self.assertEqual(self.scheduler.target_fps(self.game.animating()), 144)
+
+        # the move ends while the game over screen is shown, which never draws the board
+        self.game.current_state = GameState.GAME_OVER
+        self.game.animator.started = now - 1
+        self.assertEqual(self.scheduler.target_fps(self.game.animating()), 20)
+
+    def test_leaving_the_list_mid_scroll_drops_to_the_idle_rate(self):
+        self.game.custom_list.scroll_by(50, now=time.perf_counter() - 1)
+        self.game.current_state = GameState.MENU
+        self.assertEqual(self.scheduler.target_fps(self.game.animating()), 20)
+        self.assertEqual(self.game.custom_list.offset, 50)
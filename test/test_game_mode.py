@@ -529,6 +529,36 @@ class TestGameplay(TestCase):
         self.assertEqual(self.game.turns, 1)
         self.assertEqual(self.game.moves, 0)
 
+    def test_move_piece_records_cell_moves(self):
+        self.game.move_wave = MagicMock(return_value=TurnResult.OK)
+
+        self.game.move_piece(8, 4, 6, 4)
+        self.assertEqual(self.game.cell_moves, [('pp4', (8, 4), (6, 4))])
+
+        self.game.move_piece(6, 4, 6, 5)
+        self.assertEqual(self.game.cell_moves, [])
+
+    def test_move_piece_castling_records_cell_moves(self):
+        self.game.is_valid_move = MagicMock(return_value=False)
+        self.game.check_castling_move = MagicMock(return_value=(2, 3, 8))
+        self.game.move_wave = MagicMock(return_value=TurnResult.OK)
+        piece_row = self.board_height - 1
+        self.game.board[piece_row][1:4] = [None, None, None]
+
+        self.game.move_piece(piece_row, 4, piece_row, 0)
+
+        self.assertEqual(self.game.cell_moves, [('pK12', (piece_row, 4), (piece_row, 2)),
+                                                ('pr8', (piece_row, 0), (piece_row, 3))])
+
+    def test_move_wave_records_zombie_moves(self):
+        self.game.create_new_zombies = MagicMock(return_value=TurnResult.OK)
+        self.game.board[2][3] = 'zw'
+        self.game.board[7][0] = 'zi'
+
+        self.game.move_wave()
+
+        self.assertEqual(self.game.cell_moves, [('zw', (2, 3), (3, 3))])
+
     @patch('random.sample', return_value=[0, 3, 5])
     @patch('random.randint', side_effect=[15, 40, 60])
     def test_create_new_zombies(self, mock_randint, mock_sample):
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from game.list_view import ListView
+
+
+class TestListView(TestCase):
+    def setUp(self):
+        self.view = ListView([f'gm{i}' for i in range(10000)], duration=1.0)
+        self.view.resize(50, 500)
+
+    def test_only_visible_rows_are_returned(self):
+        first, first_y, keys = self.view.visible()
+        self.assertEqual((first, first_y), (0, 0))
+        self.assertEqual(keys, [f'gm{i}' for i in range(10)])
+
+        self.view.scroll_to(125, animate=False)
+        first, first_y, keys = self.view.visible()
+        self.assertEqual((first, first_y), (2, -25))
+        self.assertEqual(keys, [f'gm{i}' for i in range(2, 13)])
+
+    def test_scrolling_eases_towards_the_target(self):
+        self.view.scroll_rows(4, now=10.0)
+        self.assertTrue(self.view.scrolling)
+        self.assertEqual(self.view.offset, 0)
+
+        self.view.update(now=10.5)
+        self.assertAlmostEqual(self.view.offset, 150)
+        # a second step continues from where the first one got to
+        self.view.scroll_rows(4, now=10.5)
+        self.assertEqual((self.view.start_offset, self.view.target), (150, 400))
+
+        self.view.update(now=11.5)
+        self.assertEqual(self.view.offset, 400)
+        self.assertFalse(self.view.scrolling)
+
+    def test_paging_and_limits(self):
+        self.view.page(1, now=0)
+        self.assertEqual(self.view.target, 500)
+        self.view.page(-3, now=0)
+        self.assertEqual(self.view.target, 0)
+        self.view.scroll_to(10 ** 9, now=0)
+        self.assertEqual(self.view.target, 10000 * 50 - 500)
+
+    def test_resize_keeps_the_top_row(self):
+        self.view.scroll_to(1000, animate=False)
+        self.view.resize(25, 250)
+        self.assertEqual(self.view.offset, 500)
+        self.assertEqual(self.view.visible()[0], 20)
+
+    def test_shorter_key_list_clamps_the_offset(self):
+        self.view.scroll_to(10 ** 9, animate=False)
+        self.view.set_keys(['a', 'b', 'c'])
+        self.assertEqual(self.view.offset, 0)
+        self.assertEqual(self.view.visible()[2], ['a', 'b', 'c'])
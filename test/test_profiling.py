@@ -0,0 +1,143 @@
+import os
+import pstats
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import pygame
+
+from game.profiling import FrameProfiler, LatencyTracer, ProfileCapture, percentile
+from game.game import GameState
+
+
+class TestFrameProfiler(TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(window=4)
+
+    def run_frame(self, state, events, render, flip):
+        times = iter((0.0, events, 10.0 + render, 20.0 + flip))
+        with patch('time.perf_counter', lambda: next(times)):
+            self.profiler.begin_frame()
+            self.profiler.add('events', 0.0)
+            self.profiler.add('render', 10.0)
+            self.profiler.add('flip', 20.0)
+        self.profiler.end_frame(state)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 95), 0.0)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(percentile(list(range(101)), 95), 95)
+        self.assertEqual(percentile([5], 99), 5)
+
+    def test_disabled_profiler_records_nothing(self):
+        self.run_frame(GameState.MENU, 1, 2, 3)
+        self.assertEqual(len(self.profiler.frame_times), 0)
+        self.assertEqual(self.profiler.state_samples, {})
+
+    def test_samples_are_kept_per_state(self):
+        self.profiler.toggle()
+        self.run_frame(GameState.MENU, 1, 2, 3)
+        self.run_frame(GameState.PLAYING, 2, 4, 6)
+        self.run_frame(GameState.PLAYING, 1, 1, 1)
+
+        self.assertEqual(list(self.profiler.state_samples[GameState.MENU]), [(6, 1, 2, 3)])
+        self.assertEqual(list(self.profiler.state_samples[GameState.PLAYING]), [(12, 2, 4, 6), (3, 1, 1, 1)])
+        self.assertEqual(list(self.profiler.frame_times), [6, 12, 3])
+
+        lines = self.profiler.overlay_lines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith('PLAYING:'))
+
+    def test_window_bounds_samples(self):
+        self.profiler.toggle()
+        for _ in range(10):
+            self.run_frame(GameState.MENU, 1, 1, 1)
+        self.assertEqual(len(self.profiler.frame_times), 4)
+        self.assertEqual(len(self.profiler.state_samples[GameState.MENU]), 4)
+
+    def test_toggle_resets_samples(self):
+        self.profiler.toggle()
+        self.run_frame(GameState.MENU, 1, 1, 1)
+        self.profiler.toggle()
+        self.assertFalse(self.profiler.enabled)
+        self.assertEqual(self.profiler.state_samples, {})
+
+
+class TestProfileCapture(TestCase):
+    def test_toggle_writes_stats_and_summary(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            capture = ProfileCapture(output_dir=output_dir, top=5)
+            self.assertIsNone(capture.toggle())
+            self.assertTrue(capture.active)
+            sorted(range(1000))
+            stats_path = capture.toggle()
+
+            self.assertFalse(capture.active)
+            self.assertEqual(sorted(os.listdir(output_dir)),
+                             sorted([os.path.basename(stats_path), os.path.basename(stats_path)[:-7] + '.txt']))
+            self.assertTrue(pstats.Stats(stats_path).total_calls > 0)
+
+    def test_poll_stops_after_duration(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            capture = ProfileCapture(duration=5, output_dir=output_dir)
+            with patch('time.perf_counter', return_value=100.0):
+                capture.start()
+            with patch('time.perf_counter', return_value=104.0):
+                self.assertIsNone(capture.poll())
+            self.assertTrue(capture.active)
+            with patch('time.perf_counter', return_value=105.0):
+                self.assertIsNotNone(capture.poll())
+            self.assertFalse(capture.active)
+
+
+class TestLatencyTracer(TestCase):
+    def setUp(self):
+        self.tracer = LatencyTracer()
+        self.tracer.enabled = True
+        self.click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0))
+
+    def test_event_is_recorded_at_flip(self):
+        with patch('time.perf_counter', side_effect=(1.0, 1.002, 1.030)):
+            self.tracer.begin_event(self.click, GameState.PLAYING)
+            self.tracer.end_event()
+            self.assertEqual(self.tracer.samples, {})
+            self.tracer.frame_flipped()
+
+        (key, samples), = self.tracer.samples.items()
+        self.assertEqual(key, ('MouseButtonDown', 'PLAYING'))
+        latency, handled, spans = samples[0]
+        self.assertAlmostEqual(latency, 0.030)
+        self.assertAlmostEqual(handled, 0.002)
+        self.assertEqual(self.tracer.histogram([latency]), [0, 0, 0, 1, 0, 0, 0, 0])
+
+    def test_watched_calls_are_timed_inside_the_event(self):
+        class Engine:
+            def move_piece(self):
+                return self.move_wave()
+
+            def move_wave(self):
+                return 'ok'
+
+        engine = self.tracer.watch(Engine(), 'move_piece', 'move_wave')
+        self.assertEqual(engine.move_piece(), 'ok')
+
+        self.tracer.begin_event(self.click, GameState.PLAYING)
+        engine.move_piece()
+        self.assertEqual(set(self.tracer.current['spans']), {'move_piece', 'move_wave'})
+
+    def test_non_input_events_are_ignored(self):
+        self.tracer.begin_event(pygame.event.Event(pygame.QUIT), GameState.MENU)
+        self.tracer.end_event()
+        self.tracer.frame_flipped()
+        self.assertEqual(self.tracer.samples, {})
+
+    def test_toggle_off_writes_report(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            self.tracer.output_dir = output_dir
+            self.tracer.begin_event(self.click, GameState.PLAYING)
+            self.tracer.end_event()
+            self.tracer.frame_flipped()
+
+            path = self.tracer.toggle()
+            with open(path) as file:
+                self.assertTrue(file.read().startswith('MouseButtonDown in PLAYING: 1 events'))
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from benchmarks.render_benchmark import compare, time_call
+
+
+class TestRenderBenchmark(TestCase):
+    def results(self, **medians):
+        return {'results': {'720p': {name: {'median_ms': median} for name, median in medians.items()}}}
+
+    def test_compare_reports_slowdowns_beyond_tolerance(self):
+        baseline = self.results(main_menu=1.0, playing_screen_18=4.0, help_menu=0.01)
+        results = self.results(main_menu=1.2, playing_screen_18=6.0, help_menu=0.03, custom_menu=9.0)
+
+        regressions = compare(results, baseline, tolerance=0.25)
+
+        self.assertEqual(regressions, [('720p', 'playing_screen_18', 4.0, 6.0)])
+
+    def test_compare_ignores_missing_resolutions(self):
+        self.assertEqual(compare(self.results(main_menu=5.0), {'results': {'4k': {}}}), [])
+
+    def test_time_call(self):
+        calls = []
+        timing = time_call(lambda: calls.append(1), warmup=2, repeat=5)
+
+        self.assertEqual(len(calls), 7)
+        self.assertLessEqual(timing['min_ms'], timing['median_ms'])
+        self.assertLessEqual(timing['median_ms'], timing['p95_ms'])
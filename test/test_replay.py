@@ -0,0 +1,69 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+import pygame
+
+from benchmarks.input_replay import play
+from game.replay import InputRecorder, Recording
+
+
+class TestInputRecording(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'session.jsonl')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def record(self, *frames):
+        recorder = InputRecorder(self.path, 42, (1280, 720), True)
+        for events in frames:
+            recorder.record(events)
+        recorder.close()
+        return Recording.load(self.path)
+
+    def test_round_trip(self):
+        click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 20), window=None)
+        wheel = pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-2, flipped=False, pos=(5, 6))
+        recording = self.record([click], [], [wheel, pygame.event.Event(pygame.QUIT)])
+
+        self.assertEqual(recording.seed, 42)
+        self.assertEqual(recording.screen_size, (1280, 720))
+        self.assertEqual([frame for frame, _, _ in recording.frames], [0, 2])
+        self.assertEqual(recording.event_count, 3)
+
+        replayed_click = recording.frames[0][2][0]
+        self.assertEqual(replayed_click.type, pygame.MOUSEBUTTONDOWN)
+        self.assertEqual(replayed_click.pos, (10, 20))
+        self.assertEqual(replayed_click.button, 1)
+        replayed_wheel, quit_event = recording.frames[1][2]
+        self.assertEqual((replayed_wheel.y, replayed_wheel.pos, replayed_wheel.flipped), (-2, (5, 6), False))
+        self.assertEqual(quit_event.type, pygame.QUIT)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'w') as file:
+            file.write('{"name": "Game"}\n')
+        with self.assertRaises(ValueError):
+            Recording.load(self.path)
+
+    def test_play_times_every_event_and_frame(self):
+        recording = self.record([pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(1, 1))],
+                                [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)],
+                                [pygame.event.Event(pygame.QUIT)],
+                                [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)])
+        handled = []
+        game = SimpleNamespace(
+            current_state=SimpleNamespace(name='MENU'),
+            handle_events=lambda events: handled.extend(events) or events[0].type != pygame.QUIT,
+            display=SimpleNamespace(poll_assets=lambda: None),
+            render=lambda: None,
+            screen=SimpleNamespace(present=lambda: None))
+
+        results = play(game, recording)
+
+        self.assertEqual(len(handled), 3)
+        self.assertEqual(results['frame']['count'], 2)
+        self.assertEqual(set(results['handlers']), {'MouseButtonDown MENU', 'KeyDown MENU', 'Quit MENU'})
+        self.assertEqual(results['handlers']['KeyDown MENU']['count'], 1)
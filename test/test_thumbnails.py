@@ -0,0 +1,146 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+import pygame
+
+from game.assets import AssetManager
+from game.custom import CustomGame
+from game.thumbnails import BoardThumbnails
+
+
+class TestBoardThumbnails(TestCase):
+    COLORS = ((255, 215, 175), (205, 132, 55))
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.thumbnails = self.make_thumbnails()
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.board[7][4] = 'pK'
+        self.game = CustomGame('Game', 8)
+        self.reads = []
+
+    def make_thumbnails(self, **kwargs):
+        assets = AssetManager(cache_dir=self.cache_dir.name)
+        image = pygame.Surface((64, 64), pygame.SRCALPHA)
+        image.fill((255, 0, 0, 255))
+        assets.source_images = {'pK': image}
+        assets.pieces_hash = 'abc'
+        assets.convert()
+        thumbnails = BoardThumbnails(assets, self.COLORS, **kwargs)
+        self.addCleanup(thumbnails.close)
+        return thumbnails
+
+    def board_reader(self, gm_id):
+        def read():
+            self.reads.append(gm_id)
+            return self.board
+        return read
+
+    def assertPiece(self, thumbnail, pos):
+        # pieces are averaged down to a few pixels, the red of the test piece comes out nearly unchanged
+        color = thumbnail.get_at(pos)
+        self.assertGreater(color.r, 240)
+        self.assertLess(max(color.g, color.b), 16)
+
+    def finish(self, thumbnails=None):
+        thumbnails = thumbnails or self.thumbnails
+        for _, future in list(thumbnails.pending.values()):
+            if not future.cancelled():
+                future.result()
+        return thumbnails.poll()
+
+    def test_thumbnail_is_drawn_in_the_background(self):
+        self.assertIsNone(self.thumbnails.get('gm0', self.game, 40, self.board_reader))
+        self.assertIsNone(self.thumbnails.get('gm0', self.game, 40, self.board_reader))
+        self.assertTrue(self.finish())
+
+        thumbnail = self.thumbnails.get('gm0', self.game, 40, self.board_reader)
+        self.assertEqual(thumbnail.get_size(), (40, 40))
+        self.assertEqual(thumbnail.get_at((2, 2))[:3], self.COLORS[0])
+        self.assertEqual(thumbnail.get_at((37, 2))[:3], self.COLORS[1])
+        self.assertPiece(thumbnail, (22, 37))
+        self.assertIs(self.thumbnails.get('gm0', self.game, 40, self.board_reader), thumbnail)
+        self.assertEqual(self.reads, ['gm0'])
+
+    def test_tall_boards_fit_the_box(self):
+        game = CustomGame('Tall', 18)
+        self.board = [[None for _ in range(8)] for _ in range(18)]
+        self.thumbnails.get('gm0', game, 40, self.board_reader)
+        self.finish()
+        self.assertEqual(self.thumbnails.get('gm0', game, 40, self.board_reader).get_size(), (16, 36))
+
+    def test_boards_are_cached_on_disk_by_content(self):
+        self.thumbnails.get('gm0', self.game, 40, self.board_reader)
+        self.finish()
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+        # another game with the same board, seen by a fresh cache, is read back instead of drawn
+        thumbnails = self.make_thumbnails()
+        with patch.object(BoardThumbnails, 'draw') as draw:
+            thumbnails.get('gm1', CustomGame('Copy', 8), 40, self.board_reader)
+            self.finish(thumbnails)
+        draw.assert_not_called()
+        self.assertPiece(thumbnails.thumbnails['gm1', 40][1], (22, 37))
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+    def test_changed_game_is_drawn_again(self):
+        self.thumbnails.get('gm0', self.game, 40, self.board_reader)
+        self.finish()
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        changed = CustomGame('Game', 8)
+
+        self.assertIsNone(self.thumbnails.get('gm0', changed, 40, self.board_reader))
+        self.finish()
+        self.assertEqual(self.thumbnails.get('gm0', changed, 40, self.board_reader).get_at((22, 37))[:3],
+                         self.COLORS[1])
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 2)
+
+    def test_unreadable_board_is_not_retried(self):
+        self.thumbnails.get('gm0', self.game, 40, lambda gm_id: lambda: None)
+        self.assertTrue(self.finish())
+        self.assertIsNone(self.thumbnails.get('gm0', self.game, 40, self.board_reader))
+        self.assertEqual(self.thumbnails.pending, {})
+        self.assertEqual(self.reads, [])
+
+    def test_nothing_is_drawn_before_the_pieces_are_loaded(self):
+        self.thumbnails.assets.pieces_hash = None
+        self.assertIsNone(self.thumbnails.get('gm0', self.game, 40, self.board_reader))
+        self.assertEqual(self.thumbnails.pending, {})
+
+    def test_least_recently_used_thumbnails_are_dropped(self):
+        thumbnails = self.make_thumbnails(max_items=2)
+        games = {f'gm{i}': CustomGame(f'Game {i}', 8) for i in range(3)}
+        for gm_id in ('gm0', 'gm1'):
+            thumbnails.get(gm_id, games[gm_id], 40, self.board_reader)
+            self.finish(thumbnails)
+        thumbnails.get('gm0', games['gm0'], 40, self.board_reader)
+        thumbnails.get('gm2', games['gm2'], 40, self.board_reader)
+        self.finish(thumbnails)
+        self.assertEqual(list(thumbnails.thumbnails), [('gm0', 40), ('gm2', 40)])
+
+    def test_rows_scrolled_past_are_cancelled(self):
+        thumbnails = self.make_thumbnails(max_pending=2, max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_reader(gm_id):
+            def read():
+                started.set()
+                release.wait(5)
+                return self.board
+            return read
+
+        games = {f'gm{i}': CustomGame(f'Game {i}', 8) for i in range(4)}
+        thumbnails.get('gm0', games['gm0'], 40, blocking_reader)
+        started.wait(5)
+        for gm_id in ('gm1', 'gm2', 'gm3'):
+            thumbnails.get(gm_id, games[gm_id], 40, self.board_reader)
+        self.assertEqual(list(thumbnails.pending), [('gm0', 40), ('gm3', 40)])
+
+        release.set()
+        self.finish(thumbnails)
+        self.assertEqual(sorted(thumbnails.thumbnails), [('gm0', 40), ('gm3', 40)])
+        self.assertEqual(self.reads, ['gm3'])